@@ -0,0 +1,245 @@
+"""Shared helpers for the offline benchmarks.
+
+All benchmarks run against MemoryBackend, so they are reproducible and need
+neither credentials nor a network. Each measurement records wall time and the
+backend's operation counters (RPCs, document reads/writes, bytes).
+"""
+from __future__ import annotations
+
+import json
+import platform
+import random
+import statistics
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable
+
+from huckleberry_api import HuckleberryAPI, MemoryBackend
+
+USER_UID = "bench-user"
+DAY = 86400
+
+
+@dataclass
+class Measurement:
+    """Result of one benchmark case."""
+
+    name: str
+    params: dict[str, Any] = field(default_factory=dict)
+    repeats: int = 0
+    wall_time_s: float = 0.0
+    wall_time_min_s: float = 0.0
+    rpcs: int = 0
+    reads: int = 0
+    writes: int = 0
+    deletes: int = 0
+    listener_reads: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+def offline_api(backend: MemoryBackend, timezone_name: str = "UTC", **kwargs: Any) -> HuckleberryAPI:
+    """Create an API client on the backend that is already signed in."""
+    api = HuckleberryAPI(email="bench@example.com", password="bench", timezone=timezone_name,
+                         backend=backend, **kwargs)
+    api.id_token = "bench-token"
+    api.refresh_token = "bench-refresh"
+    api.user_uid = USER_UID
+    api.token_expires_at = time.time() + 10 * DAY
+    return api
+
+
+def seed_account(backend: MemoryBackend, child_count: int) -> list[str]:
+    """Create a user with ``child_count`` children and empty tracker documents."""
+    client = backend.create_client("seed")
+    child_uids = [f"child-{index:04d}" for index in range(child_count)]
+    client.collection("users").document(USER_UID).set({"childList": [{"cid": uid} for uid in child_uids]})
+    for index, child_uid in enumerate(child_uids):
+        client.collection("childs").document(child_uid).set({
+            "childsName": f"Child {index}",
+            "birthdate": "2021-01-01",
+            "nightStart": 1140,
+            "morningCutoff": 420,
+            "naps": 2,
+        })
+        for collection in ("sleep", "feed", "diaper", "health"):
+            client.collection(collection).document(child_uid).set({"prefs": {}})
+    return child_uids
+
+
+def seed_history(backend: MemoryBackend, child_uid: str, end: float, days: int, multi_docs: int = 0,
+                 multi_entries: int = 0, seed: int = 0) -> None:
+    """Seed interval history ending at ``end`` for every tracker.
+
+    Regular documents: 3 sleeps, 8 feeds and 6 diapers per day, 1 growth entry per week.
+    ``multi_docs`` batched documents per tracker each hold ``multi_entries`` entries
+    spread over the whole range, like imported history.
+    """
+    rng = random.Random(seed)
+    client = backend.create_client("seed")
+    start = end - days * DAY
+    per_day = {"sleep": 3, "feed": 8, "diaper": 6}
+
+    def entry(collection: str, entry_start: float) -> dict[str, Any]:
+        if collection == "sleep":
+            return {"start": entry_start, "duration": rng.randint(1800, 10800), "offset": 0.0,
+                    "details": {"sleepLocations": {"onOwnInBed": True}}}
+        if collection == "feed":
+            return {"mode": "breast", "start": entry_start, "leftDuration": rng.randint(0, 900),
+                    "rightDuration": rng.randint(0, 900), "lastSide": "left", "offset": 0.0}
+        if collection == "diaper":
+            return {"start": entry_start, "mode": rng.choice(["pee", "poo", "both", "dry"]), "offset": 0.0}
+        return {"start": entry_start, "type": "health", "mode": "growth", "weight": rng.uniform(3, 15),
+                "weightUnits": "kg", "offset": 0.0}
+
+    for collection, count in per_day.items():
+        intervals = client.collection(collection).document(child_uid).collection("intervals")
+        for day in range(days):
+            for slot in range(count):
+                entry_start = start + day * DAY + slot * (DAY / count) + rng.randint(0, 600)
+                intervals.document(f"{int(entry_start * 1000)}-{uuid.uuid4().hex[:20]}").set(
+                    entry(collection, entry_start))
+
+    data = client.collection("health").document(child_uid).collection("data")
+    for week in range(days // 7):
+        entry_start = start + week * 7 * DAY
+        data.document(f"{int(entry_start * 1000)}-{uuid.uuid4().hex[:20]}").set(entry("health", entry_start))
+
+    for collection, subcollection in (("sleep", "intervals"), ("feed", "intervals"),
+                                      ("diaper", "intervals"), ("health", "data")):
+        ref = client.collection(collection).document(child_uid).collection(subcollection)
+        for batch in range(multi_docs):
+            entries = {
+                uuid.uuid4().hex[:20]: entry(collection, rng.uniform(start, end))
+                for _ in range(multi_entries)
+            }
+            ref.document(f"multi-{batch}").set({"multi": True, "data": entries})
+
+
+def _timed_and_counted(backend: MemoryBackend, run_once: Callable[[], None], repeats: int) -> None:
+    """Run ``repeats`` timed passes, then one extra pass with byte counting enabled.
+
+    Byte counting JSON-encodes every payload, so it is kept out of the timed passes.
+    """
+    backend.measure_bytes = False
+    for _ in range(repeats):
+        run_once()
+    backend.measure_bytes = True
+    try:
+        backend.reset_stats()
+        run_once()
+    finally:
+        backend.measure_bytes = False
+
+
+def measure(backend: MemoryBackend, name: str, func: Callable[[], Any], repeats: int = 5,
+            params: dict[str, Any] | None = None) -> Measurement:
+    """Run ``func`` repeatedly; report median wall time and the counters of one run."""
+    durations: list[float] = []
+    counters: dict[str, int] = {}
+
+    def run_once() -> None:
+        started = time.perf_counter()
+        func()
+        if not backend.measure_bytes:
+            durations.append(time.perf_counter() - started)
+        else:
+            counters.update(asdict(backend.reset_stats()))
+
+    _timed_and_counted(backend, run_once, repeats)
+    return Measurement(
+        name=name,
+        params=params or {},
+        repeats=repeats,
+        wall_time_s=statistics.median(durations),
+        wall_time_min_s=min(durations),
+        **counters,
+    )
+
+
+def measure_sequence(backend: MemoryBackend, steps: list[tuple[str, Callable[[], Any]]], repeats: int = 5,
+                     params: dict[str, Any] | None = None) -> list[Measurement]:
+    """Run a sequence of dependent operations, measuring each step separately."""
+    durations: dict[str, list[float]] = {name: [] for name, _ in steps}
+    counters: dict[str, dict[str, int]] = {name: {} for name, _ in steps}
+
+    def run_once() -> None:
+        backend.reset_stats()
+        for name, func in steps:
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            stats = backend.reset_stats()
+            if backend.measure_bytes:
+                counters[name] = asdict(stats)
+            else:
+                durations[name].append(elapsed)
+
+    _timed_and_counted(backend, run_once, repeats)
+    return [
+        Measurement(
+            name=name,
+            params=params or {},
+            repeats=repeats,
+            wall_time_s=statistics.median(durations[name]),
+            wall_time_min_s=min(durations[name]),
+            **counters[name],
+        )
+        for name, _ in steps
+    ]
+
+
+def package_version() -> str:
+    """Installed huckleberry-api version, or 'unknown'."""
+    try:
+        return metadata.version("huckleberry-api")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def write_results(path: Path, suite: str, measurements: list[Measurement], settings: dict[str, Any]) -> None:
+    """Write measurements as JSON, with enough metadata to compare versions."""
+    document = {
+        "suite": suite,
+        "version": package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "settings": settings,
+        "results": [asdict(measurement) for measurement in measurements],
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def compare_results(previous_path: Path, measurements: list[Measurement]) -> list[str]:
+    """Return one line per benchmark comparing wall time and reads with a previous result file."""
+    previous = {
+        (result["name"], json.dumps(result["params"], sort_keys=True)): result
+        for result in json.loads(previous_path.read_text())["results"]
+    }
+    lines = []
+    for measurement in measurements:
+        old = previous.get((measurement.name, json.dumps(measurement.params, sort_keys=True)))
+        if old is None:
+            continue
+        ratio = measurement.wall_time_s / old["wall_time_s"] if old["wall_time_s"] else float("nan")
+        lines.append(
+            f"{measurement.name} {measurement.params}: time x{ratio:.2f}, "
+            f"reads {old['reads']} -> {measurement.reads}, rpcs {old['rpcs']} -> {measurement.rpcs}"
+        )
+    return lines
+
+
+def print_table(measurements: list[Measurement]) -> None:
+    """Print measurements as an aligned text table."""
+    print(f"{'benchmark':<40} {'params':<28} {'time ms':>9} {'rpcs':>6} {'reads':>7} {'writes':>6} {'lreads':>6} {'kB read':>9}")
+    for m in measurements:
+        params = ",".join(f"{key}={value}" for key, value in m.params.items())
+        print(f"{m.name:<40} {params:<28} {m.wall_time_s * 1000:>9.2f} {m.rpcs:>6} {m.reads:>7} "
+              f"{m.writes:>6} {m.listener_reads:>6} {m.bytes_read / 1024:>9.1f}")
+
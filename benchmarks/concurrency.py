@@ -0,0 +1,180 @@
+"""Concurrency stress benchmark: one client shared by many threads.
+
+Runs the same number of range reads on one HuckleberryAPI instance with an
+increasing number of threads and reports throughput, then lets all threads hit
+an expiring token at once and counts the token refreshes (one is expected).
+Last, it backfills a year of feeds with range sharding on 1 to 16 shard
+workers:
+
+    python -m benchmarks.concurrency --output bench-concurrency.json
+
+The in-memory backend sleeps ``latency`` seconds per RPC outside any lock, like
+a network round trip, so throughput should scale with threads until the
+client's own locking becomes the bottleneck. Sign-in and refresh are answered
+offline after the same latency. For the backfill, the backend also sleeps
+``document_latency`` seconds per streamed document, bounding each stream's
+throughput.
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from huckleberry_api import MemoryBackend, RangeSharding
+
+from .common import DAY, Measurement, offline_api, seed_account, seed_history, write_results
+
+THREAD_COUNTS = (1, 2, 4, 8, 16)
+BACKFILL_DAYS = 365
+SHARD_DAYS = 30
+
+
+class _OfflineTokenResponse:
+    """Stand-in for the token endpoint's response."""
+
+    status_code = 200
+
+    def raise_for_status(self) -> None:
+        """Never fails."""
+
+    def json(self) -> dict[str, Any]:
+        return {"id_token": "bench-token-refreshed", "refresh_token": "bench-refresh", "expires_in": "3600"}
+
+
+def run(latency: float, calls: int, thread_counts: tuple[int, ...] = THREAD_COUNTS,
+        document_latency: float = 0.0002, backfill_days: int = BACKFILL_DAYS) -> list[Measurement]:
+    """Throughput of ``calls`` range reads per thread count, refreshes under a token expiry and backfill times."""
+    backend = MemoryBackend()
+    child_uid = seed_account(backend, 1)[0]
+    now = time.time()
+    seed_history(backend, child_uid, now, 7)
+    backend.latency = latency
+
+    results = []
+    baseline = 0.0
+    for threads in thread_counts:
+        api = offline_api(backend)
+        # Distinct ranges, so calls are not coalesced
+        ranges = [(int(now - 7 * DAY) + index, int(now)) for index in range(calls)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda bounds: api.get_sleep_intervals(child_uid, *bounds), ranges))
+        elapsed = time.perf_counter() - started
+        baseline = baseline or calls / elapsed
+        results.append(Measurement(
+            name="concurrency:get_sleep_intervals",
+            params={"threads": threads},
+            repeats=1,
+            wall_time_s=elapsed,
+            extra={"calls": calls, "calls_per_s": calls / elapsed, "speedup": calls / elapsed / baseline},
+        ))
+
+    for threads in thread_counts:
+        results.append(_refresh_herd(backend, child_uid, threads, latency))
+    results.extend(_sharded_backfill(latency, document_latency, backfill_days, thread_counts))
+    return results
+
+
+def _sharded_backfill(latency: float, document_latency: float, days: int,
+                      thread_counts: tuple[int, ...]) -> list[Measurement]:
+    """One get_feed_intervals call over ``days`` days, as one stream and sharded over 1 to N workers."""
+    backend = MemoryBackend()
+    child_uid = seed_account(backend, 1)[0]
+    now = time.time()
+    seed_history(backend, child_uid, now, days)
+    backend.latency, backend.document_latency = latency, document_latency
+    start, end = int(now - days * DAY), int(now) + 1
+
+    results = []
+    baseline = 0.0
+    for workers in (0,) + thread_counts:
+        sharding = RangeSharding(shard_span=SHARD_DAYS * DAY, max_workers=workers) if workers else None
+        api = offline_api(backend, range_sharding=sharding)
+        started = time.perf_counter()
+        entries = len(api.get_feed_intervals(child_uid, start, end))
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        results.append(Measurement(
+            name="concurrency:sharded_backfill",
+            params={"threads": workers, "days": days},
+            repeats=1,
+            wall_time_s=elapsed,
+            extra={"entries": entries, "speedup": baseline / elapsed},
+        ))
+    return results
+
+
+def _refresh_herd(backend: MemoryBackend, child_uid: str, threads: int, latency: float) -> Measurement:
+    """All threads call in while the token is about to expire; count the refreshes."""
+    api = offline_api(backend)
+    api.setup_realtime_listener(child_uid, lambda data: None)
+    api.token_expires_at = time.time() + 60  # inside the 5-minute refresh margin
+    refreshes = 0
+    lock = threading.Lock()
+
+    def post_auth(span_name: str, url: str, payload: dict[str, Any]) -> _OfflineTokenResponse:
+        nonlocal refreshes
+        time.sleep(latency)
+        with lock:
+            refreshes += 1
+        return _OfflineTokenResponse()
+
+    api._post_auth = post_auth  # type: ignore[method-assign]
+    barrier = threading.Barrier(threads)
+
+    def call(_: int) -> None:
+        barrier.wait()
+        api.get_growth_data(child_uid)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, range(threads)))
+    elapsed = time.perf_counter() - started
+    listeners = len(api._listeners)
+    api.stop_all_listeners()
+    return Measurement(
+        name="concurrency:token_refresh",
+        params={"threads": threads},
+        repeats=1,
+        wall_time_s=elapsed,
+        extra={"refreshes": refreshes, "listeners": listeners},
+    )
+
+
+def print_concurrency_table(measurements: list[Measurement]) -> None:
+    """Print throughput and refresh counts per thread count."""
+    print(f"{'benchmark':<34} {'threads':>7} {'time ms':>9} {'calls/s':>9} {'speedup':>8} {'refreshes':>9}")
+    for m in measurements:
+        print(f"{m.name:<34} {m.params['threads']:>7} {m.wall_time_s * 1000:>9.1f} "
+              f"{m.extra.get('calls_per_s', 0):>9.1f} {m.extra.get('speedup', 0):>8.2f} "
+              f"{m.extra.get('refreshes', ''):>9}")
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--latency", type=float, default=0.005, help="simulated seconds per RPC")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--document-latency", type=float, default=0.0002,
+                        help="simulated seconds per streamed document (backfill only)")
+    parser.add_argument("--quick", action="store_true", help="few calls and threads, for smoke testing")
+    args = parser.parse_args()
+
+    thread_counts = (1, 4) if args.quick else THREAD_COUNTS
+    calls = 16 if args.quick else args.calls
+    backfill_days = 90 if args.quick else BACKFILL_DAYS
+    measurements = run(args.latency, calls, thread_counts, args.document_latency, backfill_days)
+    print_concurrency_table(measurements)
+    if args.output:
+        write_results(args.output, "concurrency", measurements,
+                      {"latency": args.latency, "document_latency": args.document_latency, "calls": calls,
+                       "backfill_days": backfill_days, "quick": args.quick})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Memory benchmarks: history representations and per-account session cost.
+
+Loads the same seeded history through the dict getters and through
+``get_interval_records`` and reports the memory retained by each result, and
+measures the marginal memory and threads of one more SessionPool account with
+a listener, all with tracemalloc:
+
+    python -m benchmarks.memory --output bench-memory.json
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from huckleberry_api import HuckleberryAPI, MemoryBackend, SessionPool
+
+from .common import DAY, USER_UID, Measurement, offline_api, seed_account, seed_history, write_results
+
+GETTERS = {
+    "sleep": "get_sleep_intervals",
+    "feed": "get_feed_intervals",
+    "diaper": "get_diaper_intervals",
+    "health": "get_health_entries",
+}
+
+
+def retained_bytes(func: Callable[[], Any]) -> tuple[Any, int]:
+    """Call ``func`` and return its result with the memory it still holds."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def run(days: int, multi_docs: int, multi_entries: int) -> list[Measurement]:
+    """Compare dict and record forms for every tracker."""
+    backend = MemoryBackend()
+    child_uid = seed_account(backend, 1)[0]
+    now = time.time()
+    seed_history(backend, child_uid, now, days, multi_docs, multi_entries)
+    api = offline_api(backend)
+    start, end = int(now - days * DAY), int(now)
+
+    results = []
+    for collection, getter in GETTERS.items():
+        dicts, dict_bytes = retained_bytes(lambda getter=getter: getattr(api, getter)(child_uid, start, end))
+        records, record_bytes = retained_bytes(
+            lambda collection=collection: api.get_interval_records(child_uid, collection, start, end))
+        entries = len(dicts)
+        for form, size in (("dict", dict_bytes), ("record", record_bytes)):
+            results.append(Measurement(
+                name=f"history_memory:{collection}",
+                params={"days": days, "form": form},
+                repeats=1,
+                extra={
+                    "entries": entries,
+                    "bytes_retained": size,
+                    "bytes_per_entry": size / entries if entries else 0.0,
+                    "record_to_dict_ratio": record_bytes / dict_bytes if dict_bytes else 0.0,
+                },
+            ))
+        assert len(records) == entries
+    return results
+
+
+def run_sessions(account_counts: tuple[int, ...]) -> list[Measurement]:
+    """Marginal memory and threads per pooled account holding one sleep listener."""
+    results = []
+    for accounts in account_counts:
+        backend = MemoryBackend()
+        child_uid = seed_account(backend, 1)[0]
+        pool = SessionPool(backend, max_workers=4)
+        threads_before = threading.active_count()
+
+        def add_sessions(pool: SessionPool = pool) -> list[HuckleberryAPI]:
+            sessions = []
+            for index in range(accounts):
+                api = HuckleberryAPI(f"user{index}@example.com", "bench", "UTC", backend=backend, limits=pool.limits)
+                api.id_token, api.refresh_token, api.user_uid = "bench-token", "bench-refresh", USER_UID
+                api.token_expires_at = time.time() + 10 * DAY
+                pool.attach(f"account-{index}", api)
+                api.setup_realtime_listener(child_uid, lambda data: None)
+                sessions.append(api)
+            return sessions
+
+        sessions, size = retained_bytes(add_sessions)
+        results.append(Measurement(
+            name="session_memory",
+            params={"accounts": accounts},
+            repeats=1,
+            extra={
+                "bytes_retained": size,
+                "bytes_per_account": size / accounts,
+                "threads_added": threading.active_count() - threads_before,
+                "listeners": pool.stats().active_listeners,
+            },
+        ))
+        assert len(sessions) == accounts
+        pool.close()
+    return results
+
+
+def print_memory_table(measurements: list[Measurement]) -> None:
+    """Print bytes per entry (or per account) for each measurement."""
+    print(f"{'benchmark':<28} {'form':<8} {'entries':>8} {'kB':>10} {'B/entry':>9}")
+    for m in measurements:
+        if m.name == "session_memory":
+            print(f"{m.name:<28} {'session':<8} {m.params['accounts']:>8} "
+                  f"{m.extra['bytes_retained'] / 1024:>10.1f} {m.extra['bytes_per_account']:>9.1f}")
+            continue
+        print(f"{m.name:<28} {m.params['form']:<8} {m.extra['entries']:>8} "
+              f"{m.extra['bytes_retained'] / 1024:>10.1f} {m.extra['bytes_per_entry']:>9.1f}")
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--quick", action="store_true", help="small data set, for smoke testing")
+    args = parser.parse_args()
+
+    days = 14 if args.quick else args.days
+    measurements = run(days, multi_docs=2, multi_entries=20 if args.quick else 500)
+    measurements += run_sessions((10, 100) if args.quick else (100, 1000))
+    print_memory_table(measurements)
+    if args.output:
+        write_results(args.output, "memory", measurements, {"days": days, "quick": args.quick})
+
+
+if __name__ == "__main__":
+    main()
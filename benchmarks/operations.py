@@ -0,0 +1,214 @@
+"""Per-operation benchmark of the public HuckleberryAPI surface.
+
+Measures wall time, RPC count, document reads/writes and bytes transferred for
+each operation against the in-memory backend:
+
+    python -m benchmarks.operations --output bench-operations.json
+    python -m benchmarks.operations --compare bench-operations.json
+
+Covers ``get_children`` with many children, ``get_calendar_events`` over ranges
+from one day to five years with large multi-entry batch documents, timer
+sequences, listener fan-out, and a cold start done step by step versus
+``startup()``. Authentication is excluded (it needs the
+Identity Toolkit service).
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import time
+from pathlib import Path
+from typing import Any
+
+from huckleberry_api import MemoryBackend
+
+from .common import (
+    DAY,
+    Measurement,
+    compare_results,
+    measure,
+    measure_sequence,
+    offline_api,
+    print_table,
+    seed_account,
+    seed_history,
+    write_results,
+)
+
+RANGES_DAYS = (1, 7, 30, 365, 1825)
+
+
+def bench_children(latency: float, repeats: int, child_counts: tuple[int, ...]) -> list[Measurement]:
+    """get_children for accounts with increasing numbers of children."""
+    results = []
+    for count in child_counts:
+        backend = MemoryBackend()
+        seed_account(backend, count)
+        backend.latency = latency
+        api = offline_api(backend)
+        results.append(measure(backend, "get_children", api.get_children, repeats, {"children": count}))
+    return results
+
+
+def bench_history(latency: float, repeats: int, days: int, multi_docs: int, multi_entries: int
+                  ) -> list[Measurement]:
+    """Range reads over a long history with batched multi-entry documents."""
+    backend = MemoryBackend()
+    child_uid = seed_account(backend, 1)[0]
+    now = time.time()
+    seed_history(backend, child_uid, now, days, multi_docs, multi_entries)
+    backend.latency = latency
+    api = offline_api(backend)
+
+    results = []
+    for range_days in (d for d in RANGES_DAYS if d <= days):
+        start, end = int(now - range_days * DAY), int(now)
+        results.append(measure(backend, "get_calendar_events",
+                               lambda: api.get_calendar_events(child_uid, start, end), repeats,
+                               {"days": range_days, "multi_entries": multi_docs * multi_entries}))
+    start, end = int(now - 30 * DAY), int(now)
+    for name in ("get_sleep_intervals", "get_feed_intervals", "get_diaper_intervals", "get_health_entries"):
+        getter = getattr(api, name)
+        results.append(measure(backend, name, lambda getter=getter: getter(child_uid, start, end), repeats,
+                               {"days": 30}))
+    for range_days in (d for d in RANGES_DAYS if d <= days):
+        start, end = int(now - range_days * DAY), int(now)
+        results.append(measure(backend, "get_interval_totals:sleep",
+                               lambda: api.get_interval_totals(child_uid, "sleep", start, end), repeats,
+                               {"days": range_days, "multi_entries": multi_docs * multi_entries}))
+    if importlib.util.find_spec("numpy") is not None:
+        from huckleberry_api.summary import summarize_days
+
+        events = api.get_calendar_events(child_uid, int(now - days * DAY), int(now))
+        results.append(measure(backend, "summarize_days", lambda: summarize_days(events), repeats,
+                               {"days": days, "events": sum(len(tracker) for tracker in events.values())}))
+    results.append(measure(backend, "get_growth_data", lambda: api.get_growth_data(child_uid), repeats))
+    return results
+
+
+def bench_timers(latency: float, repeats: int) -> list[Measurement]:
+    """Timer and logging operations, each measured inside a realistic sequence."""
+    backend = MemoryBackend()
+    child_uid = seed_account(backend, 1)[0]
+    backend.latency = latency
+    api = offline_api(backend)
+
+    results = measure_sequence(backend, [
+        ("start_sleep", lambda: api.start_sleep(child_uid)),
+        ("pause_sleep", lambda: api.pause_sleep(child_uid)),
+        ("resume_sleep", lambda: api.resume_sleep(child_uid)),
+        ("complete_sleep", lambda: api.complete_sleep(child_uid)),
+        ("start_sleep:cancel", lambda: api.start_sleep(child_uid)),
+        ("cancel_sleep", lambda: api.cancel_sleep(child_uid)),
+    ], repeats)
+    results += measure_sequence(backend, [
+        ("start_feeding", lambda: api.start_feeding(child_uid, side="left")),
+        ("switch_feeding_side", lambda: api.switch_feeding_side(child_uid)),
+        ("pause_feeding", lambda: api.pause_feeding(child_uid)),
+        ("resume_feeding", lambda: api.resume_feeding(child_uid)),
+        ("complete_feeding", lambda: api.complete_feeding(child_uid)),
+        ("start_feeding:cancel", lambda: api.start_feeding(child_uid, side="right")),
+        ("cancel_feeding", lambda: api.cancel_feeding(child_uid)),
+    ], repeats)
+    results.append(measure(backend, "log_diaper",
+                           lambda: api.log_diaper(child_uid, mode="both", pee_amount="medium",
+                                                  color="yellow", consistency="runny"), repeats))
+    results.append(measure(backend, "log_growth",
+                           lambda: api.log_growth(child_uid, weight=5.2, height=55.0, head=38.0), repeats))
+    return results
+
+
+def bench_listeners(latency: float, repeats: int, child_counts: tuple[int, ...]) -> list[Measurement]:
+    """Listener setup and write fan-out for all trackers of many children."""
+    results = []
+    for count in child_counts:
+        backend = MemoryBackend()
+        child_uids = seed_account(backend, count)
+        backend.latency = latency
+        api = offline_api(backend)
+        deliveries: list[Any] = []
+
+        def setup() -> None:
+            for child_uid in child_uids:
+                api.setup_realtime_listener(child_uid, deliveries.append)
+                api.setup_feed_listener(child_uid, deliveries.append)
+                api.setup_diaper_listener(child_uid, deliveries.append)
+                api.setup_health_listener(child_uid, deliveries.append)
+
+        def write_all() -> None:
+            for child_uid in child_uids:
+                api.log_diaper(child_uid, mode="pee")
+
+        results += measure_sequence(backend, [
+            ("setup_listeners", setup),
+            ("log_diaper:fan_out", write_all),
+            ("stop_all_listeners", api.stop_all_listeners),
+        ], repeats, {"children": count})
+        # Timed passes plus the counting pass
+        results[-2].extra["deliveries_per_run"] = len(deliveries) // (repeats + 1)
+    return results
+
+
+def bench_startup(latency: float, repeats: int, child_counts: tuple[int, ...]) -> list[Measurement]:
+    """Children, first state and listeners: one step after the other versus startup()."""
+    results = []
+    for count in child_counts:
+        backend = MemoryBackend()
+        seed_account(backend, count)
+        backend.latency = latency
+        api = offline_api(backend)
+
+        def sequential() -> None:
+            client = api._get_firestore_client()
+            for child in api.get_children():
+                for collection in ("sleep", "feed", "diaper", "health"):
+                    client.collection(collection).document(child["uid"]).get()
+                    api._setup_listener(collection, child["uid"], lambda data: None)
+            api.stop_all_listeners()
+
+        def pipelined() -> None:
+            api.startup(callback=lambda collection, child_uid, data: None)
+            api.stop_all_listeners()
+
+        results.append(measure(backend, "startup:sequential", sequential, repeats, {"children": count}))
+        results.append(measure(backend, "startup:pipelined", pipelined, repeats, {"children": count}))
+    return results
+
+
+def run(latency: float, repeats: int, quick: bool) -> list[Measurement]:
+    """Run the whole suite."""
+    if quick:
+        return (bench_children(latency, repeats, (1, 5))
+                + bench_history(latency, repeats, days=30, multi_docs=2, multi_entries=50)
+                + bench_timers(latency, repeats)
+                + bench_listeners(latency, repeats, (2,))
+                + bench_startup(latency, repeats, (2,)))
+    return (bench_children(latency, repeats, (1, 10, 100))
+            + bench_history(latency, repeats, days=1825, multi_docs=8, multi_entries=500)
+            + bench_timers(latency, repeats)
+            + bench_listeners(latency, repeats, (1, 10, 50))
+            + bench_startup(latency, repeats, (1, 10, 50)))
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="compare against a previous JSON result file")
+    parser.add_argument("--latency", type=float, default=0.0, help="injected latency per RPC in seconds")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="small data set, for smoke testing")
+    args = parser.parse_args()
+
+    measurements = run(args.latency, args.repeats, args.quick)
+    print_table(measurements)
+    if args.compare:
+        print()
+        print("\n".join(compare_results(args.compare, measurements)))
+    if args.output:
+        write_results(args.output, "operations", measurements,
+                      {"latency": args.latency, "repeats": args.repeats, "quick": args.quick})
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,31 @@
 from __future__ import annotations
 
 from .api import HuckleberryAPI
+from .backend import FirestoreBackend, StorageBackend
+from .cache import ReadCache, ReadCacheStats
+from .costs import BudgetExceededError, CostBudget, CostCounts, CostMeter
+from .deltas import DocumentDelta, FieldChange
+from .dispatch import CallbackDispatcher, DispatchStats
+from .live import IntervalWindow
+from .memory import MemoryBackend
+from .pool import ListenerLimitError, SessionLimits, SessionPool
+from .ratelimit import RateLimiter, RateLimitStats, low_priority
+from .records import (
+    DiaperInterval,
+    FeedInterval,
+    FeedTimer,
+    HealthEntry,
+    IntervalRecord,
+    SleepInterval,
+    SleepTimer,
+)
+from .rest import RestBackend
+from .rollups import Rollup, RollupStore
+from .shards import RangeSharding
+from .startup import StartupReport
+from .tracing import RecordedSpan, RecordingTracer, Span, Tracer
 from .types import (
+    ChildDashboard,
     ChildData,
     DiaperData,
     DiaperDocumentData,
@@ -11,13 +35,54 @@ from .types import (
     FeedTimerData,
     GrowthData,
     HealthDocumentData,
+    IntervalTotals,
     SleepDocumentData,
     SleepIntervalData,
     SleepTimerData,
 )
+from .watch import WatchStream, WatchUpdate
 
 __all__ = [
     "HuckleberryAPI",
+    "FirestoreBackend",
+    "MemoryBackend",
+    "RestBackend",
+    "Rollup",
+    "RollupStore",
+    "StartupReport",
+    "StorageBackend",
+    "ReadCache",
+    "ReadCacheStats",
+    "BudgetExceededError",
+    "CostBudget",
+    "CostCounts",
+    "CostMeter",
+    "CallbackDispatcher",
+    "DispatchStats",
+    "DocumentDelta",
+    "FieldChange",
+    "IntervalWindow",
+    "ListenerLimitError",
+    "SessionLimits",
+    "SessionPool",
+    "RateLimiter",
+    "RateLimitStats",
+    "low_priority",
+    "RangeSharding",
+    "DiaperInterval",
+    "FeedInterval",
+    "FeedTimer",
+    "HealthEntry",
+    "IntervalRecord",
+    "SleepInterval",
+    "SleepTimer",
+    "RecordedSpan",
+    "RecordingTracer",
+    "Span",
+    "Tracer",
+    "WatchStream",
+    "WatchUpdate",
+    "ChildDashboard",
     "ChildData",
     "DiaperData",
     "DiaperDocumentData",
@@ -26,6 +91,7 @@ __all__ = [
     "FeedTimerData",
     "GrowthData",
     "HealthDocumentData",
+    "IntervalTotals",
     "SleepDocumentData",
     "SleepIntervalData",
     "SleepTimerData",
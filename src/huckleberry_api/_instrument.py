@@ -0,0 +1,195 @@
+"""Instrumented wrappers around the Firestore client.
+
+The wrappers mirror the small part of the ``google.cloud.firestore`` surface
+used by HuckleberryAPI and run every RPC through a list of hooks. Anything
+not wrapped here is forwarded to the underlying object unchanged.
+"""
+from __future__ import annotations
+
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Any, Callable, ContextManager, Iterator, Sequence
+
+# Top-level collections whose document ID is a child UID
+CHILD_COLLECTIONS: frozenset[str] = frozenset({"sleep", "feed", "health", "diaper", "childs"})
+
+
+@dataclass
+class RpcCall:
+    """Description of a single Firestore RPC, filled in while it runs."""
+
+    operation: str
+    path: str
+    documents: int = 0
+    retries: int = 0
+
+    @property
+    def collection(self) -> str:
+        """Top-level collection name (e.g. 'sleep')."""
+        return self.path.split("/", 1)[0]
+
+    @property
+    def subcollection(self) -> str | None:
+        """Subcollection name for paths below a document (e.g. 'intervals')."""
+        parts = self.path.split("/")
+        return parts[2] if len(parts) > 2 else None
+
+    @property
+    def child_uid(self) -> str | None:
+        """Child UID for per-child collections, if the path identifies one."""
+        parts = self.path.split("/")
+        if len(parts) > 1 and parts[0] in CHILD_COLLECTIONS:
+            return parts[1]
+        return None
+
+
+RpcHook = Callable[[RpcCall], ContextManager[Any]]
+RetryFactory = Callable[[RpcCall], Any]
+
+
+class _Instrumented:
+    """Shared plumbing for the wrapper classes."""
+
+    def __init__(self, wrapped: Any, path: str, hooks: Sequence[RpcHook], retry_factory: RetryFactory | None) -> None:
+        self._wrapped = wrapped
+        self._path = path
+        self._hooks = hooks
+        self._retry_factory = retry_factory
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._wrapped, name)
+
+    def _child(self, cls: type[_Instrumented], wrapped: Any, path: str) -> Any:
+        return cls(wrapped, path, self._hooks, self._retry_factory)
+
+    def _call(self, operation: str, method: Callable[..., Any], counter: Callable[[Any], int], *args: Any,
+              **kwargs: Any) -> Any:
+        call = RpcCall(operation, self._path)
+        with ExitStack() as stack:
+            for hook in self._hooks:
+                stack.enter_context(hook(call))
+            if self._retry_factory is not None and "retry" not in kwargs:
+                retry = self._retry_factory(call)
+                if retry is not None:
+                    kwargs["retry"] = retry
+            result = method(*args, **kwargs)
+            call.documents = counter(result)
+            return result
+
+    def _stream(self, method: Callable[..., Any], *args: Any, **kwargs: Any) -> Iterator[Any]:
+        call = RpcCall("stream", self._path)
+        with ExitStack() as stack:
+            for hook in self._hooks:
+                stack.enter_context(hook(call))
+            if self._retry_factory is not None and "retry" not in kwargs:
+                retry = self._retry_factory(call)
+                if retry is not None:
+                    kwargs["retry"] = retry
+            for doc in method(*args, **kwargs):
+                call.documents += 1
+                yield doc
+
+
+def _exists_count(snapshot: Any) -> int:
+    return 1 if getattr(snapshot, "exists", False) else 0
+
+
+def _one(_: Any) -> int:
+    return 1
+
+
+class InstrumentedQuery(_Instrumented):
+    """Wrapper for collection references and queries."""
+
+    def where(self, *args: Any, **kwargs: Any) -> InstrumentedQuery:
+        return self._child(InstrumentedQuery, self._wrapped.where(*args, **kwargs), self._path)
+
+    def order_by(self, *args: Any, **kwargs: Any) -> InstrumentedQuery:
+        return self._child(InstrumentedQuery, self._wrapped.order_by(*args, **kwargs), self._path)
+
+    def limit(self, count: int) -> InstrumentedQuery:
+        return self._child(InstrumentedQuery, self._wrapped.limit(count), self._path)
+
+    def select(self, field_paths: Any) -> InstrumentedQuery:
+        return self._child(InstrumentedQuery, self._wrapped.select(field_paths), self._path)
+
+    def stream(self, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        return self._stream(self._wrapped.stream, *args, **kwargs)
+
+    def count(self, *args: Any, **kwargs: Any) -> InstrumentedAggregation:
+        return self._child(InstrumentedAggregation, self._wrapped.count(*args, **kwargs), self._path)
+
+    def sum(self, *args: Any, **kwargs: Any) -> InstrumentedAggregation:
+        return self._child(InstrumentedAggregation, self._wrapped.sum(*args, **kwargs), self._path)
+
+    def avg(self, *args: Any, **kwargs: Any) -> InstrumentedAggregation:
+        return self._child(InstrumentedAggregation, self._wrapped.avg(*args, **kwargs), self._path)
+
+
+class InstrumentedAggregation(_Instrumented):
+    """Wrapper for an aggregation query."""
+
+    def count(self, *args: Any, **kwargs: Any) -> InstrumentedAggregation:
+        return self._child(InstrumentedAggregation, self._wrapped.count(*args, **kwargs), self._path)
+
+    def sum(self, *args: Any, **kwargs: Any) -> InstrumentedAggregation:
+        return self._child(InstrumentedAggregation, self._wrapped.sum(*args, **kwargs), self._path)
+
+    def avg(self, *args: Any, **kwargs: Any) -> InstrumentedAggregation:
+        return self._child(InstrumentedAggregation, self._wrapped.avg(*args, **kwargs), self._path)
+
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        return self._call("aggregate", self._wrapped.get, _one, *args, **kwargs)
+
+
+class InstrumentedCollection(InstrumentedQuery):
+    """Wrapper for a collection reference."""
+
+    def document(self, document_id: str | None = None) -> InstrumentedDocument:
+        ref = self._wrapped.document(document_id)
+        return self._child(InstrumentedDocument, ref, f"{self._path}/{ref.id}")
+
+
+class InstrumentedDocument(_Instrumented):
+    """Wrapper for a document reference."""
+
+    def collection(self, collection_id: str) -> InstrumentedCollection:
+        return self._child(InstrumentedCollection, self._wrapped.collection(collection_id),
+                           f"{self._path}/{collection_id}")
+
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        return self._call("get", self._wrapped.get, _exists_count, *args, **kwargs)
+
+    def set(self, *args: Any, **kwargs: Any) -> Any:
+        return self._call("set", self._wrapped.set, _one, *args, **kwargs)
+
+    def update(self, *args: Any, **kwargs: Any) -> Any:
+        return self._call("update", self._wrapped.update, _one, *args, **kwargs)
+
+    def delete(self, *args: Any, **kwargs: Any) -> Any:
+        return self._call("delete", self._wrapped.delete, _one, *args, **kwargs)
+
+
+class InstrumentedClient(_Instrumented):
+    """Wrapper for a Firestore client."""
+
+    def __init__(self, wrapped: Any, hooks: Sequence[RpcHook], retry_factory: RetryFactory | None = None) -> None:
+        super().__init__(wrapped, "", hooks, retry_factory)
+
+    def collection(self, collection_id: str) -> InstrumentedCollection:
+        return self._child(InstrumentedCollection, self._wrapped.collection(collection_id), collection_id)
+
+    def get_all(self, references: Sequence[Any], *args: Any, **kwargs: Any) -> list[Any]:
+        """Read several documents in one batched RPC."""
+        unwrapped = [getattr(reference, "_wrapped", reference) for reference in references]
+
+        def get_all(*args: Any, **kwargs: Any) -> list[Any]:
+            return list(self._wrapped.get_all(unwrapped, *args, **kwargs))
+
+        # Firestore bills every requested document, found or not
+        return self._call("get_all", get_all, lambda snapshots: len(unwrapped), *args, **kwargs)
+
+    @property
+    def wrapped(self) -> Any:
+        """The underlying client."""
+        return self._wrapped
@@ -1,35 +1,64 @@
 """API client for Huckleberry."""
 from __future__ import annotations
 
+import copy
+import functools
+import inspect
 import logging
+import threading
 import time
 import uuid
 from datetime import datetime
-from typing import Callable, Literal, TypeVar, cast
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Literal, Sequence, TypeVar, cast
 from zoneinfo import ZoneInfo
 
 import requests
-from google.auth.credentials import Credentials
-from google.cloud import firestore
 
-from .const import AUTH_URL, FIREBASE_API_KEY, REFRESH_URL
+from ._instrument import InstrumentedClient, RpcHook
+from .backend import FirebaseTokenCredentials, FirestoreBackend, StorageBackend
+from .batches import BatchIndex
+from .cache import MISS, ReadCache, ReadFailed
+from .const import AUTH_URL, FIREBASE_API_KEY, READ_METHODS, REFRESH_URL
+from .costs import CostCounts, CostMeter
+from .deltas import DocumentDelta, diff_documents
+from .live import IntervalWindow, WindowSource
+from .records import INTERVAL_DECODERS, IntervalRecord, decode_snapshots
+from .shards import RangeSharding, stream_sharded
+from .singleflight import SingleFlight
+from .timezones import offset_minutes
+from .tracing import Tracer, hash_child_uid, rpc_span_hook
 from .types import (
+    ChildDashboard,
     ChildData,
     DiaperDocumentData,
     FeedDocumentData,
+    FeedTimerData,
     FirebaseDiaperInterval,
     FirebaseFeedDocument,
     FirebaseGrowthData,
     FirebaseSleepDocument,
     GrowthData,
     HealthDocumentData,
+    IntervalTotals,
     LastDiaperData,
     LastNursingData,
     LastSideData,
     LastSleepData,
     SleepDocumentData,
+    SleepTimerData,
 )
 
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+    from .dispatch import CallbackDispatcher
+    from .pool import SessionLimits
+    from .ratelimit import RateLimiter
+    from .startup import StartupCallback, StartupReport
+    from .growth import GrowthHistory
+    from .summary import DailySummary
+    from .watch import WatchStream
+
 # Type aliases for known string values
 CollectionName = Literal["sleep", "feed", "health", "diaper"]
 FeedSide = Literal["left", "right"]
@@ -42,38 +71,235 @@ MeasurementUnits = Literal["metric", "imperial"]
 # Union type for all document data types used in listeners
 DocumentData = SleepDocumentData | FeedDocumentData | HealthDocumentData | DiaperDocumentData
 TDocumentData = TypeVar('TDocumentData', SleepDocumentData, FeedDocumentData, HealthDocumentData, DiaperDocumentData)
+TFunc = TypeVar("TFunc", bound=Callable[..., Any])
+# Receives (collection, child_uid, entry) for each completed interval entry
+IntervalObserver = Callable[[str, str, dict[str, Any]], None]
 
 _LOGGER = logging.getLogger(__name__)
 
+# History subcollection of each tracker document
+INTERVAL_SUBCOLLECTIONS: dict[str, str] = {
+    "sleep": "intervals",
+    "feed": "intervals",
+    "diaper": "intervals",
+    "health": "data",
+}
+# prefs field holding the latest completed entry of each tracker
+LATEST_ENTRY_FIELDS: dict[str, str] = {
+    "sleep": "lastSleep",
+    "feed": "lastNursing",
+    "diaper": "lastDiaper",
+    "health": "lastGrowthEntry",
+}
+# Field mask of regular interval documents: the fields the getters decode
+INTERVAL_FIELDS: dict[str, tuple[str, ...]] = {
+    "sleep": ("start", "duration", "offset", "multi"),
+    "feed": ("start", "leftDuration", "rightDuration", "offset", "mode", "multi"),
+    "diaper": ("start", "mode", "offset", "pooColor", "pooConsistency", "amount", "multi"),
+    "health": ("start", "offset", "weight", "height", "head", "multi"),
+}
+# Field mask of multi-entry batch documents (entry IDs are not known up front)
+MULTI_BATCH_FIELDS: tuple[str, ...] = ("multi", "data")
+# Field mask of child documents read by get_children
+CHILD_FIELDS: tuple[str, ...] = (
+    "name", "childsName", "birthdate", "picture", "gender", "color", "createdAt",
+    "nightStart", "morningCutoff", "naps", "categories",
+)
+# Field mask of the tracker documents read by get_dashboard
+DASHBOARD_FIELDS: tuple[str, ...] = (
+    "timer", "prefs.lastSleep", "prefs.lastNursing", "prefs.lastSide", "prefs.lastDiaper",
+    "prefs.lastGrowthEntry",
+)
+# Tracker documents read by get_dashboard
+DASHBOARD_COLLECTIONS: tuple[str, ...] = ("sleep", "feed", "diaper", "health")
+# Timer fields (camelCase) → SleepTimerData / FeedTimerData keys (snake_case)
+SLEEP_TIMER_KEYS: dict[str, str] = {
+    "timestamp": "timestamp",
+    "local_timestamp": "local_timestamp_sec",
+    "timerStartTime": "timer_start_time_ms",
+    "uuid": "uuid",
+    "details": "details",
+}
+FEED_TIMER_KEYS: dict[str, str] = {
+    "timestamp": "timestamp",
+    "local_timestamp": "local_timestamp_sec",
+    "feedStartTime": "feed_start_time_sec",
+    "timerStartTime": "timer_start_time_sec",
+    "uuid": "uuid",
+    "leftDuration": "left_duration_sec",
+    "rightDuration": "right_duration_sec",
+    "lastSide": "last_side",
+    "activeSide": "active_side",
+}
+# Fields summed by get_interval_totals when no sum_fields are given
+DEFAULT_TOTAL_FIELDS: dict[str, tuple[str, ...]] = {
+    "sleep": ("duration",),
+    "feed": ("leftDuration", "rightDuration"),
+    "diaper": (),
+    "health": (),
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _copy_extra_fields(event: dict[str, Any], data: dict[str, Any], extra_fields: Sequence[str]) -> None:
+    """Copy the values of dotted field paths present in ``data`` into ``event``.
+
+    Nested values are copied, as ``data`` may be a cached batch entry.
+    """
+    for field_path in extra_fields:
+        value: Any = data
+        for part in field_path.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        if value is not None:
+            event[field_path] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+def _child_data(child_id: str, child_data: dict[str, Any]) -> ChildData:
+    """Build ChildData from a child document."""
+    # Name may appear as 'childsName' in some documents
+    display_name = child_data.get("name") or child_data.get("childsName") or "Unknown"
+    return {
+        "uid": child_id,
+        "name": display_name,
+        "birthday": child_data.get("birthdate"),
+        "picture": child_data.get("picture"),
+        "gender": child_data.get("gender"),
+        "color": child_data.get("color"),
+        "created_at": child_data.get("createdAt"),
+        "night_start_min": child_data.get("nightStart"),
+        "morning_cutoff_min": child_data.get("morningCutoff"),
+        "expected_naps": child_data.get("naps"),
+        "categories": child_data.get("categories"),
+    }
+
+
+def _growth_data(last_growth: dict[str, Any] | None) -> GrowthData:
+    """Build GrowthData from prefs.lastGrowthEntry (units only if there is none)."""
+    if not last_growth:
+        return {
+            "weight_units": "kg",
+            "height_units": "cm",
+            "head_units": "hcm",
+        }
+    return {
+        "weight": last_growth.get("weight"),
+        "height": last_growth.get("height"),
+        "head": last_growth.get("head"),
+        "weight_units": last_growth.get("weightUnits", "kg"),
+        "height_units": last_growth.get("heightUnits", "cm"),
+        "head_units": last_growth.get("headUnits", "hcm"),
+        "timestamp_sec": last_growth.get("start"),
+    }
+
+
+def _timer_data(timer: Any, keys: dict[str, str]) -> dict[str, Any] | None:
+    """Map a timer field to its snake_case TypedDict form, or None if there is no timer."""
+    if not isinstance(timer, dict):
+        return None
+    data: dict[str, Any] = {"active": bool(timer.get("active", False)), "paused": bool(timer.get("paused", False))}
+    for source, target in keys.items():
+        if source in timer:
+            data[target] = timer[source]
+    return data
+
+
+def _api_call(func: TFunc) -> TFunc:
+    """Wrap a public API method in a tracing span and cost attribution when configured."""
+    signature = inspect.signature(func)
+    params = list(signature.parameters)
+    takes_child = len(params) > 1 and params[1] == "child_uid"
+    reads = func.__name__ in READ_METHODS
+
+    def traced(self: HuckleberryAPI, child_uid: str | None, *args: Any, **kwargs: Any) -> Any:
+        tracer = self._tracer
+        if tracer is None:
+            return func(self, *args, **kwargs)
+
+        attributes: dict[str, Any] = {"huckleberry.method": func.__name__}
+        if child_uid:
+            attributes["huckleberry.child_uid_hash"] = hash_child_uid(child_uid)
+        with tracer.start_as_current_span(f"huckleberry.{func.__name__}", attributes=attributes):
+            return func(self, *args, **kwargs)
+
+    def call_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+        """Arguments of a call with defaults applied, so equivalent calls compare equal."""
+        bound = signature.bind(None, *args, **kwargs)
+        bound.apply_defaults()
+        return repr(tuple(bound.arguments.values())[1:])
+
+    @functools.wraps(func)
+    def wrapper(self: HuckleberryAPI, *args: Any, **kwargs: Any) -> Any:
+        child_uid = (args[0] if args else kwargs.get("child_uid")) if takes_child else None
+        cache = self._read_cache if self._read_cache is not None and self._read_cache.caches(func.__name__) else None
+        key = call_key(args, kwargs) if reads and (self._inflight or self._cost_meter or cache) else ""
+        if cache is not None:
+            cached = cache.get(func.__name__, key)
+            if cached is not MISS:
+                return cached
+        call = functools.partial(traced, self, child_uid, *args, **kwargs)
+        meter = self._cost_meter
+        if meter is not None:
+            call = functools.partial(meter.run, self.user_uid or "", func.__name__, child_uid, call, key)
+        if cache is not None:
+            call = functools.partial(cache.load, func.__name__, key, child_uid, call)
+        try:
+            if key and self._inflight is not None:
+                # Identical concurrent reads share one execution
+                return self._inflight.do((func.__name__, key), call)
+            return call()
+        except ReadFailed as failed:
+            # Returned here, outside the cache, so the fallback is never cached
+            return copy.deepcopy(failed.fallback)
 
-class FirebaseTokenCredentials(Credentials):
-    """Custom credentials class for Firebase SDK."""
-
-    def __init__(self, id_token: str):
-        """Initialize with Firebase ID token."""
-        super().__init__()
-        self._id_token = id_token
-        self.token = id_token  # Set the token attribute that parent expects
-
-    def refresh(self, request):
-        """Token refresh is handled by HuckleberryAPI.
-
-        This method is required by the Credentials interface but is not used.
-        Token refreshing is managed externally by HuckleberryAPI.refresh_auth_token(),
-        and a new FirebaseTokenCredentials instance is created with the refreshed token.
-        """
+    return cast(TFunc, wrapper)
 
 
 class HuckleberryAPI:
     """API client for Huckleberry."""
 
-    def __init__(self, email: str, password: str, timezone: str) -> None:
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        timezone: str,
+        tracer: Tracer | None = None,
+        backend: StorageBackend | None = None,
+        limits: SessionLimits | None = None,
+        dispatcher: CallbackDispatcher | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cost_meter: CostMeter | None = None,
+        coalesce_reads: bool = True,
+        read_cache: ReadCache | None = None,
+        range_sharding: RangeSharding | None = None,
+    ) -> None:
         """Initialize the API client.
 
         Args:
             email: User email for authentication.
             password: User password for authentication.
             timezone: IANA timezone string (e.g., "America/New_York", "Europe/London").
+            tracer: Optional tracer (e.g. an OpenTelemetry tracer or RecordingTracer).
+                Produces one span per public API method, with child spans per
+                Firestore RPC and per HTTP auth call.
+            backend: Storage backend creating the Firestore client. Defaults to
+                FirestoreBackend (google-cloud-firestore); MemoryBackend runs offline.
+            limits: Optional concurrent RPC and listener limits shared with other
+                sessions (see SessionPool).
+            dispatcher: Optional CallbackDispatcher running listener callbacks off the
+                watch thread, with bounded per-listener queues.
+            rate_limiter: Optional RateLimiter admitting Firestore reads and writes and
+                auth calls against token-bucket budgets.
+            cost_meter: Optional CostMeter counting billed document reads, writes and
+                deletes per method, child and account, and enforcing its budgets.
+            coalesce_reads: Let identical concurrent calls of read methods (same method
+                and arguments) share one execution and its result.
+            read_cache: Optional ReadCache answering get_children and get_growth_data
+                locally until their TTL passes or this session sees their documents change.
+            range_sharding: Optional RangeSharding; the interval getters then split long
+                ranges into time shards streamed concurrently.
         """
         self.email = email
         self.password = password
@@ -82,24 +308,53 @@ class HuckleberryAPI:
         self.user_uid: str | None = None
         self.token_expires_at: float | None = None
         self._firestore_client: firestore.Client | None = None
+        # Serializes sign-in, token refresh and client creation; re-entrant, as a refresh recreates listeners
+        self._auth_lock = threading.RLock()
+        self._token_generation = 0  # incremented per new token
+        self._listener_lock = threading.Lock()  # guards _listeners, _listener_callbacks and _listener_state
         self._timezone = ZoneInfo(timezone)
         self._listeners: dict = {}  # Store active listeners
         self._listener_callbacks: dict = {}  # Store callbacks to recreate listeners
-
+        self._listener_state: dict[str, dict[str, Any]] = {}  # Last delivered document per listener
+        self._tracer = tracer
+        self._backend: StorageBackend = backend if backend is not None else FirestoreBackend()
+        self.batch_index = BatchIndex()  # Per-version batch summaries for the range getters
+        self._interval_observers: list[IntervalObserver] = []
+        self._limits = limits
+        self._dispatcher = dispatcher
+        self._rate_limiter = rate_limiter
+        self._cost_meter = cost_meter
+        self._inflight = SingleFlight() if coalesce_reads else None
+        self._read_cache = read_cache
+        self._range_sharding = range_sharding
+        self._rpc_hooks: list[RpcHook] = []
+        if tracer is not None:
+            self._rpc_hooks.append(rpc_span_hook(tracer))
+        if cost_meter is not None:
+            self._rpc_hooks.append(cost_meter.hook(lambda: self.user_uid))
+        if read_cache is not None:
+            self._rpc_hooks.append(read_cache.rpc_hook)
+        if rate_limiter is not None:
+            # Before the concurrency slot, so waiting for a token does not hold a slot
+            self._rpc_hooks.append(rate_limiter.rpc_hook)
+        if limits is not None:
+            self._rpc_hooks.append(limits.rpc_slot)
+
+    @_api_call
     def authenticate(self) -> None:
         """Authenticate with Firebase."""
+        with self._auth_lock:
+            self._authenticate()
+
+    def _authenticate(self) -> None:
         _LOGGER.debug("Authenticating with Huckleberry")
 
         try:
-            response = requests.post(
-                f"{AUTH_URL}?key={FIREBASE_API_KEY}",
-                json={
-                    "email": self.email,
-                    "password": self.password,
-                    "returnSecureToken": True,
-                },
-                timeout=10,
-            )
+            response = self._post_auth("auth.sign_in", AUTH_URL, {
+                "email": self.email,
+                "password": self.password,
+                "returnSecureToken": True,
+            })
             response.raise_for_status()
 
             data = response.json()
@@ -107,6 +362,7 @@ class HuckleberryAPI:
             self.refresh_token = data["refreshToken"]
             self.user_uid = data["localId"]
             self.token_expires_at = datetime.now().timestamp() + int(data["expiresIn"])
+            self._token_generation += 1
 
             _LOGGER.info("Successfully authenticated with Huckleberry")
         except requests.exceptions.HTTPError as err:
@@ -120,6 +376,7 @@ class HuckleberryAPI:
                     _LOGGER.error("Response: %s", err.response.text)
             raise
 
+    @_api_call
     def maintain_session(self) -> None:
         """Ensure the session is valid and refresh token if needed.
 
@@ -128,39 +385,45 @@ class HuckleberryAPI:
         """
         self._ensure_authenticated()
 
+    @_api_call
     def refresh_auth_token(self) -> None:
-        """Refresh the authentication token."""
+        """Refresh the authentication token.
+
+        Only one refresh runs at a time. Callers that had to wait while another
+        thread refreshed use that thread's new token instead of refreshing again.
+        """
+        generation = self._token_generation
+        with self._auth_lock:
+            if self._token_generation != generation:
+                _LOGGER.debug("Token was refreshed by another thread")
+                return
+            self._refresh_auth_token()
+
+    def _refresh_auth_token(self) -> None:
         if not self.refresh_token:
             raise ValueError("No refresh token available")
 
         _LOGGER.debug("Refreshing authentication token")
 
-        response = requests.post(
-            f"{REFRESH_URL}?key={FIREBASE_API_KEY}",
-            json={
-                "grant_type": "refresh_token",
-                "refresh_token": self.refresh_token,
-            },
-            timeout=10,
-        )
+        response = self._post_auth("auth.refresh", REFRESH_URL, {
+            "grant_type": "refresh_token",
+            "refresh_token": self.refresh_token,
+        })
         response.raise_for_status()
 
         data = response.json()
         self.id_token = data["id_token"]
         self.refresh_token = data["refresh_token"]
         self.token_expires_at = datetime.now().timestamp() + int(data["expires_in"])
+        self._token_generation += 1
 
         # Stop existing listeners (they use the old token)
-        for key, watch in self._listeners.items():
-            try:
-                if hasattr(watch, "unsubscribe") and callable(getattr(watch, "unsubscribe")):
-                    watch.unsubscribe()
-                elif hasattr(watch, "close") and callable(getattr(watch, "close")):
-                    watch.close()
-                _LOGGER.debug("Stopped listener %s before token refresh", key)
-            except Exception as err:
-                _LOGGER.error("Error stopping listener %s before refresh: %s", key, err)
-        self._listeners.clear()
+        with self._listener_lock:
+            listeners = dict(self._listeners)
+            self._listeners.clear()
+        for key, watch in listeners.items():
+            self._unsubscribe(key, watch)
+            _LOGGER.debug("Stopped listener %s before token refresh", key)
 
         # Invalidate the Firestore client so it gets recreated with new token
         self._firestore_client = None
@@ -168,29 +431,61 @@ class HuckleberryAPI:
         _LOGGER.debug("Successfully refreshed authentication token")
 
         # Recreate all listeners with new token
-        _LOGGER.info("Recreating %d listeners with refreshed token", len(self._listener_callbacks))
-        callbacks_copy = dict(self._listener_callbacks)  # Copy to avoid modification during iteration
-        for key, (listener_type, child_uid, callback) in callbacks_copy.items():
+        with self._listener_lock:
+            callbacks_copy = dict(self._listener_callbacks)  # Copy to avoid modification during iteration
+        _LOGGER.info("Recreating %d listeners with refreshed token", len(callbacks_copy))
+        for key, (listener_type, child_uid, callback, options) in callbacks_copy.items():
             try:
-                if listener_type == "sleep":
-                    self.setup_realtime_listener(child_uid, callback)
-                elif listener_type == "feed":
-                    self.setup_feed_listener(child_uid, callback)
-                elif listener_type == "health":
-                    self.setup_health_listener(child_uid, callback)
-                elif listener_type == "diaper":
-                    self.setup_diaper_listener(child_uid, callback)
+                if isinstance(callback, IntervalWindow):
+                    self._setup_query_listener(listener_type, child_uid, callback, resume=True, **options)
+                    continue
+                # Resumed listeners skip their first snapshot if nothing changed meanwhile
+                self._setup_listener(listener_type, child_uid, callback, resume=True, **options)
                 _LOGGER.debug("Recreated %s listener for child %s", listener_type, child_uid)
             except Exception as err:
                 _LOGGER.error("Error recreating %s listener for child %s: %s", listener_type, child_uid, err)
 
+    def _post_auth(self, span_name: str, url: str, payload: dict[str, Any]) -> requests.Response:
+        """POST to a Firebase auth endpoint, traced as a child span when tracing is enabled."""
+        if self._rate_limiter is None:
+            return self._post_auth_traced(span_name, url, payload)
+        with self._rate_limiter.limit("auth"):
+            response = self._post_auth_traced(span_name, url, payload)
+        if response.status_code == 429:
+            self._rate_limiter.backoff("auth")
+        return response
+
+    def _post_auth_traced(self, span_name: str, url: str, payload: dict[str, Any]) -> requests.Response:
+        if self._tracer is None:
+            return requests.post(f"{url}?key={FIREBASE_API_KEY}", json=payload, timeout=10)
+
+        attributes = {"http.request.method": "POST", "url.full": url}
+        with self._tracer.start_as_current_span(span_name, attributes=attributes) as span:
+            response = requests.post(f"{url}?key={FIREBASE_API_KEY}", json=payload, timeout=10)
+            span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+    def _token_valid(self) -> bool:
+        """Whether there is a token that does not expire within 5 minutes."""
+        expires_at = self.token_expires_at
+        return bool(self.id_token) and not (expires_at and datetime.now().timestamp() >= expires_at - 300)
+
     def _ensure_authenticated(self) -> None:
-        """Ensure we have a valid authentication token."""
-        if not self.id_token:
-            self.authenticate()
-        elif self.token_expires_at and datetime.now().timestamp() >= self.token_expires_at - 300:
-            # Refresh if token expires in less than 5 minutes
-            self.refresh_auth_token()
+        """Ensure we have a valid authentication token.
+
+        Threads finding the token missing or expiring queue on the auth lock;
+        the first one signs in or refreshes, the others find a valid token.
+        """
+        if self._token_valid():
+            return
+        with self._auth_lock:
+            if self._token_valid():
+                return
+            if not self.id_token:
+                self.authenticate()
+            else:
+                # Refresh if token expires in less than 5 minutes
+                self.refresh_auth_token()
 
     def _get_headers(self) -> dict[str, str]:
         """Get headers for API requests."""
@@ -201,32 +496,32 @@ class HuckleberryAPI:
         }
 
     def _get_firestore_client(self) -> firestore.Client:
-        """Get or create Firestore client."""
+        """Get or create Firestore client from the configured storage backend."""
         self._ensure_authenticated()
 
-        # Create new client if token changed or client doesn't exist
-        if not self._firestore_client:
-            assert self.id_token is not None, "id_token should be set after authentication"
-            credentials = FirebaseTokenCredentials(self.id_token)
-            self._firestore_client = firestore.Client(
-                project="simpleintervals",
-                credentials=credentials,
-            )
-
-        return self._firestore_client
+        client = self._firestore_client
+        if client is not None:
+            return client
+        # Create new client if token changed or client doesn't exist (once, under the auth lock)
+        with self._auth_lock:
+            if self._firestore_client is None:
+                assert self.id_token is not None, "id_token should be set after authentication"
+                client = self._backend.create_client(self.id_token)
+                if self._rpc_hooks:
+                    # The instrumented wrapper is duck-type compatible with firestore.Client
+                    client = InstrumentedClient(client, self._rpc_hooks, self._backend.retry_policy)
+                self._firestore_client = client
+            return self._firestore_client
 
     def _get_timezone_offset_minutes(self) -> float:
         """Get current timezone offset in minutes.
 
-        Calculates offset dynamically to handle DST changes.
+        Computed from DST transitions cached per zone and year, so DST changes are still honored.
         Returns negative for UTC+ timezones (e.g., -120 for UTC+2).
         """
-        now = datetime.now(self._timezone)
-        offset = now.utcoffset()
-        if offset is None:
-            return 0.0
-        return -offset.total_seconds() / 60
+        return offset_minutes(self._timezone)
 
+    @_api_call
     def get_children(self) -> list[ChildData]:
         """Get list of children from user profile."""
         _LOGGER.debug("Fetching children list")
@@ -237,7 +532,7 @@ class HuckleberryAPI:
 
             # Get user document which contains lastChild reference
             user_ref = db.collection("users").document(self.user_uid)
-            user_doc = user_ref.get()
+            user_doc = user_ref.get(field_paths=["childList"])
 
             if not user_doc.exists:
                 _LOGGER.error("User document not found")
@@ -263,7 +558,7 @@ class HuckleberryAPI:
 
                 # Get child document
                 child_ref = db.collection("childs").document(child_id)
-                child_doc = child_ref.get()
+                child_doc = child_ref.get(field_paths=list(CHILD_FIELDS))
 
                 if not child_doc.exists:
                     _LOGGER.error("Child document not found: %s", child_id)
@@ -274,24 +569,7 @@ class HuckleberryAPI:
                     _LOGGER.error("Child document has no data: %s", child_id)
                     return []
 
-                # Name may appear as 'childsName' in some documents
-                display_name = child_data.get("name") or child_data.get("childsName") or "Unknown"
-
-                child: ChildData = {
-                    "uid": child_id,
-                    "name": display_name,
-                    "birthday": child_data.get("birthdate"),
-                    "picture": child_data.get("picture"),
-                    "gender": child_data.get("gender"),
-                    "color": child_data.get("color"),
-                    "created_at": child_data.get("createdAt"),
-                    "night_start_min": child_data.get("nightStart"),
-                    "morning_cutoff_min": child_data.get("morningCutoff"),
-                    "expected_naps": child_data.get("naps"),
-                    "categories": child_data.get("categories"),
-                }
-
-                children.append(child)
+                children.append(_child_data(child_id, child_data))
 
             _LOGGER.info("Found %d children", len(children))
             return children
@@ -300,6 +578,7 @@ class HuckleberryAPI:
             _LOGGER.error("Failed to get children: %s", err)
             raise
 
+    @_api_call
     def start_sleep(self, child_uid: str) -> None:
         """Start sleep tracking for a child."""
         _LOGGER.info("Starting sleep tracking for child %s", child_uid)
@@ -354,6 +633,7 @@ class HuckleberryAPI:
 
         _LOGGER.info("Sleep tracking started successfully")
 
+    @_api_call
     def pause_sleep(self, child_uid: str) -> None:
         """Pause current sleep session without ending it."""
         _LOGGER.info("Pausing sleep for child %s", child_uid)
@@ -362,7 +642,7 @@ class HuckleberryAPI:
         sleep_ref = client.collection("sleep").document(child_uid)
 
         # Check if timer is active
-        sleep_doc = sleep_ref.get(timeout=10.0)
+        sleep_doc = sleep_ref.get(field_paths=["timer"], timeout=10.0)
         if not sleep_doc.exists:
             _LOGGER.warning("No sleep document to pause for %s", child_uid)
             return
@@ -390,6 +670,7 @@ class HuckleberryAPI:
 
         _LOGGER.info("Sleep paused for child %s", child_uid)
 
+    @_api_call
     def resume_sleep(self, child_uid: str) -> None:
         """Resume a paused sleep session."""
         _LOGGER.info("Resuming sleep for child %s", child_uid)
@@ -398,7 +679,7 @@ class HuckleberryAPI:
         sleep_ref = client.collection("sleep").document(child_uid)
 
         # Check if timer is active and paused
-        sleep_doc = sleep_ref.get(timeout=10.0)
+        sleep_doc = sleep_ref.get(field_paths=["timer"], timeout=10.0)
         if not sleep_doc.exists:
             _LOGGER.warning("No sleep document to resume for %s", child_uid)
             return
@@ -422,6 +703,7 @@ class HuckleberryAPI:
 
         _LOGGER.info("Sleep resumed for child %s", child_uid)
 
+    @_api_call
     def cancel_sleep(self, child_uid: str) -> None:
         """Cancel current sleep session without saving an interval."""
         _LOGGER.info("Cancelling current sleep for child %s", child_uid)
@@ -430,7 +712,7 @@ class HuckleberryAPI:
         sleep_ref = client.collection("sleep").document(child_uid)
 
         # Check current state
-        doc = sleep_ref.get(timeout=10.0)
+        doc = sleep_ref.get(field_paths=["timer"], timeout=10.0)
         if doc.exists:
             timer_data = doc.to_dict()
             if timer_data:
@@ -458,6 +740,7 @@ class HuckleberryAPI:
 
         _LOGGER.info("Sleep cancelled for child %s", child_uid)
 
+    @_api_call
     def complete_sleep(self, child_uid: str) -> None:
         """Complete current sleep session and save interval."""
         _LOGGER.info("Completing sleep for child %s", child_uid)
@@ -465,7 +748,7 @@ class HuckleberryAPI:
         client = self._get_firestore_client()
         sleep_ref = client.collection("sleep").document(child_uid)
 
-        sleep_doc = sleep_ref.get(timeout=10.0)
+        sleep_doc = sleep_ref.get(field_paths=["timer"], timeout=10.0)
         if not sleep_doc.exists:
             _LOGGER.warning("No active sleep document to complete for %s", child_uid)
             return
@@ -487,7 +770,7 @@ class HuckleberryAPI:
                 _LOGGER.warning("timerStartTime missing; falling back to timestamp.seconds for %s", child_uid)
             else:
                 _LOGGER.warning("Missing timerStartTime; cannot compute duration for %s", child_uid)
-                sleep_ref.update({"timer": firestore.DELETE_FIELD})
+                sleep_ref.update({"timer": self._backend.delete_field})
                 return
 
         now_ms = time.time() * 1000
@@ -504,7 +787,7 @@ class HuckleberryAPI:
 
         intervals_ref = sleep_ref.collection("intervals")
         interval_id = uuid.uuid4().hex[:16]
-        intervals_ref.document(interval_id).set({
+        interval_data = {
             "_id": interval_id,
             "start": start_sec,
             "duration": duration_sec,
@@ -512,7 +795,9 @@ class HuckleberryAPI:
             "end_offset": self._get_timezone_offset_minutes(),
             "details": timer.get("details", {}),
             "lastUpdated": time.time(),
-        })
+        }
+        intervals_ref.document(interval_id).set(interval_data)
+        self._notify_interval("sleep", child_uid, interval_data)
 
         # Set timer to inactive (match stop_sleep behavior)
         current_time = time.time()
@@ -540,6 +825,7 @@ class HuckleberryAPI:
 
         _LOGGER.info("Sleep completed for child %s (duration %ss)", child_uid, duration_sec)
 
+    @_api_call
     def start_feeding(self, child_uid: str, side: FeedSide = "left") -> None:
         """Start feeding tracking."""
         _LOGGER.info("Starting feeding for child %s on %s side", child_uid, side)
@@ -570,6 +856,7 @@ class HuckleberryAPI:
 
         _LOGGER.info("Feeding started on %s side", side)
 
+    @_api_call
     def pause_feeding(self, child_uid: str) -> None:
         """Pause current feeding session."""
         _LOGGER.info("Pausing feeding for child %s", child_uid)
@@ -577,7 +864,7 @@ class HuckleberryAPI:
         client = self._get_firestore_client()
         feed_ref = client.collection("feed").document(child_uid)
 
-        doc = feed_ref.get(timeout=10.0)
+        doc = feed_ref.get(field_paths=["timer"], timeout=10.0)
         if not doc.exists:
             _LOGGER.warning("Feed document not found")
             return
@@ -622,11 +909,11 @@ class HuckleberryAPI:
         })
 
         # Remove activeSide when paused
-        from google.cloud.firestore import DELETE_FIELD
-        feed_ref.update({"timer.activeSide": DELETE_FIELD})
+        feed_ref.update({"timer.activeSide": self._backend.delete_field})
 
         _LOGGER.info("Feeding paused (L:%ss R:%ss)", left_duration, right_duration)
 
+    @_api_call
     def resume_feeding(self, child_uid: str, side: FeedSide | None = None) -> None:
         """Resume paused feeding session."""
         _LOGGER.info("Resuming feeding for child %s", child_uid)
@@ -634,7 +921,7 @@ class HuckleberryAPI:
         client = self._get_firestore_client()
         feed_ref = client.collection("feed").document(child_uid)
 
-        doc = feed_ref.get(timeout=10.0)
+        doc = feed_ref.get(field_paths=["timer"], timeout=10.0)
         if not doc.exists:
             _LOGGER.warning("Feed document not found")
             return
@@ -670,6 +957,7 @@ class HuckleberryAPI:
 
         _LOGGER.info("Feeding resumed on %s", side)
 
+    @_api_call
     def switch_feeding_side(self, child_uid: str) -> None:
         """Switch feeding side (left <-> right)."""
         _LOGGER.info("Switching feeding side for child %s", child_uid)
@@ -677,7 +965,7 @@ class HuckleberryAPI:
         client = self._get_firestore_client()
         feed_ref = client.collection("feed").document(child_uid)
 
-        doc = feed_ref.get(timeout=10.0)
+        doc = feed_ref.get(field_paths=["timer"], timeout=10.0)
         if not doc.exists:
             _LOGGER.warning("Feed document not found")
             return
@@ -726,6 +1014,7 @@ class HuckleberryAPI:
 
         _LOGGER.info("Switched from %s to %s (L:%ss R:%ss)", current_side, new_side, left_duration, right_duration)
 
+    @_api_call
     def cancel_feeding(self, child_uid: str) -> None:
         """Cancel current feeding without saving."""
         _LOGGER.info("Cancelling feeding for child %s", child_uid)
@@ -733,7 +1022,7 @@ class HuckleberryAPI:
         client = self._get_firestore_client()
         feed_ref = client.collection("feed").document(child_uid)
 
-        doc = feed_ref.get(timeout=10.0)
+        doc = feed_ref.get(field_paths=["timer"], timeout=10.0)
         if doc.exists:
             timer_data = doc.to_dict()
             if timer_data:
@@ -761,6 +1050,7 @@ class HuckleberryAPI:
 
         _LOGGER.info("Feeding cancelled")
 
+    @_api_call
     def complete_feeding(self, child_uid: str) -> None:
         """Complete current feeding and save to history."""
         _LOGGER.info("Completing feeding for child %s", child_uid)
@@ -768,7 +1058,7 @@ class HuckleberryAPI:
         client = self._get_firestore_client()
         feed_ref = client.collection("feed").document(child_uid)
 
-        doc = feed_ref.get(timeout=10.0)
+        doc = feed_ref.get(field_paths=["timer"], timeout=10.0)
         if not doc.exists:
             _LOGGER.warning("No active feed document to complete")
             return
@@ -814,7 +1104,7 @@ class HuckleberryAPI:
         if last_side_value == "none":
             last_side_value = "right" if right_duration >= left_duration else "left"
 
-        from google.cloud.firestore import DELETE_FIELD
+        DELETE_FIELD = self._backend.delete_field
 
         # Create interval document ID (format: timestamp-random)
         interval_id = f"{int(now_time * 1000)}-{uuid.uuid4().hex[:20]}"
@@ -823,7 +1113,7 @@ class HuckleberryAPI:
         feed_intervals_ref = feed_ref.collection("intervals").document(interval_id)
 
         try:
-            feed_intervals_ref.set({
+            interval_data = {
                 "mode": "breast",
                 "start": feed_start_time,
                 "lastSide": last_side_value,
@@ -832,7 +1122,9 @@ class HuckleberryAPI:
                 "rightDuration": right_duration,
                 "offset": self._get_timezone_offset_minutes(),
                 "end_offset": self._get_timezone_offset_minutes(),
-            })
+            }
+            feed_intervals_ref.set(interval_data)
+            self._notify_interval("feed", child_uid, interval_data)
             _LOGGER.info("Created feeding interval entry: %s", interval_id)
         except Exception as err:
             _LOGGER.error("Failed to create feeding interval entry: %s", err)
@@ -870,81 +1162,342 @@ class HuckleberryAPI:
         _LOGGER.info("Feeding completed (total duration %ss, L:%ss R:%ss)", total_duration, left_duration,
                      right_duration)
 
+    def add_interval_observer(self, observer: IntervalObserver) -> None:
+        """Register a callable notified of completed interval entries.
+
+        The observer receives (collection, child_uid, entry) for entries written
+        by this client (complete_sleep, complete_feeding, log_diaper, log_growth)
+        and for the latest entry in prefs seen by real-time listeners. The same
+        entry can be reported more than once; observers should dedupe by 'start'.
+        """
+        self._interval_observers.append(observer)
+
+    def remove_interval_observer(self, observer: IntervalObserver) -> None:
+        """Unregister an interval observer."""
+        if observer in self._interval_observers:
+            self._interval_observers.remove(observer)
+
+    def _notify_interval(self, collection: str, child_uid: str, entry: dict[str, Any]) -> None:
+        """Pass a completed entry to the interval observers."""
+        for observer in list(self._interval_observers):
+            try:
+                observer(collection, child_uid, entry)
+            except Exception as err:
+                _LOGGER.error("Interval observer failed: %s", err)
+
     def _setup_listener(
-        self, collection_name: CollectionName, child_uid: str, callback: Callable[[TDocumentData], None]
+        self,
+        collection_name: CollectionName,
+        child_uid: str,
+        callback: Callable[[TDocumentData], None] | Callable[[DocumentDelta], None],
+        deltas: bool = False,
+        resume: bool = False,
+        key: str | None = None,
     ) -> None:
         """Set up real-time listener for a Firestore document.
 
         Generic listener setup method that works for any collection type.
+        Snapshots identical to the last delivered state are not delivered.
 
         Args:
             collection_name: Name of the Firestore collection (e.g., 'sleep', 'feed', 'health', 'diaper')
             child_uid: Child unique identifier
             callback: Function to call when document changes, receives document data of the appropriate type
+                (or a DocumentDelta with ``deltas=True``)
+            deltas: Deliver only the changed fields with their old and new values
+            resume: Recreating the listener (e.g. after token refresh); keep the last delivered state
+            key: Listener key (default "<collection>_<child_uid>"); distinct keys allow
+                several listeners on one document
         """
         _LOGGER.info("Setting up real-time listener for %s/%s", collection_name, child_uid)
 
         client = self._get_firestore_client()
         doc_ref = client.collection(collection_name).document(child_uid)
+        listener_key = key or f"{collection_name}_{child_uid}"
+        if not resume:
+            with self._listener_lock:
+                self._listener_state.pop(listener_key, None)
+
+        def deliver(data: dict[str, Any]) -> None:
+            """Pass a snapshot on unless it equals the last delivered state."""
+            with self._listener_lock:
+                if listener_key not in self._listener_callbacks:
+                    return  # listener stopped while the snapshot was queued or delivered
+                previous = self._listener_state.get(listener_key)
+                if previous == data:
+                    _LOGGER.debug("Unchanged %s snapshot for child %s suppressed", collection_name, child_uid)
+                    return
+                # Kept as a private copy: callbacks may modify what they receive
+                self._listener_state[listener_key] = copy.deepcopy(data)
+            if self._interval_observers:
+                latest = (data.get("prefs") or {}).get(LATEST_ENTRY_FIELDS[collection_name])
+                if isinstance(latest, dict):
+                    self._notify_interval(collection_name, child_uid, latest)
+            if deltas:
+                callback(DocumentDelta(data, tuple(diff_documents(previous, data)), previous is None))
+            else:
+                callback(data)
 
         # Create snapshot listener
         def on_snapshot(doc_snapshot, changes, read_time):
             """Handle snapshot updates."""
+            self._record_listener_reads(collection_name, child_uid, len(doc_snapshot))
+            if self._read_cache is not None:
+                self._read_cache.invalidate(collection_name, child_uid)
             for doc in doc_snapshot:
                 if doc.exists:
                     _LOGGER.debug("Real-time %s update received for child %s", collection_name, child_uid)
-                    callback(doc.to_dict())
+                    data = doc.to_dict() or {}
+                    if self._dispatcher is None:
+                        deliver(data)
+                    else:
+                        self._dispatcher.dispatch((id(self), listener_key), functools.partial(deliver, data))
 
+        if resume and not self._listener_registered(listener_key):
+            return
         # Start listening and store the unsubscribe function
-        unsubscribe = doc_ref.on_snapshot(on_snapshot)
-        listener_key = f"{collection_name}_{child_uid}"
-        self._listeners[listener_key] = unsubscribe
-        # Store callback for recreation after token refresh
-        self._listener_callbacks[listener_key] = (collection_name, child_uid, callback)
+        if self._limits is not None:
+            self._limits.acquire_listener(self, listener_key)
+        if not resume:
+            # Store callback and options for recreation after token refresh (before the first snapshot arrives)
+            options: dict[str, Any] = {"deltas": deltas}
+            if key is not None:
+                options["key"] = key
+            with self._listener_lock:
+                self._listener_callbacks[listener_key] = (collection_name, child_uid, callback, options)
+        try:
+            unsubscribe = doc_ref.on_snapshot(on_snapshot)
+        except Exception:
+            if not resume:  # resumed listeners are retried on the next refresh
+                with self._listener_lock:
+                    self._listener_callbacks.pop(listener_key, None)
+            if self._limits is not None:
+                self._limits.release_listener(self, listener_key)
+            raise
+        self._register_listener(listener_key, unsubscribe)
 
         _LOGGER.info("Real-time %s listener active for child %s", collection_name, child_uid)
 
+    def _record_listener_reads(self, collection_name: str, child_uid: str, documents: int) -> None:
+        """Count the documents of a listener snapshot as reads (at least one per snapshot)."""
+        if self._cost_meter is not None:
+            self._cost_meter.record(self.user_uid or "", child_uid, CostCounts(reads=max(documents, 1)),
+                                    method=f"listener:{collection_name}")
+
+    @_api_call
     def setup_realtime_listener(
-        self, child_uid: str, callback: Callable[[SleepDocumentData], None]
+        self, child_uid: str, callback: Callable[[SleepDocumentData], None] | Callable[[DocumentDelta], None],
+        deltas: bool = False,
     ) -> None:
-        """Set up real-time listener for sleep document changes."""
-        self._setup_listener("sleep", child_uid, callback)
+        """Set up real-time listener for sleep document changes (only the changes with ``deltas=True``)."""
+        self._setup_listener("sleep", child_uid, callback, deltas)
 
+    @_api_call
     def setup_feed_listener(
-        self, child_uid: str, callback: Callable[[FeedDocumentData], None]
+        self, child_uid: str, callback: Callable[[FeedDocumentData], None] | Callable[[DocumentDelta], None],
+        deltas: bool = False,
     ) -> None:
-        """Set up real-time listener for feed document changes."""
-        self._setup_listener("feed", child_uid, callback)
+        """Set up real-time listener for feed document changes (only the changes with ``deltas=True``)."""
+        self._setup_listener("feed", child_uid, callback, deltas)
 
+    @_api_call
     def setup_health_listener(
-        self, child_uid: str, callback: Callable[[HealthDocumentData], None]
+        self, child_uid: str, callback: Callable[[HealthDocumentData], None] | Callable[[DocumentDelta], None],
+        deltas: bool = False,
     ) -> None:
-        """Set up real-time listener for health document changes."""
-        self._setup_listener("health", child_uid, callback)
+        """Set up real-time listener for health document changes (only the changes with ``deltas=True``)."""
+        self._setup_listener("health", child_uid, callback, deltas)
 
+    @_api_call
     def setup_diaper_listener(
-        self, child_uid: str, callback: Callable[[DiaperDocumentData], None]
+        self, child_uid: str, callback: Callable[[DiaperDocumentData], None] | Callable[[DocumentDelta], None],
+        deltas: bool = False,
+    ) -> None:
+        """Set up real-time listener for diaper document changes (only the changes with ``deltas=True``)."""
+        self._setup_listener("diaper", child_uid, callback, deltas)
+
+    @_api_call
+    def setup_interval_listener(
+        self,
+        child_uid: str,
+        collection: CollectionName,
+        window: float = 7 * 86400,
+        callback: Callable[[IntervalWindow], None] | None = None,
+    ) -> IntervalWindow:
+        """
+        Keep a tracker's history entries of the last ``window`` seconds current with query listeners.
+
+        One listener watches the regular interval documents from the window
+        start on, another the multi-entry batch documents. Every snapshot is
+        applied to the returned IntervalWindow, re-decoding only documents that
+        changed, so edits made elsewhere show up without re-querying.
+
+        Args:
+            child_uid: Child unique identifier
+            collection: Tracker ("sleep", "feed", "diaper" or "health")
+            window: Seconds of history to keep, ending now
+            callback: Called with the window after every applied snapshot
+
+        Returns:
+            IntervalWindow holding the decoded entries
+        """
+        interval_window = IntervalWindow(collection, child_uid, window, callback)
+        self._setup_query_listener(collection, child_uid, interval_window, source="intervals")
+        try:
+            self._setup_query_listener(collection, child_uid, interval_window, source="batches")
+        except Exception:
+            self._stop_listener(f"intervals:{collection}_{child_uid}")
+            raise
+        return interval_window
+
+    def stop_interval_listener(self, child_uid: str, collection: CollectionName) -> None:
+        """Stop the query listeners set up by setup_interval_listener."""
+        for source in ("intervals", "batches"):
+            self._stop_listener(f"{source}:{collection}_{child_uid}")
+
+    def _setup_query_listener(
+        self,
+        collection_name: CollectionName,
+        child_uid: str,
+        interval_window: IntervalWindow,
+        resume: bool = False,
+        source: WindowSource = "intervals",
     ) -> None:
-        """Set up real-time listener for diaper document changes."""
-        self._setup_listener("diaper", child_uid, callback)
+        """Set up a query listener on a history subcollection feeding an IntervalWindow."""
+        client = self._get_firestore_client()
+        intervals_ref = client.collection(collection_name).document(child_uid).collection(
+            INTERVAL_SUBCOLLECTIONS[collection_name])
+        if source == "batches":
+            query = intervals_ref.where(filter=self._backend.field_filter("multi", "==", True))
+        else:
+            query = intervals_ref.where(
+                filter=self._backend.field_filter("start", ">=", int(interval_window.start_timestamp)))
+        listener_key = f"{source}:{collection_name}_{child_uid}"
+        first = [True]
+
+        def on_snapshot(doc_snapshots, changes, read_time):
+            """Apply the changed documents to the window."""
+            initial, first[0] = first[0], False
+            self._record_listener_reads(collection_name, child_uid, len(doc_snapshots) if initial else len(changes))
+            if self._read_cache is not None:
+                self._read_cache.invalidate(collection_name, child_uid)
+            _LOGGER.debug("%s %s query update for child %s: %d changes", collection_name, source, child_uid,
+                          len(changes))
+            deliver = functools.partial(interval_window.apply, source, list(doc_snapshots))
+            if self._dispatcher is None:
+                deliver()
+            else:
+                self._dispatcher.dispatch((id(self), listener_key), deliver)
+
+        if resume and not self._listener_registered(listener_key):
+            return
+        if self._limits is not None:
+            self._limits.acquire_listener(self, listener_key)
+        if not resume:
+            with self._listener_lock:
+                self._listener_callbacks[listener_key] = (collection_name, child_uid, interval_window,
+                                                          {"source": source})
+        try:
+            unsubscribe = query.on_snapshot(on_snapshot)
+        except Exception:
+            if not resume:
+                with self._listener_lock:
+                    self._listener_callbacks.pop(listener_key, None)
+            if self._limits is not None:
+                self._limits.release_listener(self, listener_key)
+            raise
+        self._register_listener(listener_key, unsubscribe)
+        _LOGGER.info("Real-time %s %s query listener active for child %s", collection_name, source, child_uid)
+
+    def watch(
+        self,
+        child_uids: str | Sequence[str],
+        collections: CollectionName | Sequence[CollectionName] = "sleep",
+        deltas: bool = False,
+        max_pending: int = 100,
+    ) -> WatchStream:
+        """Stream document updates as an async iterator.
+
+        Merges the given trackers of the given children into one stream, in
+        arrival order. Use it as ``async with api.watch(...) as updates:`` so the
+        listeners are removed when the block is left.
+
+        Args:
+            child_uids: Child unique identifier, or several
+            collections: Tracker ("sleep", "feed", "health" or "diaper"), or several
+            deltas: Stream DocumentDelta objects instead of whole documents
+            max_pending: Updates buffered before delivering threads wait for the consumer
+
+        Returns:
+            WatchStream yielding WatchUpdate objects
+        """
+        from .watch import WatchStream
+
+        children = [child_uids] if isinstance(child_uids, str) else list(child_uids)
+        trackers = [collections] if isinstance(collections, str) else list(collections)
+        return WatchStream(self, children, trackers, deltas=deltas, max_pending=max_pending)
+
+    def _register_listener(self, listener_key: str, watch: Any) -> None:
+        """Store a started listener, stopping one it replaces or one stopped while it was starting."""
+        with self._listener_lock:
+            previous = self._listeners.pop(listener_key, None)
+            active = listener_key in self._listener_callbacks
+            if active:
+                self._listeners[listener_key] = watch
+        if previous is not None and previous is not watch:
+            self._unsubscribe(listener_key, previous)
+        if not active:
+            self._unsubscribe(listener_key, watch)
+            if self._limits is not None:
+                self._limits.release_listener(self, listener_key)
+
+    def _listener_registered(self, listener_key: str) -> bool:
+        """Whether a listener is still wanted; a refresh must not recreate one stopped meanwhile."""
+        with self._listener_lock:
+            if listener_key in self._listener_callbacks:
+                return True
+        _LOGGER.debug("Listener %s was stopped; not recreating it", listener_key)
+        return False
+
+    def _unsubscribe(self, listener_key: str, watch: Any) -> None:
+        """Stop a listener's watch (unsubscribe or close, whichever it has)."""
+        try:
+            if hasattr(watch, "unsubscribe") and callable(getattr(watch, "unsubscribe")):
+                watch.unsubscribe()
+            elif hasattr(watch, "close") and callable(getattr(watch, "close")):
+                watch.close()
+            else:
+                _LOGGER.debug("Listener %s object has no unsubscribe/close", listener_key)
+        except Exception as err:
+            _LOGGER.error("Error stopping listener %s: %s", listener_key, err)
+
+    def _stop_listener(self, listener_key: str) -> None:
+        """Stop one listener and forget it."""
+        with self._listener_lock:
+            watch = self._listeners.pop(listener_key, None)
+            self._listener_callbacks.pop(listener_key, None)
+            self._listener_state.pop(listener_key, None)
+        if self._limits is not None:
+            self._limits.release_listener(self, listener_key)
+        if watch is None:
+            return
+        self._unsubscribe(listener_key, watch)
 
     def stop_all_listeners(self) -> None:
         """Stop all active real-time listeners."""
         _LOGGER.info("Stopping all real-time listeners")
-        for key, watch in self._listeners.items():
-            try:
-                if hasattr(watch, "unsubscribe") and callable(getattr(watch, "unsubscribe")):
-                    watch.unsubscribe()
-                elif hasattr(watch, "close") and callable(getattr(watch, "close")):
-                    watch.close()
-                else:
-                    _LOGGER.debug("Listener %s object has no unsubscribe/close", key)
-                _LOGGER.debug("Stopped listener: %s", key)
-            except Exception as err:
-                _LOGGER.error("Error stopping listener %s: %s", key, err)
-        self._listeners.clear()
-        self._listener_callbacks.clear()
-
+        with self._listener_lock:
+            listeners = dict(self._listeners)
+            self._listeners.clear()
+            self._listener_callbacks.clear()
+            self._listener_state.clear()
+        for key, watch in listeners.items():
+            self._unsubscribe(key, watch)
+            _LOGGER.debug("Stopped listener: %s", key)
+        if self._limits is not None:
+            self._limits.release_listeners(self)
+
+    @_api_call
     def log_diaper(self, child_uid: str, mode: DiaperMode,
                    pee_amount: DiaperAmount | None = None, poo_amount: DiaperAmount | None = None,
                    color: PooColor | None = None, consistency: PooConsistency | None = None,
@@ -1007,6 +1560,7 @@ class HuckleberryAPI:
         try:
             diaper_ref.collection("intervals").document(interval_id).set(cast(dict, interval_data))
             _LOGGER.info("Created diaper interval: %s", interval_id)
+            self._notify_interval("diaper", child_uid, cast(dict, interval_data))
         except Exception as err:
             _LOGGER.error("Failed to create diaper interval: %s", err)
             raise
@@ -1030,6 +1584,7 @@ class HuckleberryAPI:
 
         _LOGGER.info("Diaper change logged successfully")
 
+    @_api_call
     def log_growth(self, child_uid: str, weight: float | None = None, height: float | None = None,
                    head: float | None = None, units: MeasurementUnits = "metric") -> None:
         """
@@ -1097,6 +1652,7 @@ class HuckleberryAPI:
         try:
             health_data_ref.set(cast(dict, growth_entry))
             _LOGGER.info("Created growth data entry in subcollection: %s", interval_id)
+            self._notify_interval("health", child_uid, cast(dict, growth_entry))
         except Exception as err:
             _LOGGER.error("Failed to create growth data entry: %s", err)
             # Continue to update prefs even if subcollection write fails
@@ -1113,6 +1669,7 @@ class HuckleberryAPI:
             _LOGGER.error("Failed to log growth data: %s", err)
             raise
 
+    @_api_call
     def get_growth_data(self, child_uid: str) -> GrowthData:
         """
         Get the latest growth measurements for a child.
@@ -1127,49 +1684,148 @@ class HuckleberryAPI:
         health_ref = client.collection("health").document(child_uid)
 
         try:
-            doc = health_ref.get()
-            if not doc.exists:
-                return {
-                    "weight_units": "kg",
-                    "height_units": "cm",
-                    "head_units": "hcm",
-                }
+            doc = health_ref.get(field_paths=["prefs.lastGrowthEntry"])
+            health_data = doc.to_dict() if doc.exists else None
+            return _growth_data((health_data or {}).get("prefs", {}).get("lastGrowthEntry"))
+        except Exception as err:
+            _LOGGER.error("Failed to get growth data: %s", err)
+            raise ReadFailed(_growth_data(None)) from err
 
-            health_data = doc.to_dict()
-            if not health_data:
-                return {
-                    "weight_units": "kg",
-                    "height_units": "cm",
-                    "head_units": "hcm",
-                }
+    @_api_call
+    def get_growth_history(
+        self,
+        child_uid: str,
+        start_timestamp: int = 0,
+        end_timestamp: int | None = None,
+    ) -> GrowthHistory:
+        """
+        Load a child's growth measurements as arrays in kg and cm, with ages from the birthday.
 
-            last_growth = health_data.get("prefs", {}).get("lastGrowthEntry", {})
+        The returned GrowthHistory computes velocities, values interpolated at
+        any age, and z-scores and percentiles against the bundled WHO reference
+        tables (see growth_reference). Requires numpy (the "analytics" extra).
 
-            if not last_growth:
-                return {
-                    "weight_units": "kg",
-                    "height_units": "cm",
-                    "head_units": "hcm",
-                }
+        Args:
+            child_uid: Child unique identifier
+            start_timestamp: Start of range (Unix timestamp in seconds, default: all history)
+            end_timestamp: End of range (Unix timestamp in seconds, default: now)
 
-            result: GrowthData = {
-                "weight": last_growth.get("weight"),
-                "height": last_growth.get("height"),
-                "head": last_growth.get("head"),
-                "weight_units": last_growth.get("weightUnits", "kg"),
-                "height_units": last_growth.get("heightUnits", "cm"),
-                "head_units": last_growth.get("headUnits", "hcm"),
-                "timestamp_sec": last_growth.get("start"),
-            }
-            return result
+        Returns:
+            GrowthHistory with one element per growth entry, sorted by start
+        """
+        from .growth import UNIT_FIELDS, growth_history
+        from .summary import require_numpy
+
+        require_numpy()
+        client = self._get_firestore_client()
+        child = client.collection("childs").document(child_uid).get(
+            field_paths=["birthdate", "gender"], timeout=10.0).to_dict() or {}
+        if end_timestamp is None:
+            end_timestamp = int(time.time()) + 1
+        entries = self.get_health_entries(child_uid, start_timestamp, end_timestamp, extra_fields=UNIT_FIELDS)
+        return growth_history(entries, birthday=child.get("birthdate"), sex=child.get("gender"),
+                              timezone=self._timezone)
+
+    def _child_uids(self) -> list[str]:
+        """Child UIDs from the user document's childList (one read)."""
+        client = self._get_firestore_client()
+        user_doc = client.collection("users").document(self.user_uid).get(field_paths=["childList"])
+        child_list = (user_doc.to_dict() or {}).get("childList") if user_doc.exists else None
+        return [child["cid"] for child in child_list or [] if child.get("cid")]
+
+    @_api_call
+    def startup(
+        self,
+        callback: StartupCallback | None = None,
+        collections: Sequence[CollectionName] = ("sleep", "feed", "diaper", "health"),
+        deltas: bool = False,
+        max_workers: int = 8,
+    ) -> StartupReport:
+        """
+        Sign in, read the state of all children and start listening, with the steps pipelined.
+
+        The backend warms up while signing in, the children and all their
+        tracker documents are read with two requests (user document, then one
+        batched get_dashboard), and the listeners are registered concurrently.
+
+        Args:
+            callback: Receives (collection, child_uid, data) for every listener update;
+                no listeners are set up without it
+            collections: Trackers to listen to for every child
+            deltas: Deliver DocumentDelta objects instead of whole documents
+            max_workers: Threads used to warm up and to register listeners
+
+        Returns:
+            StartupReport with the children, their dashboards and per-phase timings
+        """
+        from .startup import run_startup
+
+        return run_startup(self, collections, callback, deltas=deltas, max_workers=max_workers)
+
+    @_api_call
+    def get_dashboard(
+        self,
+        child_uids: str | Sequence[str] | None = None,
+        include_profile: bool = True,
+    ) -> dict[str, ChildDashboard]:
+        """
+        Get the current state of one or more children with one batched read.
+
+        Reads the sleep, feed, diaper and health documents (and the child
+        profiles) of all children in a single multi-document get, projected to
+        the timer and prefs.last* fields, instead of one read per document.
+
+        Args:
+            child_uids: Child unique identifier, or several (default: all children of the
+                user, which costs one extra read of the user document)
+            include_profile: Also read the child documents into 'child'
+
+        Returns:
+            ChildDashboard per child UID, in the order given
+        """
+        client = self._get_firestore_client()
+        if child_uids is None:
+            children = self._child_uids()
+        else:
+            children = [child_uids] if isinstance(child_uids, str) else list(child_uids)
+        if not children:
+            return {}
+
+        collections = DASHBOARD_COLLECTIONS + (("childs",) if include_profile else ())
+        field_paths = DASHBOARD_FIELDS + (CHILD_FIELDS if include_profile else ())
+        references = [client.collection(collection).document(uid) for uid in children for collection in collections]
+        documents: dict[str, dict[str, Any]] = {}
+        try:
+            for snapshot in client.get_all(references, field_paths=list(field_paths)):
+                if snapshot.exists:
+                    documents[snapshot.reference.path] = snapshot.to_dict() or {}
         except Exception as err:
-            _LOGGER.error("Failed to get growth data: %s", err)
-            return {
-                "weight_units": "kg",
-                "height_units": "cm",
-                "head_units": "hcm",
+            _LOGGER.error("Failed to get dashboard: %s", err)
+            raise
+
+        dashboards: dict[str, ChildDashboard] = {}
+        for uid in children:
+            sleep = documents.get(f"sleep/{uid}", {})
+            feed = documents.get(f"feed/{uid}", {})
+            diaper_prefs = documents.get(f"diaper/{uid}", {}).get("prefs") or {}
+            health_prefs = documents.get(f"health/{uid}", {}).get("prefs") or {}
+            dashboard: ChildDashboard = {
+                "child_uid": uid,
+                "sleep_timer": cast("SleepTimerData | None", _timer_data(sleep.get("timer"), SLEEP_TIMER_KEYS)),
+                "feed_timer": cast("FeedTimerData | None", _timer_data(feed.get("timer"), FEED_TIMER_KEYS)),
+                "last_sleep": (sleep.get("prefs") or {}).get("lastSleep"),
+                "last_nursing": (feed.get("prefs") or {}).get("lastNursing"),
+                "last_side": (feed.get("prefs") or {}).get("lastSide"),
+                "last_diaper": diaper_prefs.get("lastDiaper"),
+                "growth": _growth_data(health_prefs.get("lastGrowthEntry")),
             }
+            if include_profile:
+                profile = documents.get(f"childs/{uid}")
+                dashboard["child"] = _child_data(uid, profile) if profile else None
+            dashboards[uid] = dashboard
+        return dashboards
 
+    @_api_call
     def get_calendar_events(
         self,
         child_uid: str,
@@ -1194,11 +1850,52 @@ class HuckleberryAPI:
             "health": self.get_health_entries(child_uid, start_timestamp, end_timestamp),
         }
 
+    @_api_call
+    def get_daily_summary(
+        self,
+        child_uid: str,
+        start_timestamp: int,
+        end_timestamp: int,
+    ) -> DailySummary:
+        """
+        Summarize sleep, feeds and diapers per local day for a date range.
+
+        Uses the child's night start and morning cutoff to split sleep into day
+        and night parts. Requires numpy (the "analytics" extra).
+
+        Args:
+            child_uid: Child unique identifier
+            start_timestamp: Start of range (Unix timestamp in seconds)
+            end_timestamp: End of range (Unix timestamp in seconds)
+
+        Returns:
+            DailySummary table with one row per local day
+        """
+        from .summary import require_numpy, summarize_days
+
+        require_numpy()
+        client = self._get_firestore_client()
+        child = client.collection("childs").document(child_uid).get(
+            field_paths=["nightStart", "morningCutoff"], timeout=10.0).to_dict() or {}
+        events = {
+            "sleep": self.get_sleep_intervals(child_uid, start_timestamp, end_timestamp),
+            "feed": self.get_feed_intervals(child_uid, start_timestamp, end_timestamp),
+            "diaper": self.get_diaper_intervals(child_uid, start_timestamp, end_timestamp),
+        }
+        return summarize_days(
+            events,
+            night_start_min=child.get("nightStart") or 1140,
+            morning_cutoff_min=child.get("morningCutoff") or 420,
+            timezone=self._timezone,
+        )
+
+    @_api_call
     def get_sleep_intervals(
         self,
         child_uid: str,
         start_timestamp: int,
         end_timestamp: int,
+        extra_fields: Sequence[str] = (),
     ) -> list[dict]:
         """
         Fetch sleep intervals from Firestore for a date range.
@@ -1207,9 +1904,11 @@ class HuckleberryAPI:
             child_uid: Child unique identifier
             start_timestamp: Start of range (Unix timestamp in seconds)
             end_timestamp: End of range (Unix timestamp in seconds)
+            extra_fields: Additional field paths to download and include in each entry
+                (e.g. "details" or "notes"); only the decoded fields are read otherwise
 
         Returns:
-            List of sleep interval dicts with 'start' and 'duration' fields
+            List of sleep interval dicts with 'start', 'duration' and 'offset' fields
         """
         events = []
         client = self._get_firestore_client()
@@ -1218,56 +1917,50 @@ class HuckleberryAPI:
 
         try:
             # Query 1: Get regular documents with date filtering
-            regular_docs = intervals_ref.where(
-                filter=firestore.FieldFilter("start", ">=", start_timestamp)
-            ).where(
-                filter=firestore.FieldFilter("start", "<", end_timestamp)
-            ).order_by("start").stream()
+            regular_docs = self._range_docs(intervals_ref, INTERVAL_FIELDS["sleep"] + tuple(extra_fields),
+                                            start_timestamp, end_timestamp)
 
             for doc in regular_docs:
                 data = doc.to_dict()
                 if not data or data.get("multi"):
                     continue  # Skip multi-entry docs from this query
 
-                events.append({
+                event = {
                     "start": data["start"],
                     "duration": data.get("duration", 0),
-                })
+                    "offset": data.get("offset"),
+                }
+                _copy_extra_fields(event, data, extra_fields)
+                events.append(event)
 
             # Query 2: Get multi-entry documents (can't filter by nested start field)
-            multi_docs = intervals_ref.where(
-                filter=firestore.FieldFilter("multi", "==", True)
+            multi_docs = intervals_ref.select(MULTI_BATCH_FIELDS).where(
+                filter=self._backend.field_filter("multi", "==", True)
             ).stream()
 
-            for doc in multi_docs:
-                data = doc.to_dict()
-                if not data or not isinstance(data.get("data"), dict):
-                    continue
-
-                # Iterate through batched entries and filter by date
-                for entry_id, entry in data["data"].items():
-                    if not isinstance(entry, dict) or "start" not in entry:
-                        continue
-
-                    entry_start = entry["start"]
-                    if not (start_timestamp <= entry_start < end_timestamp):
-                        continue
-
-                    events.append({
-                        "start": entry_start,
-                        "duration": entry.get("duration", 0),
-                    })
+            # Cached batch summaries: batches outside the range are skipped without walking them
+            for entry in self.batch_index.entries(multi_docs, start_timestamp, end_timestamp):
+                entry_start = entry["start"]
+                event = {
+                    "start": entry_start,
+                    "duration": entry.get("duration", 0),
+                    "offset": entry.get("offset"),
+                }
+                _copy_extra_fields(event, entry, extra_fields)
+                events.append(event)
 
         except Exception as err:
             _LOGGER.error("Error fetching sleep intervals: %s", err)
 
         return events
 
+    @_api_call
     def get_feed_intervals(
         self,
         child_uid: str,
         start_timestamp: int,
         end_timestamp: int,
+        extra_fields: Sequence[str] = (),
     ) -> list[dict]:
         """
         Fetch feeding intervals from Firestore for a date range.
@@ -1276,9 +1969,11 @@ class HuckleberryAPI:
             child_uid: Child unique identifier
             start_timestamp: Start of range (Unix timestamp in seconds)
             end_timestamp: End of range (Unix timestamp in seconds)
+            extra_fields: Additional field paths to download and include in each entry
+                (e.g. "details" or "notes"); only the decoded fields are read otherwise
 
         Returns:
-            List of feed interval dicts with 'start', 'leftDuration', 'rightDuration' fields
+            List of feed interval dicts with 'start', 'leftDuration', 'rightDuration', 'offset' fields
         """
         events = []
         client = self._get_firestore_client()
@@ -1287,62 +1982,56 @@ class HuckleberryAPI:
 
         try:
             # Query 1: Get regular documents with date filtering
-            regular_docs = intervals_ref.where(
-                filter=firestore.FieldFilter("start", ">=", start_timestamp)
-            ).where(
-                filter=firestore.FieldFilter("start", "<", end_timestamp)
-            ).order_by("start").stream()
+            regular_docs = self._range_docs(intervals_ref, INTERVAL_FIELDS["feed"] + tuple(extra_fields),
+                                            start_timestamp, end_timestamp)
 
             for doc in regular_docs:
                 data = doc.to_dict()
                 if not data or data.get("multi"):
                     continue  # Skip multi-entry docs from this query
 
-                # Regular doc: durations are in minutes
-                events.append({
+                # Regular doc: durations are in seconds
+                event = {
                     "start": data["start"],
                     "leftDuration": data.get("leftDuration", 0),
                     "rightDuration": data.get("rightDuration", 0),
+                    "offset": data.get("offset"),
                     "is_multi_entry": False,
-                })
+                }
+                _copy_extra_fields(event, data, extra_fields)
+                events.append(event)
 
             # Query 2: Get multi-entry documents (can't filter by nested start field)
-            multi_docs = intervals_ref.where(
-                filter=firestore.FieldFilter("multi", "==", True)
+            multi_docs = intervals_ref.select(MULTI_BATCH_FIELDS).where(
+                filter=self._backend.field_filter("multi", "==", True)
             ).stream()
 
-            for doc in multi_docs:
-                data = doc.to_dict()
-                if not data or not isinstance(data.get("data"), dict):
-                    continue
-
-                # Iterate through batched entries and filter by date
-                for entry_id, entry in data["data"].items():
-                    if not isinstance(entry, dict) or "start" not in entry:
-                        continue
-
-                    entry_start = entry["start"]
-                    if not (start_timestamp <= entry_start < end_timestamp):
-                        continue
-
-                    # Multi-entry: durations are in SECONDS
-                    events.append({
-                        "start": entry_start,
-                        "leftDuration": entry.get("leftDuration", 0),
-                        "rightDuration": entry.get("rightDuration", 0),
-                        "is_multi_entry": True,
-                    })
+            # Cached batch summaries: batches outside the range are skipped without walking them
+            for entry in self.batch_index.entries(multi_docs, start_timestamp, end_timestamp):
+                entry_start = entry["start"]
+                # Multi-entry: durations are in SECONDS
+                event = {
+                    "start": entry_start,
+                    "leftDuration": entry.get("leftDuration", 0),
+                    "rightDuration": entry.get("rightDuration", 0),
+                    "offset": entry.get("offset"),
+                    "is_multi_entry": True,
+                }
+                _copy_extra_fields(event, entry, extra_fields)
+                events.append(event)
 
         except Exception as err:
             _LOGGER.error("Error fetching feed intervals: %s", err)
 
         return events
 
+    @_api_call
     def get_diaper_intervals(
         self,
         child_uid: str,
         start_timestamp: int,
         end_timestamp: int,
+        extra_fields: Sequence[str] = (),
     ) -> list[dict]:
         """
         Fetch diaper intervals from Firestore for a date range.
@@ -1351,9 +2040,11 @@ class HuckleberryAPI:
             child_uid: Child unique identifier
             start_timestamp: Start of range (Unix timestamp in seconds)
             end_timestamp: End of range (Unix timestamp in seconds)
+            extra_fields: Additional field paths to download and include in each entry
+                (e.g. "details" or "notes"); only the decoded fields are read otherwise
 
         Returns:
-            List of diaper interval dicts with 'start', 'mode', and optional details
+            List of diaper interval dicts with 'start', 'mode', 'offset', and optional details
         """
         events = []
         client = self._get_firestore_client()
@@ -1362,11 +2053,8 @@ class HuckleberryAPI:
 
         try:
             # Query 1: Get regular documents with date filtering
-            regular_docs = intervals_ref.where(
-                filter=firestore.FieldFilter("start", ">=", start_timestamp)
-            ).where(
-                filter=firestore.FieldFilter("start", "<", end_timestamp)
-            ).order_by("start").stream()
+            regular_docs = self._range_docs(intervals_ref, INTERVAL_FIELDS["diaper"] + tuple(extra_fields),
+                                            start_timestamp, end_timestamp)
 
             for doc in regular_docs:
                 data = doc.to_dict()
@@ -1376,6 +2064,7 @@ class HuckleberryAPI:
                 event = {
                     "start": data["start"],
                     "mode": data.get("mode", "unknown"),
+                    "offset": data.get("offset"),
                 }
                 # Add optional fields if present
                 if "pooColor" in data:
@@ -1384,50 +2073,44 @@ class HuckleberryAPI:
                     event["pooConsistency"] = data["pooConsistency"]
                 if "amount" in data:
                     event["amount"] = data["amount"]
+                _copy_extra_fields(event, data, extra_fields)
                 events.append(event)
 
             # Query 2: Get multi-entry documents (can't filter by nested start field)
-            multi_docs = intervals_ref.where(
-                filter=firestore.FieldFilter("multi", "==", True)
+            multi_docs = intervals_ref.select(MULTI_BATCH_FIELDS).where(
+                filter=self._backend.field_filter("multi", "==", True)
             ).stream()
 
-            for doc in multi_docs:
-                data = doc.to_dict()
-                if not data or not isinstance(data.get("data"), dict):
-                    continue
-
-                # Iterate through batched entries and filter by date
-                for entry_id, entry in data["data"].items():
-                    if not isinstance(entry, dict) or "start" not in entry:
-                        continue
-
-                    entry_start = entry["start"]
-                    if not (start_timestamp <= entry_start < end_timestamp):
-                        continue
-
-                    event = {
-                        "start": entry_start,
-                        "mode": entry.get("mode", "unknown"),
-                    }
-                    # Add optional fields if present
-                    if "pooColor" in entry:
-                        event["pooColor"] = entry["pooColor"]
-                    if "pooConsistency" in entry:
-                        event["pooConsistency"] = entry["pooConsistency"]
-                    if "amount" in entry:
-                        event["amount"] = entry["amount"]
-                    events.append(event)
+            # Cached batch summaries: batches outside the range are skipped without walking them
+            for entry in self.batch_index.entries(multi_docs, start_timestamp, end_timestamp):
+                entry_start = entry["start"]
+                event = {
+                    "start": entry_start,
+                    "mode": entry.get("mode", "unknown"),
+                    "offset": entry.get("offset"),
+                }
+                # Add optional fields if present
+                if "pooColor" in entry:
+                    event["pooColor"] = entry["pooColor"]
+                if "pooConsistency" in entry:
+                    event["pooConsistency"] = entry["pooConsistency"]
+                if "amount" in entry:
+                    event["amount"] = entry["amount"]
+                _copy_extra_fields(event, entry, extra_fields)
+                events.append(event)
 
         except Exception as err:
             _LOGGER.error("Error fetching diaper intervals: %s", err)
 
         return events
 
+    @_api_call
     def get_health_entries(
         self,
         child_uid: str,
         start_timestamp: int,
         end_timestamp: int,
+        extra_fields: Sequence[str] = (),
     ) -> list[dict]:
         """
         Fetch health/growth entries from Firestore for a date range.
@@ -1436,9 +2119,11 @@ class HuckleberryAPI:
             child_uid: Child unique identifier
             start_timestamp: Start of range (Unix timestamp in seconds)
             end_timestamp: End of range (Unix timestamp in seconds)
+            extra_fields: Additional field paths to download and include in each entry
+                (e.g. "details" or "notes"); only the decoded fields are read otherwise
 
         Returns:
-            List of health entry dicts with 'start' and optional measurement fields
+            List of health entry dicts with 'start', 'offset' and optional measurement fields
         """
         events = []
         client = self._get_firestore_client()
@@ -1448,18 +2133,15 @@ class HuckleberryAPI:
 
         try:
             # Query 1: Get regular documents with date filtering
-            regular_docs = data_ref.where(
-                filter=firestore.FieldFilter("start", ">=", start_timestamp)
-            ).where(
-                filter=firestore.FieldFilter("start", "<", end_timestamp)
-            ).order_by("start").stream()
+            regular_docs = self._range_docs(data_ref, INTERVAL_FIELDS["health"] + tuple(extra_fields),
+                                            start_timestamp, end_timestamp)
 
             for doc in regular_docs:
                 data = doc.to_dict()
                 if not data or data.get("multi"):
                     continue  # Skip multi-entry docs from this query
 
-                event = {"start": data["start"]}
+                event = {"start": data["start"], "offset": data.get("offset")}
                 # Add optional measurement fields if present
                 if "weight" in data:
                     event["weight"] = data["weight"]
@@ -1467,38 +2149,205 @@ class HuckleberryAPI:
                     event["height"] = data["height"]
                 if "head" in data:
                     event["head"] = data["head"]
+                _copy_extra_fields(event, data, extra_fields)
                 events.append(event)
 
             # Query 2: Get multi-entry documents (can't filter by nested start field)
-            multi_docs = data_ref.where(
-                filter=firestore.FieldFilter("multi", "==", True)
+            multi_docs = data_ref.select(MULTI_BATCH_FIELDS).where(
+                filter=self._backend.field_filter("multi", "==", True)
             ).stream()
 
+            # Cached batch summaries: batches outside the range are skipped without walking them
+            for entry in self.batch_index.entries(multi_docs, start_timestamp, end_timestamp):
+                entry_start = entry["start"]
+                event = {"start": entry_start, "offset": entry.get("offset")}
+                # Add optional measurement fields if present
+                if "weight" in entry:
+                    event["weight"] = entry["weight"]
+                if "height" in entry:
+                    event["height"] = entry["height"]
+                if "head" in entry:
+                    event["head"] = entry["head"]
+                _copy_extra_fields(event, entry, extra_fields)
+                events.append(event)
+
+        except Exception as err:
+            _LOGGER.error("Error fetching health entries: %s", err)
+
+        return events
+
+    def _range_docs(self, intervals_ref: Any, fields: tuple[str, ...], start_timestamp: float,
+                    end_timestamp: float) -> Iterable[Any]:
+        """Regular documents with a start in the range, in start order; sharded if range_sharding is set."""
+        def query(shard_start: float, shard_end: float) -> Iterable[Any]:
+            return intervals_ref.select(fields).where(
+                filter=self._backend.field_filter("start", ">=", shard_start)
+            ).where(
+                filter=self._backend.field_filter("start", "<", shard_end)
+            ).order_by("start").stream()
+
+        if self._range_sharding is None:
+            return query(start_timestamp, end_timestamp)
+        return stream_sharded(query, start_timestamp, end_timestamp, self._range_sharding)
+
+    @_api_call
+    def get_interval_totals(
+        self,
+        child_uid: str,
+        collection: CollectionName,
+        start_timestamp: int,
+        end_timestamp: int,
+        sum_fields: tuple[str, ...] | None = None,
+        avg_fields: tuple[str, ...] = (),
+    ) -> IntervalTotals | None:
+        """
+        Count and sum interval entries in a date range without downloading them.
+
+        Regular interval documents are aggregated by a single Firestore
+        aggregation query (billed one read per 1000 matched documents).
+        Multi-entry batch documents cannot be aggregated server-side; they are
+        read on every call like in the range getters, and their entries are
+        merged in through `batch_index`, so totals always match the getters.
+        Each call is therefore billed one read per batch document of the
+        tracker on top of the aggregation, whatever the range; `batch_index`
+        only saves decoding batches that did not change.
+        Values are taken as stored, in the same units as the getters return
+        them (durations in seconds for regular documents and batch entries).
+
+        Args:
+            child_uid: Child unique identifier
+            collection: Tracker to aggregate ("sleep", "feed", "diaper" or "health")
+            start_timestamp: Start of range (Unix timestamp in seconds)
+            end_timestamp: End of range (Unix timestamp in seconds)
+            sum_fields: Numeric fields to sum (defaults to the tracker's duration fields)
+            avg_fields: Numeric fields to average
+
+        Returns:
+            Totals with 'count', 'sums' and 'averages', or None if a query failed
+        """
+        if sum_fields is None:
+            sum_fields = DEFAULT_TOTAL_FIELDS[collection]
+        # Averages are merged with batch entries through their sums and value counts
+        summed = tuple(dict.fromkeys(sum_fields + avg_fields))
+
+        client = self._get_firestore_client()
+        intervals_ref = client.collection(collection).document(child_uid).collection(
+            INTERVAL_SUBCOLLECTIONS[collection])
+
+        try:
+            # Query 1: Aggregate documents server-side
+            in_range = intervals_ref.where(
+                filter=self._backend.field_filter("start", ">=", start_timestamp)
+            ).where(
+                filter=self._backend.field_filter("start", "<", end_timestamp)
+            )
+            aggregation = in_range.count(alias="count")
+            for index, field in enumerate(summed):
+                aggregation = aggregation.sum(field, alias=f"sum_{index}")
+            for index, field in enumerate(avg_fields):
+                aggregation = aggregation.avg(field, alias=f"avg_{index}")
+            values = {result.alias: result.value for result in aggregation.get(timeout=10.0)[0]}
+
+            count = values["count"]
+            sums = {field: values[f"sum_{index}"] or 0 for index, field in enumerate(summed)}
+            averages = {field: values[f"avg_{index}"] for index, field in enumerate(avg_fields)}
+
+            # Query 2: Multi-entry documents (can't filter by nested start field)
+            multi_docs = list(intervals_ref.select(MULTI_BATCH_FIELDS + ("start",) + summed).where(
+                filter=self._backend.field_filter("multi", "==", True)
+            ).stream())
+
+            # Batch documents with a top-level start in range were aggregated as regular ones; take them out
+            batch_values = {field: 0 for field in avg_fields}  # values of batch entries, minus those taken out
+            merged: set[str] = set()  # averaged fields changed by batch documents
             for doc in multi_docs:
-                data = doc.to_dict()
-                if not data or not isinstance(data.get("data"), dict):
+                data = doc.to_dict() or {}
+                if not (_is_number(data.get("start")) and start_timestamp <= data["start"] < end_timestamp):
                     continue
+                count -= 1
+                for field in summed:
+                    if _is_number(data.get(field)):
+                        sums[field] -= data[field]
+                        if field in batch_values:
+                            batch_values[field] -= 1
+                            merged.add(field)
+
+            # Cached batch summaries: batches outside the range are skipped without walking them
+            for entry in self.batch_index.entries(multi_docs, start_timestamp, end_timestamp):
+                count += 1
+                for field in summed:
+                    value = entry.get(field)
+                    if _is_number(value):
+                        sums[field] += value
+                        if field in batch_values:
+                            batch_values[field] += 1
+                            merged.add(field)
+
+            merged_averages: dict[str, float | None] = {}
+            for field in avg_fields:
+                average = averages[field]
+                if average == 0 and field not in merged:
+                    merged_averages[field] = 0.0
+                    continue
+                # Documents holding the field, recovered from the server-side sum and average
+                if average is None:
+                    documents = 0
+                elif average:
+                    documents = round(values[f"sum_{summed.index(field)}"] / average)
+                else:
+                    # All values are zero, so the sum tells nothing: count them, for this field only
+                    documents = sum(1 for doc in in_range.select([field]).stream()
+                                    if _is_number((doc.to_dict() or {}).get(field)))
+                documents += batch_values[field]
+                merged_averages[field] = sums[field] / documents if documents else None
+        except Exception as err:
+            _LOGGER.error("Error aggregating %s intervals: %s", collection, err)
+            raise ReadFailed(None) from err
+
+        return {"count": count, "sums": {field: sums[field] for field in sum_fields}, "averages": merged_averages}
+
+    @_api_call
+    def get_interval_records(
+        self,
+        child_uid: str,
+        collection: CollectionName,
+        start_timestamp: int,
+        end_timestamp: int,
+    ) -> list[IntervalRecord]:
+        """
+        Fetch entries of a tracker as compact records for a date range.
+
+        Same queries as the get_*_intervals getters, but entries are decoded
+        straight from the snapshots into slotted records (SleepInterval,
+        FeedInterval, DiaperInterval or HealthEntry), which take far less memory
+        than the dict form when large histories are kept.
+
+        Args:
+            child_uid: Child unique identifier
+            collection: Tracker ("sleep", "feed", "diaper" or "health")
+            start_timestamp: Start of range (Unix timestamp in seconds)
+            end_timestamp: End of range (Unix timestamp in seconds)
 
-                # Iterate through batched entries and filter by date
-                for entry_id, entry in data["data"].items():
-                    if not isinstance(entry, dict) or "start" not in entry:
-                        continue
-
-                    entry_start = entry["start"]
-                    if not (start_timestamp <= entry_start < end_timestamp):
-                        continue
-
-                    event = {"start": entry_start}
-                    # Add optional measurement fields if present
-                    if "weight" in entry:
-                        event["weight"] = entry["weight"]
-                    if "height" in entry:
-                        event["height"] = entry["height"]
-                    if "head" in entry:
-                        event["head"] = entry["head"]
-                    events.append(event)
+        Returns:
+            List of records, regular documents in start order followed by batch entries
+        """
+        client = self._get_firestore_client()
+        intervals_ref = client.collection(collection).document(child_uid).collection(
+            INTERVAL_SUBCOLLECTIONS[collection])
+
+        records: list[IntervalRecord] = []
+        try:
+            regular_docs = self._range_docs(intervals_ref, INTERVAL_FIELDS[collection], start_timestamp,
+                                            end_timestamp)
+            records.extend(decode_snapshots(collection, regular_docs, expand_multi=False))
 
+            multi_docs = intervals_ref.select(MULTI_BATCH_FIELDS).where(
+                filter=self._backend.field_filter("multi", "==", True)
+            ).stream()
+            decode = INTERVAL_DECODERS[collection]
+            records.extend(decode(entry, True)
+                           for entry in self.batch_index.entries(multi_docs, start_timestamp, end_timestamp))
         except Exception as err:
-            _LOGGER.error("Error fetching health entries: %s", err)
+            _LOGGER.error("Error fetching %s records: %s", collection, err)
 
-        return events
+        return records
@@ -0,0 +1,127 @@
+"""Storage backends for Huckleberry API.
+
+HuckleberryAPI talks to storage through the small part of the Firestore client
+surface it actually uses: ``collection()``, ``document()``, ``get()``, ``set()``,
+``update()``, ``where()``/``order_by()``/``stream()`` and ``on_snapshot()``.
+A backend creates such a client for an ID token and provides the two Firestore
+values the API needs to build requests: field filters and the delete sentinel.
+"""
+from __future__ import annotations
+
+import logging
+import socket
+from typing import TYPE_CHECKING, Any, Protocol
+
+from google.auth.credentials import Credentials
+
+from .const import FIREBASE_PROJECT_ID, FIRESTORE_HOST
+
+if TYPE_CHECKING:
+    from ._instrument import RpcCall
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FirebaseTokenCredentials(Credentials):
+    """Custom credentials class for Firebase SDK."""
+
+    def __init__(self, id_token: str):
+        """Initialize with Firebase ID token."""
+        super().__init__()
+        self._id_token = id_token
+        self.token = id_token  # Set the token attribute that parent expects
+
+    def refresh(self, request):
+        """Token refresh is handled by HuckleberryAPI.
+
+        This method is required by the Credentials interface but is not used.
+        Token refreshing is managed externally by HuckleberryAPI.refresh_auth_token(),
+        and a new FirebaseTokenCredentials instance is created with the refreshed token.
+        """
+
+
+class StorageBackend(Protocol):
+    """Interface for pluggable storage backends."""
+
+    @property
+    def delete_field(self) -> Any:
+        """Sentinel value that deletes a field in ``set(merge=True)`` and ``update()``."""
+
+    def create_client(self, id_token: str) -> Any:
+        """Create a Firestore-compatible client authenticated with the given ID token."""
+
+    def field_filter(self, field_path: str, op_string: str, value: Any) -> Any:
+        """Build a filter for ``where(filter=...)``."""
+
+    def retry_policy(self, call: RpcCall) -> Any | None:
+        """Return a retry policy for an RPC that counts retries on ``call``, or None."""
+
+    def warm_up(self) -> None:
+        """Prepare for the first RPC before a token is available (imports, DNS, connections)."""
+
+
+class FirestoreBackend:
+    """Default backend using the official google-cloud-firestore SDK (gRPC)."""
+
+    def __init__(self, project: str = FIREBASE_PROJECT_ID) -> None:
+        """Initialize the backend.
+
+        Args:
+            project: Firebase project ID.
+        """
+        self.project = project
+
+    def warm_up(self) -> None:
+        """Import the Firestore SDK and resolve the service host ahead of the first client.
+
+        The gRPC channel itself needs credentials, so it is opened by the
+        first RPC after sign-in.
+        """
+        from google.cloud import firestore  # noqa: F401
+
+        socket.getaddrinfo(FIRESTORE_HOST, 443, type=socket.SOCK_STREAM)
+
+    @property
+    def delete_field(self) -> Any:
+        """Firestore DELETE_FIELD sentinel."""
+        from google.cloud import firestore
+
+        return firestore.DELETE_FIELD
+
+    def create_client(self, id_token: str) -> Any:
+        """Create a firestore.Client using Firebase token credentials."""
+        from google.cloud import firestore
+
+        return firestore.Client(
+            project=self.project,
+            credentials=FirebaseTokenCredentials(id_token),
+        )
+
+    def field_filter(self, field_path: str, op_string: str, value: Any) -> Any:
+        """Build a firestore.FieldFilter."""
+        from google.cloud import firestore
+
+        return firestore.FieldFilter(field_path, op_string, value)
+
+    def retry_policy(self, call: RpcCall) -> Any | None:
+        """Retry transient Firestore errors, counting each retry on the call."""
+        from google.api_core import exceptions, retry
+
+        def on_error(err: Exception) -> None:
+            call.retries += 1
+            _LOGGER.debug("Retrying Firestore %s on %s after error: %s", call.operation, call.path, err)
+
+        return retry.Retry(
+            predicate=retry.if_exception_type(
+                exceptions.DeadlineExceeded,
+                exceptions.InternalServerError,
+                exceptions.ResourceExhausted,
+                exceptions.ServiceUnavailable,
+            ),
+            initial=0.1,
+            maximum=60.0,
+            multiplier=1.3,
+            timeout=60.0,
+            on_error=on_error,
+        )
+
@@ -0,0 +1,126 @@
+"""Index of decoded multi-entry batch documents.
+
+Imported history is stored as "multi" documents whose ``data`` map holds many
+interval entries. Firestore cannot filter those entries by start, so every
+range read downloads all batches of a tracker.
+
+BatchIndex avoids the CPU cost of the downloaded batches: it keeps a
+BatchSummary (min and max start, entry count, entries sorted by start) per
+document version, identified by document path and update time. A batch whose
+version was seen before is neither copied out of its snapshot nor walked
+again; batches outside the requested range are skipped outright, and
+overlapping ones are sliced by bisection.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+
+@dataclass
+class BatchSummary:
+    """Entries of one batch document version, sorted by start, with their range."""
+
+    min_start: float
+    max_start: float
+    count: int
+    starts: list[float]
+    entries: list[dict[str, Any]]
+
+    def overlaps(self, start_timestamp: float, end_timestamp: float) -> bool:
+        """Whether any entry may have ``start_timestamp <= start < end_timestamp``."""
+        return self.count > 0 and self.min_start < end_timestamp and self.max_start >= start_timestamp
+
+    def in_range(self, start_timestamp: float, end_timestamp: float) -> list[dict[str, Any]]:
+        """Entries with ``start_timestamp <= start < end_timestamp``."""
+        if start_timestamp <= self.min_start and self.max_start < end_timestamp:
+            return self.entries
+        low = bisect.bisect_left(self.starts, start_timestamp)
+        high = bisect.bisect_left(self.starts, end_timestamp)
+        return self.entries[low:high]
+
+
+def summarize_batch(data: dict[str, Any] | None) -> BatchSummary:
+    """Summarize the ``data`` map of a batch document (entries without a numeric start are dropped)."""
+    batch = (data or {}).get("data")
+    entries = sorted(
+        (entry for entry in (batch.values() if isinstance(batch, dict) else ())
+         if isinstance(entry, dict) and isinstance(entry.get("start"), (int, float))
+         and not isinstance(entry["start"], bool)),
+        key=lambda entry: entry["start"],
+    )
+    starts = [entry["start"] for entry in entries]
+    return BatchSummary(starts[0] if starts else 0.0, starts[-1] if starts else 0.0, len(entries), starts, entries)
+
+
+@dataclass
+class BatchIndexStats:
+    """Counters of a BatchIndex."""
+
+    hits: int = 0  # batch versions summarized before
+    misses: int = 0  # batches decoded and summarized
+    pruned: int = 0  # batches skipped as outside the requested range
+
+
+class BatchIndex:
+    """Thread-safe LRU cache of batch summaries, one per document path, keyed by update time.
+
+    Cached entries are shared between calls and must not be modified.
+    """
+
+    def __init__(self, max_documents: int = 256) -> None:
+        """Initialize the index.
+
+        Args:
+            max_documents: Batch documents kept; the least recently used are dropped beyond it.
+        """
+        self.max_documents = max_documents
+        self.stats = BatchIndexStats()
+        self._lock = threading.Lock()
+        self._summaries: OrderedDict[str, tuple[Any, BatchSummary]] = OrderedDict()
+
+    def summary(self, snapshot: Any) -> BatchSummary:
+        """Summary of a batch document snapshot, decoded only for versions not seen before."""
+        path = getattr(getattr(snapshot, "reference", None), "path", None)
+        version = getattr(snapshot, "update_time", None)
+        cacheable = path is not None and version is not None
+        if cacheable:
+            with self._lock:
+                cached = self._summaries.get(path)
+                if cached is not None and cached[0] == version:
+                    self._summaries.move_to_end(path)
+                    self.stats.hits += 1
+                    return cached[1]
+        summary = summarize_batch(snapshot.to_dict())
+        with self._lock:
+            self.stats.misses += 1
+            if cacheable:
+                self._summaries[path] = (version, summary)
+                self._summaries.move_to_end(path)
+                while len(self._summaries) > self.max_documents:
+                    self._summaries.popitem(last=False)
+        return summary
+
+    def entries(self, snapshots: Iterable[Any], start_timestamp: float, end_timestamp: float
+                ) -> list[dict[str, Any]]:
+        """Entries of batch snapshots with ``start_timestamp <= start < end_timestamp``, per batch in start order."""
+        entries: list[dict[str, Any]] = []
+        for snapshot in snapshots:
+            summary = self.summary(snapshot)
+            if not summary.overlaps(start_timestamp, end_timestamp):
+                with self._lock:
+                    self.stats.pruned += 1
+                continue
+            entries.extend(summary.in_range(start_timestamp, end_timestamp))
+        return entries
+
+    def clear(self) -> None:
+        """Drop all summaries."""
+        with self._lock:
+            self._summaries.clear()
+
+    def __len__(self) -> int:
+        return len(self._summaries)
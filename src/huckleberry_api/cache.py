@@ -0,0 +1,161 @@
+"""Read cache for rarely changing profile and growth data.
+
+Coordinators call ``get_children`` and ``get_growth_data`` on every refresh,
+although child profiles and ``prefs.lastGrowthEntry`` change rarely. A
+ReadCache answers repeated calls locally for a per-method TTL:
+
+    api = HuckleberryAPI(email, password, timezone,
+                         read_cache=ReadCache({"get_children": 3600, "get_growth_data": 600}))
+
+Entries are dropped as soon as the session learns the underlying documents
+changed: when it writes to them itself (any set, update or delete below the
+collections a method reads, e.g. ``log_growth`` writing ``health/<child>``)
+and when one of its listeners receives a snapshot of them. Changes made
+elsewhere (the phone app) and not seen by a listener show up after the TTL.
+"""
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping
+
+from .ratelimit import WRITE_OPERATIONS
+
+if TYPE_CHECKING:
+    from ._instrument import RpcCall
+
+# Top-level collections each cacheable method reads
+DEPENDENCIES: dict[str, frozenset[str]] = {
+    "get_children": frozenset({"users", "childs"}),
+    "get_growth_data": frozenset({"health"}),
+}
+
+_READ_COLLECTIONS: frozenset[str] = frozenset().union(*DEPENDENCIES.values())
+
+DEFAULT_TTLS: dict[str, float] = {"get_children": 300.0, "get_growth_data": 300.0}
+
+# Marker for a cache miss (None is a valid result)
+MISS = object()
+
+
+class ReadFailed(Exception):
+    """Raised by a read method that failed, carrying the result to return instead.
+
+    The public method wrapper returns ``fallback`` to the caller; raising it
+    instead of returning keeps the fallback out of the cache.
+    """
+
+    def __init__(self, fallback: Any) -> None:
+        super().__init__("read failed")
+        self.fallback = fallback
+
+
+@dataclass
+class ReadCacheStats:
+    """Counters of a ReadCache."""
+
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0  # entries dropped because their documents changed
+    evictions: int = 0  # entries dropped for the size bound
+
+
+@dataclass
+class _Entry:
+    value: Any
+    child_uid: str | None
+    expires_at: float
+
+
+class ReadCache:
+    """Thread-safe TTL cache of read method results of one session."""
+
+    def __init__(self, ttls: Mapping[str, float] | None = None, max_entries: int = 256) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttls: Seconds to keep results, per method (default: DEFAULT_TTLS). Only
+                methods in DEPENDENCIES can be cached.
+            max_entries: Results kept; the least recently used are dropped beyond it.
+        """
+        ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        unknown = set(ttls) - set(DEPENDENCIES)
+        if unknown:
+            raise ValueError(f"Methods cannot be cached: {', '.join(sorted(unknown))}")
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self.stats = ReadCacheStats()
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._generation = 0  # incremented by every invalidation
+
+    def caches(self, method: str) -> bool:
+        """Whether results of ``method`` are cached."""
+        return method in self.ttls
+
+    def get(self, method: str, key: str) -> Any:
+        """Copy of the cached result of ``method`` for arguments ``key``, or MISS."""
+        with self._lock:
+            entry = self._entries.get((method, key))
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    del self._entries[(method, key)]
+                self.stats.misses += 1
+                return MISS
+            self._entries.move_to_end((method, key))
+            self.stats.hits += 1
+            return copy.deepcopy(entry.value)
+
+    def load(self, method: str, key: str, child_uid: str | None, call: Callable[[], Any]) -> Any:
+        """Run ``call`` and cache its result, unless an invalidation happened meanwhile.
+
+        Empty results are not cached: the read methods return them on errors too.
+        Failed reads raising ReadFailed are not cached either.
+        """
+        with self._lock:
+            generation = self._generation
+        result = call()
+        if not result:
+            return result
+        with self._lock:
+            if self._generation == generation:
+                self._entries[(method, key)] = _Entry(copy.deepcopy(result), child_uid,
+                                                      time.monotonic() + self.ttls[method])
+                self._entries.move_to_end((method, key))
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats.evictions += 1
+        return result
+
+    def invalidate(self, collection: str | None = None, child_uid: str | None = None) -> None:
+        """Drop results that depend on ``collection`` (all if None), for one child or all of them.
+
+        Results not tied to a child (``get_children``) are dropped for any child.
+        """
+        if collection is not None and collection not in _READ_COLLECTIONS:
+            return
+        with self._lock:
+            self._generation += 1
+            for method_key in [
+                method_key for method_key, entry in self._entries.items()
+                if (collection is None or collection in DEPENDENCIES[method_key[0]])
+                and (child_uid is None or entry.child_uid in (None, child_uid))
+            ]:
+                del self._entries[method_key]
+                self.stats.invalidations += 1
+
+    @contextmanager
+    def rpc_hook(self, call: RpcCall) -> Iterator[None]:
+        """RPC hook invalidating results that depend on documents this session writes."""
+        try:
+            yield
+        finally:
+            if call.operation in WRITE_OPERATIONS:
+                self.invalidate(call.collection, call.child_uid)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -9,4 +9,41 @@ FIREBASE_APP_ID: Final = "1:219218185774:android:a3e215cc246b92b0"
 # API endpoints
 AUTH_URL: Final = "https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword"
 REFRESH_URL: Final = "https://securetoken.googleapis.com/v1/token"
-FIRESTORE_BASE_URL: Final = f"https://firestore.googleapis.com/v1/projects/{FIREBASE_PROJECT_ID}/databases/(default)/documents"
+FIRESTORE_HOST: Final = "firestore.googleapis.com"
+FIRESTORE_BASE_URL: Final = f"https://{FIRESTORE_HOST}/v1/projects/{FIREBASE_PROJECT_ID}/databases/(default)/documents"
+
+# Public API methods that only read; their results depend on their arguments and the stored data alone
+READ_METHODS: Final = frozenset({
+    "get_children",
+    "get_growth_data",
+    "get_growth_history",
+    "get_dashboard",
+    "get_calendar_events",
+    "get_daily_summary",
+    "get_sleep_intervals",
+    "get_feed_intervals",
+    "get_diaper_intervals",
+    "get_health_entries",
+    "get_interval_totals",
+    "get_interval_records",
+})
+
+# Public API methods that keep a session signed in and listening; cost budgets never refuse them
+SESSION_METHODS: Final = frozenset({
+    "authenticate",
+    "maintain_session",
+    "refresh_auth_token",
+    "setup_realtime_listener",
+    "setup_feed_listener",
+    "setup_health_listener",
+    "setup_diaper_listener",
+    "setup_interval_listener",
+})
+
+# Public API methods that write without reading first
+BLIND_WRITE_METHODS: Final = frozenset({
+    "start_sleep",
+    "start_feeding",
+    "log_diaper",
+    "log_growth",
+})
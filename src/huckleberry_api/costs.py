@@ -0,0 +1,289 @@
+"""Firestore cost accounting and budgets.
+
+Firestore bills per document read, write and delete. A CostMeter counts them
+for every RPC a session makes and attributes them to the public API method
+that made the call, the child it concerns and the account (Firebase user ID):
+
+    meter = CostMeter(budgets=[CostBudget(reads=50_000, period=86400)])
+    api = HuckleberryAPI(email, password, timezone, cost_meter=meter)
+    api.get_calendar_events(child_uid, start, end)
+    meter.by_method()["get_calendar_events"].reads
+
+Reads are billed as Firestore does: one per document returned, at least one
+per query or document get (missing documents and empty results are billed
+too), one per document requested by a batched get (found or not), and one
+per snapshot document delivered to a listener. Polling backends
+also read unchanged documents between snapshots; those reads are not seen here.
+
+Budgets are checked when a public API method starts, so a method that starts
+within budget always completes. Only the limits of the operations a method is
+billed for are checked (a reads limit does not stop ``log_diaper``), and
+sign-in, token refresh and listener setup are never refused, so sessions and
+listeners survive an exhausted budget. Exceeding a hard budget raises
+BudgetExceededError. Exceeding a soft budget makes read methods return their
+last result for the same arguments instead of reading again, while methods
+without a remembered result (and all writes) still run.
+"""
+from __future__ import annotations
+
+import contextvars
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Literal
+
+from .const import BLIND_WRITE_METHODS, READ_METHODS, SESSION_METHODS
+
+if TYPE_CHECKING:
+    from ._instrument import RpcCall, RpcHook
+
+_LOGGER = logging.getLogger(__name__)
+
+BudgetScope = Literal["account", "child"]
+Operation = Literal["reads", "writes", "deletes"]
+
+# Attribution of RPCs made outside any public API method
+UNATTRIBUTED = "other"
+
+def billed_operations(method: str) -> frozenset[Operation]:
+    """Operations a public API method is billed for, whose budget limits it is checked against."""
+    if method in SESSION_METHODS:
+        return frozenset()
+    if method in READ_METHODS:
+        return frozenset({"reads"})
+    if method in BLIND_WRITE_METHODS:
+        return frozenset({"writes"})
+    return frozenset({"reads", "writes", "deletes"})
+
+
+_current_method: contextvars.ContextVar[str | None] = contextvars.ContextVar("huckleberry_cost_method",
+                                                                              default=None)
+
+
+@dataclass
+class CostCounts:
+    """Billed document operations."""
+
+    reads: int = 0
+    writes: int = 0
+    deletes: int = 0
+
+    def add(self, other: CostCounts) -> None:
+        """Add another count to this one."""
+        self.reads += other.reads
+        self.writes += other.writes
+        self.deletes += other.deletes
+
+
+def rpc_cost(call: RpcCall) -> CostCounts:
+    """Billed operations of one finished RPC."""
+    if call.operation in ("set", "update"):
+        return CostCounts(writes=1)
+    if call.operation == "delete":
+        return CostCounts(deletes=1)
+    # Aggregations are billed one read per 1000 index entries, at least one
+    return CostCounts(reads=max(call.documents, 1))
+
+
+@dataclass(frozen=True)
+class CostBudget:
+    """Limit on billed operations per period, for each account or each child.
+
+    Limits left at None are not enforced. Usage is counted in fixed windows of
+    ``period`` seconds starting at the first counted operation.
+    """
+
+    reads: int | None = None
+    writes: int | None = None
+    deletes: int | None = None
+    period: float = 86400.0
+    scope: BudgetScope = "account"
+    hard: bool = False
+
+    def exceeded_by(self, counts: CostCounts, operations: frozenset[Operation] | None = None) -> bool:
+        """Whether ``counts`` reached any limit of this budget (only those of ``operations`` if given)."""
+        return any(
+            limit is not None and used >= limit and (operations is None or operation in operations)
+            for operation, limit, used in (("reads", self.reads, counts.reads),
+                                           ("writes", self.writes, counts.writes),
+                                           ("deletes", self.deletes, counts.deletes))
+        )
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised when an API method starts while a hard cost budget is exhausted."""
+
+    def __init__(self, budget: CostBudget, key: str, usage: CostCounts) -> None:
+        """Initialize the error with the exhausted budget and its usage."""
+        super().__init__(f"Firestore {budget.scope} budget exhausted for {key!r}: {usage.reads} reads, "
+                         f"{usage.writes} writes, {usage.deletes} deletes in {budget.period:g}s")
+        self.budget = budget
+        self.key = key
+        self.usage = usage
+
+
+@dataclass
+class _Window:
+    started: float
+    counts: CostCounts = field(default_factory=CostCounts)
+
+
+class CostMeter:
+    """Thread-safe counter of billed Firestore operations, shareable by many sessions."""
+
+    def __init__(self, budgets: tuple[CostBudget, ...] | list[CostBudget] = (), fallback_size: int = 256) -> None:
+        """Initialize the meter.
+
+        Args:
+            budgets: Budgets enforced when API methods start.
+            fallback_size: Results remembered for soft budgets (least recently used are dropped).
+        """
+        self.budgets = tuple(budgets)
+        self.fallback_size = fallback_size
+        self.fallbacks = 0  # calls answered with a remembered result
+        self._lock = threading.Lock()
+        self._by_method: dict[tuple[str, str], CostCounts] = {}
+        self._by_child: dict[tuple[str, str], CostCounts] = {}
+        self._by_account: dict[str, CostCounts] = {}
+        self._windows: dict[tuple[int, str], _Window] = {}
+        self._results: OrderedDict[tuple[str, str, str], Any] = OrderedDict()
+
+    def hook(self, account: Callable[[], str | None]) -> RpcHook:
+        """Build an RPC hook counting the RPCs of one session (``account`` returns its user ID)."""
+
+        @contextmanager
+        def hook(call: RpcCall) -> Iterator[None]:
+            try:
+                yield
+            finally:
+                self.record(account() or "", call.child_uid, rpc_cost(call))
+
+        return hook
+
+    def record(self, account: str, child_uid: str | None, counts: CostCounts, method: str | None = None) -> None:
+        """Count billed operations, attributed to ``method`` or the API method running."""
+        method = method or _current_method.get() or UNATTRIBUTED
+        now = time.monotonic()
+        with self._lock:
+            self._by_method.setdefault((account, method), CostCounts()).add(counts)
+            self._by_account.setdefault(account, CostCounts()).add(counts)
+            if child_uid:
+                self._by_child.setdefault((account, child_uid), CostCounts()).add(counts)
+            for index, budget in enumerate(self.budgets):
+                key = self._budget_key(budget, account, child_uid)
+                if key is not None:
+                    self._window(index, budget, key, now).counts.add(counts)
+
+    def run(self, account: str, method: str, child_uid: str | None, call: Callable[[], Any],
+            arguments: str = "") -> Any:
+        """Run a public API method under the budgets, attributing its RPCs to ``method``.
+
+        ``arguments`` identifies the call's arguments; read methods remember their
+        result under it for soft budgets.
+        """
+        if _current_method.get() is not None:
+            return call()  # called by another API method; attributed to and checked for that one
+        remember = method in READ_METHODS and bool(arguments) and any(not budget.hard for budget in self.budgets)
+        result_key = (account, method, arguments)
+        if self._over_budget(account, child_uid, billed_operations(method)):
+            with self._lock:
+                found = result_key in self._results
+                if found:
+                    self._results.move_to_end(result_key)
+                    result = copy.deepcopy(self._results[result_key])
+                    self.fallbacks += 1
+            if found:
+                _LOGGER.warning("Cost budget exceeded; %s answered from its last result", method)
+                return result
+        token = _current_method.set(method)
+        try:
+            result = call()
+        finally:
+            _current_method.reset(token)
+        if remember:
+            with self._lock:
+                self._results[result_key] = copy.deepcopy(result)
+                self._results.move_to_end(result_key)
+                while len(self._results) > self.fallback_size:
+                    self._results.popitem(last=False)
+        return result
+
+    def usage(self, budget: CostBudget, account: str, child_uid: str | None = None) -> CostCounts:
+        """Usage counted against ``budget`` in its current window."""
+        index = self.budgets.index(budget)
+        key = self._budget_key(budget, account, child_uid)
+        with self._lock:
+            window = self._windows.get((index, key)) if key is not None else None
+            if window is None or time.monotonic() - window.started >= budget.period:
+                return CostCounts()
+            return replace(window.counts)
+
+    def by_method(self, account: str | None = None) -> dict[str, CostCounts]:
+        """Totals per API method, for one account or summed over all."""
+        return self._totals(self._by_method, account)
+
+    def by_child(self, account: str | None = None) -> dict[str, CostCounts]:
+        """Totals per child, for one account or summed over all."""
+        return self._totals(self._by_child, account)
+
+    def by_account(self) -> dict[str, CostCounts]:
+        """Totals per account."""
+        with self._lock:
+            return {account: replace(counts) for account, counts in self._by_account.items()}
+
+    def total(self) -> CostCounts:
+        """Totals over all accounts."""
+        total = CostCounts()
+        for counts in self.by_account().values():
+            total.add(counts)
+        return total
+
+    def reset(self) -> None:
+        """Drop all counts, budget windows and remembered results."""
+        with self._lock:
+            self._by_method.clear()
+            self._by_child.clear()
+            self._by_account.clear()
+            self._windows.clear()
+            self._results.clear()
+            self.fallbacks = 0
+
+    def _over_budget(self, account: str, child_uid: str | None, operations: frozenset[Operation]) -> bool:
+        """Raise for a hard budget exhausted in ``operations``; return whether such a soft budget is."""
+        soft = False
+        if not operations:
+            return soft
+        for budget in self.budgets:
+            if budget.scope == "child" and not child_uid:
+                continue
+            usage = self.usage(budget, account, child_uid)
+            if budget.exceeded_by(usage, operations):
+                if budget.hard:
+                    raise BudgetExceededError(budget, account if budget.scope == "account" else child_uid or "",
+                                              usage)
+                soft = True
+        return soft
+
+    @staticmethod
+    def _budget_key(budget: CostBudget, account: str, child_uid: str | None) -> str | None:
+        if budget.scope == "account":
+            return account
+        return f"{account}/{child_uid}" if child_uid else None
+
+    def _window(self, index: int, budget: CostBudget, key: str, now: float) -> _Window:
+        window = self._windows.get((index, key))
+        if window is None or now - window.started >= budget.period:
+            window = self._windows[(index, key)] = _Window(now)
+        return window
+
+    def _totals(self, table: dict[tuple[str, str], CostCounts], account: str | None) -> dict[str, CostCounts]:
+        totals: dict[str, CostCounts] = {}
+        with self._lock:
+            for (owner, name), counts in table.items():
+                if account is None or owner == account:
+                    totals.setdefault(name, CostCounts()).add(counts)
+        return totals
@@ -0,0 +1,88 @@
+"""Field-level changes between document snapshots.
+
+Listeners set up with ``deltas=True`` receive a DocumentDelta instead of the
+whole document: the changed leaf field paths with their old and new values,
+computed once per snapshot against the last delivered state:
+
+    def on_sleep(delta: DocumentDelta) -> None:
+        if delta.changed("timer"):
+            update_timer(delta.document["timer"])
+
+    api.setup_realtime_listener(child_uid, on_sleep, deltas=True)
+
+Maps present in both states are compared field by field; any other value
+(including lists, and maps that appear or disappear) is one change. Fields
+that are absent on one side are MISSING.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+
+class _Missing:
+    """Marker for a field that is absent."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __bool__(self) -> bool:
+        return False
+
+
+MISSING: Any = _Missing()
+
+
+@dataclass(frozen=True, slots=True)
+class FieldChange:
+    """One changed field."""
+
+    path: str
+    old: Any
+    new: Any
+
+
+@dataclass(frozen=True)
+class DocumentDelta:
+    """Changes of a document since the last delivered snapshot."""
+
+    document: dict[str, Any]
+    changes: tuple[FieldChange, ...]
+    initial: bool = False  # first delivery of this listener; every top-level field counts as changed
+
+    @property
+    def paths(self) -> tuple[str, ...]:
+        """Dotted paths of the changed fields."""
+        return tuple(change.path for change in self.changes)
+
+    def changed(self, path: str) -> bool:
+        """Whether the field at ``path``, or anything inside or around it, changed."""
+        return any(
+            change.path == path or change.path.startswith(path + ".") or path.startswith(change.path + ".")
+            for change in self.changes
+        )
+
+    def get(self, path: str) -> FieldChange | None:
+        """The change recorded at exactly ``path``, if any."""
+        for change in self.changes:
+            if change.path == path:
+                return change
+        return None
+
+
+def diff_documents(old: Mapping[str, Any] | None, new: Mapping[str, Any] | None,
+                   prefix: str = "") -> list[FieldChange]:
+    """List the fields that differ between two documents."""
+    old = old or {}
+    new = new or {}
+    changes: list[FieldChange] = []
+    for key in list(old) + [key for key in new if key not in old]:
+        path = f"{prefix}{key}"
+        before, after = old.get(key, MISSING), new.get(key, MISSING)
+        if isinstance(before, Mapping) and isinstance(after, Mapping):
+            changes.extend(diff_documents(before, after, path + "."))
+        elif before is MISSING or after is MISSING or before != after:
+            changes.append(FieldChange(path, before, after))
+    return changes
@@ -0,0 +1,133 @@
+"""Listener callback dispatch off the watch thread.
+
+By default listener callbacks run on the thread that delivers snapshots
+(the Firestore watch thread or the REST poller), so a slow callback stalls
+the stream. A CallbackDispatcher hands snapshots to an executor instead, with
+a bounded queue per listener:
+
+    dispatcher = CallbackDispatcher(max_pending=10, coalesce=True)
+    api = HuckleberryAPI(email, password, timezone, dispatcher=dispatcher)
+
+Callbacks of one listener run one at a time and in order. When a listener's
+queue is full the oldest pending snapshot is dropped. With ``coalesce=True``
+only the newest pending snapshot of each listener is kept (latest wins).
+Duplicate checks and deltas are computed when a snapshot is delivered, so
+listeners with ``deltas=True`` still see every change since the last delivered
+state.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable, Hashable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class DispatchStats:
+    """Counters of a CallbackDispatcher."""
+
+    submitted: int = 0
+    delivered: int = 0
+    dropped: int = 0  # discarded because the listener's queue was full
+    coalesced: int = 0  # replaced by a newer snapshot of the same listener
+    failed: int = 0  # callbacks that raised
+    pending: int = 0  # waiting now, over all listeners
+    max_depth: int = 0  # deepest queue of one listener seen so far
+
+
+class _ListenerQueue:
+    __slots__ = ("items", "running")
+
+    def __init__(self) -> None:
+        self.items: deque[Callable[[], None]] = deque()
+        self.running = False
+
+
+class CallbackDispatcher:
+    """Runs listener callbacks on an executor with a bounded queue per listener."""
+
+    def __init__(self, executor: Executor | None = None, max_pending: int = 100, coalesce: bool = False,
+                 max_workers: int = 4) -> None:
+        """Initialize the dispatcher.
+
+        Args:
+            executor: Executor running the callbacks (default: an owned thread pool).
+            max_pending: Snapshots queued per listener before the oldest is dropped.
+            coalesce: Keep only the newest pending snapshot per listener.
+            max_workers: Threads of the owned pool when no executor is given.
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.max_pending = max_pending
+        self.coalesce = coalesce
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers,
+                                                        thread_name_prefix="huckleberry-dispatch")
+        self._lock = threading.Lock()
+        self._queues: dict[Hashable, _ListenerQueue] = {}
+        self._stats = DispatchStats()
+
+    def dispatch(self, key: Hashable, delivery: Callable[[], None]) -> None:
+        """Queue a delivery for the listener identified by ``key``."""
+        with self._lock:
+            queue = self._queues.setdefault(key, _ListenerQueue())
+            self._stats.submitted += 1
+            if self.coalesce and queue.items:
+                self._stats.coalesced += len(queue.items)
+                queue.items.clear()
+            elif len(queue.items) >= self.max_pending:
+                queue.items.popleft()
+                self._stats.dropped += 1
+            queue.items.append(delivery)
+            self._stats.max_depth = max(self._stats.max_depth, len(queue.items))
+            if queue.running:
+                return
+            queue.running = True
+        try:
+            self._executor.submit(self._drain, key, queue)
+        except RuntimeError as err:  # executor shut down
+            _LOGGER.warning("Dropping listener callbacks for %s: %s", key, err)
+            with self._lock:
+                self._stats.dropped += len(queue.items)
+                queue.items.clear()
+                queue.running = False
+
+    def depth(self, key: Hashable) -> int:
+        """Number of deliveries waiting for one listener."""
+        with self._lock:
+            queue = self._queues.get(key)
+            return len(queue.items) if queue else 0
+
+    def stats(self) -> DispatchStats:
+        """Snapshot of the counters."""
+        with self._lock:
+            return replace(self._stats, pending=sum(len(queue.items) for queue in self._queues.values()))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the owned executor (an executor passed in is left running)."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
+
+    def _drain(self, key: Hashable, queue: _ListenerQueue) -> None:
+        while True:
+            with self._lock:
+                if not queue.items:
+                    queue.running = False
+                    if self._queues.get(key) is queue:
+                        del self._queues[key]
+                    return
+                delivery = queue.items.popleft()
+            try:
+                delivery()
+            except Exception as err:
+                _LOGGER.error("Listener callback failed: %s", err)
+                with self._lock:
+                    self._stats.failed += 1
+            else:
+                with self._lock:
+                    self._stats.delivered += 1
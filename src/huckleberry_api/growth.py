@@ -0,0 +1,221 @@
+"""Growth history analytics: normalized arrays, velocity, interpolation and percentiles.
+
+``get_health_entries`` returns weight, height and head circumference in the
+units they were logged in (``kg``/``lbs``, ``cm``/``in``, ``hcm``/``hin``).
+A GrowthHistory holds a child's whole history as parallel numpy arrays in
+kilograms and centimeters, with ages in days from ``ChildData.birthday``:
+
+    history = api.get_growth_history(child_uid)
+    history.velocity("weight", per_days=7)  # kg per week between measurements
+    history.at_age("height", [30, 60, 90])  # cm at 1, 2 and 3 months
+    history.percentiles("head")  # against the WHO standards (growth_reference)
+
+Everything is vectorized with numpy, an optional dependency:
+
+    pip install "huckleberry-api[analytics]"
+"""
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass
+from datetime import date, datetime, time, tzinfo
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+from zoneinfo import ZoneInfo
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the extra
+    np = None  # type: ignore[assignment]
+
+from .growth_reference import DAYS_PER_MONTH, LMS_TABLES, Measure
+from .summary import DAY_SECONDS, require_numpy
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+WEIGHT_TO_KG: dict[str, float] = {"kg": 1.0, "lbs": 0.45359237}
+LENGTH_TO_CM: dict[str, float] = {"cm": 1.0, "in": 2.54, "inches": 2.54, "hcm": 1.0, "hin": 2.54, "hinches": 2.54}
+
+# Measure -> (units field, conversion table, units assumed when the field is missing, as log_growth's default)
+MEASURE_UNITS: dict[Measure, tuple[str, dict[str, float], str]] = {
+    "weight": ("weightUnits", WEIGHT_TO_KG, "kg"),
+    "height": ("heightUnits", LENGTH_TO_CM, "cm"),
+    "head": ("headUnits", LENGTH_TO_CM, "hcm"),
+}
+
+# Extra fields get_health_entries must download to normalize units
+UNIT_FIELDS: tuple[str, ...] = tuple(units_field for units_field, _, _ in MEASURE_UNITS.values())
+
+
+@dataclass(frozen=True)
+class GrowthHistory:
+    """A child's growth measurements as parallel numpy arrays, one element per entry.
+
+    Entries are sorted by start; measurements an entry does not have (or with
+    unknown units) are NaN. ``age_days`` is NaN when the birthday is unknown,
+    and percentiles are NaN unless ``sex`` is "boy" or "girl".
+    """
+
+    start: npt.NDArray[Any]  # Unix seconds
+    age_days: npt.NDArray[Any]
+    weight_kg: npt.NDArray[Any]
+    height_cm: npt.NDArray[Any]
+    head_cm: npt.NDArray[Any]
+    sex: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def values(self, measure: Measure) -> npt.NDArray[Any]:
+        """Normalized values of ``measure`` ("weight" in kg, "height" or "head" in cm)."""
+        return {"weight": self.weight_kg, "height": self.height_cm, "head": self.head_cm}[measure]
+
+    def velocity(self, measure: Measure, per_days: float = 30.0) -> tuple[npt.NDArray[Any], npt.NDArray[Any]]:
+        """Change of ``measure`` per ``per_days`` days between consecutive measurements.
+
+        Returns:
+            Ages in days at the midpoints between measurements, and the rates
+        """
+        values = self.values(measure)
+        measured = ~np.isnan(values)
+        days = self.start[measured] / DAY_SECONDS
+        ages = self.age_days[measured]
+        values = values[measured]
+        elapsed = np.diff(days)
+        apart = elapsed > 0  # entries logged at the same time give no rate
+        rates = np.diff(values)[apart] / elapsed[apart] * per_days
+        return ((ages[:-1] + ages[1:])[apart] / 2, rates)
+
+    def at_age(self, measure: Measure, age_days: float | Sequence[float] | npt.NDArray[Any]) -> npt.NDArray[Any]:
+        """``measure`` linearly interpolated at the given ages; NaN outside the measured ages."""
+        values = self.values(measure)
+        measured = ~(np.isnan(values) | np.isnan(self.age_days))
+        ages = np.asarray(age_days, dtype=np.float64)
+        if not measured.any():
+            return np.full(ages.shape, np.nan)
+        return np.interp(ages, self.age_days[measured], values[measured], left=np.nan, right=np.nan)
+
+    def z_scores(self, measure: Measure) -> npt.NDArray[Any]:
+        """z-scores of every entry's ``measure`` for its age and the child's sex."""
+        return z_scores(measure, self.sex, self.age_days, self.values(measure))
+
+    def percentiles(self, measure: Measure) -> npt.NDArray[Any]:
+        """Percentiles (0-100) of every entry's ``measure`` for its age and the child's sex."""
+        return percentiles(self.z_scores(measure))
+
+
+def growth_history(
+    entries: Sequence[Mapping[str, Any]],
+    birthday: str | date | None = None,
+    sex: str | None = None,
+    timezone: str | tzinfo | None = None,
+) -> GrowthHistory:
+    """Build a GrowthHistory from health entries.
+
+    Args:
+        entries: Entries as returned by get_health_entries with ``extra_fields=UNIT_FIELDS``
+            ("start", "weight"/"height"/"head" and their units fields); entries
+            without any measurement are dropped.
+        birthday: Birth date (ChildData.birthday, "YYYY-MM-DD"); ages count from its midnight.
+        sex: ChildData.gender; "boy" and "girl" select the reference tables.
+        timezone: Zone of the birthday's midnight (default UTC).
+
+    Returns:
+        GrowthHistory sorted by start
+    """
+    require_numpy()
+    columns = {measure: _normalized(entries, measure) for measure in MEASURE_UNITS}
+    start = np.fromiter((entry.get("start") or 0.0 for entry in entries), dtype=np.float64, count=len(entries))
+    keep = ~np.all(np.isnan(np.stack(list(columns.values()))), axis=0) if len(entries) else np.zeros(0, bool)
+    order = np.argsort(start[keep], kind="stable")
+    start = start[keep][order]
+    born = _birth_timestamp(birthday, timezone)
+    return GrowthHistory(
+        start=start,
+        age_days=(start - born) / DAY_SECONDS if born is not None else np.full(len(start), np.nan),
+        weight_kg=columns["weight"][keep][order],
+        height_cm=columns["height"][keep][order],
+        head_cm=columns["head"][keep][order],
+        sex=sex,
+    )
+
+
+def z_scores(measure: Measure, sex: str | None, age_days: Any, values: Any) -> npt.NDArray[Any]:
+    """LMS z-scores of normalized ``values`` at ``age_days``; NaN outside the reference ages or for other sexes."""
+    require_numpy()
+    values = np.asarray(values, dtype=np.float64)
+    lms = _lms_at(measure, sex, np.asarray(age_days, dtype=np.float64))
+    if lms is None:
+        return np.full(np.broadcast(values, np.asarray(age_days)).shape, np.nan)
+    power, median, variation = lms
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_ratio = np.log(values / median)
+        nonzero = np.where(power == 0, 1.0, power)
+        return np.where(power == 0, log_ratio / variation,
+                        (np.exp(nonzero * log_ratio) - 1) / (nonzero * variation))
+
+
+def reference_values(measure: Measure, sex: str | None, age_days: Any, z: Any = 0.0) -> npt.NDArray[Any]:
+    """Reference ``measure`` at ``age_days`` for z-score ``z`` (0 is the median), e.g. for chart curves."""
+    require_numpy()
+    z = np.asarray(z, dtype=np.float64)
+    lms = _lms_at(measure, sex, np.asarray(age_days, dtype=np.float64))
+    if lms is None:
+        return np.full(np.broadcast(z, np.asarray(age_days)).shape, np.nan)
+    power, median, variation = lms
+    with np.errstate(invalid="ignore"):
+        nonzero = np.where(power == 0, 1.0, power)
+        return np.where(power == 0, median * np.exp(variation * z),
+                        median * (1 + nonzero * variation * z) ** (1 / nonzero))
+
+
+def percentiles(z: Any) -> npt.NDArray[Any]:
+    """Percentiles (0-100) of z-scores under the standard normal distribution."""
+    require_numpy()
+    z = np.asarray(z, dtype=np.float64)
+    # Abramowitz & Stegun 7.1.26 (absolute error below 1.5e-7)
+    x = np.abs(z) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = ((((1.061405429 * t - 1.453152027) * t + 1.421413741) * t - 0.284496736) * t + 0.254829592) * t
+    erf = 1.0 - poly * np.exp(-x * x)
+    return 50.0 * (1.0 + np.sign(z) * erf)
+
+
+def _normalized(entries: Sequence[Mapping[str, Any]], measure: Measure) -> npt.NDArray[Any]:
+    """Values of ``measure`` in kg or cm; NaN when missing or in unknown units."""
+    units_field, factors, default_units = MEASURE_UNITS[measure]
+    return np.fromiter(
+        (
+            np.nan if (value := entry.get(measure)) is None
+            else value * factors.get(entry.get(units_field) or default_units, np.nan)
+            for entry in entries
+        ),
+        dtype=np.float64, count=len(entries),
+    )
+
+
+def _birth_timestamp(birthday: str | date | None, timezone: str | tzinfo | None) -> float | None:
+    if not birthday:
+        return None
+    day = date.fromisoformat(birthday) if isinstance(birthday, str) else birthday
+    zone = ZoneInfo(timezone) if isinstance(timezone, str) else timezone or ZoneInfo("UTC")
+    return datetime.combine(day, time(), tzinfo=zone).timestamp()
+
+
+@functools.lru_cache(maxsize=None)
+def _lms_table(measure: Measure, sex: str) -> npt.NDArray[Any] | None:
+    table = LMS_TABLES.get((measure, sex))  # type: ignore[call-overload]
+    return None if table is None else np.array(table, dtype=np.float64)
+
+
+def _lms_at(measure: Measure, sex: str | None, age_days: npt.NDArray[Any]
+            ) -> tuple[npt.NDArray[Any], npt.NDArray[Any], npt.NDArray[Any]] | None:
+    """L, M and S interpolated between whole months; NaN outside the table's ages."""
+    table = _lms_table(measure, sex) if sex else None
+    if table is None:
+        return None
+    months = age_days / DAYS_PER_MONTH
+    grid = np.arange(len(table), dtype=np.float64)
+    power, median, variation = (np.interp(months, grid, table[:, column], left=np.nan, right=np.nan)
+                                for column in range(3))
+    return power, median, variation
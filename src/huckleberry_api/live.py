@@ -0,0 +1,106 @@
+"""Live interval history over a sliding time window.
+
+``HuckleberryAPI.setup_interval_listener`` keeps the entries of one tracker
+current without re-querying: two query listeners on the tracker's history
+subcollection (regular documents from the window start on, and multi-entry
+batch documents) feed their results into an IntervalWindow, which re-decodes
+only the documents whose update time changed:
+
+    window = api.setup_interval_listener(child_uid, "sleep", window=7 * 86400,
+                                         callback=lambda window: redraw(window.records()))
+
+Entries edited or deleted in the phone app show up on the next snapshot.
+``records()`` always applies the current window start, so entries age out
+even between snapshots; the query bound itself moves on when the listeners
+are recreated (on token refresh).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Iterable, Literal
+
+from .records import IntervalRecord, decode_snapshots
+
+_LOGGER = logging.getLogger(__name__)
+
+# Query feeding a window: regular interval documents or multi-entry batch documents
+WindowSource = Literal["intervals", "batches"]
+
+
+class IntervalWindow:
+    """Decoded entries of one tracker within a sliding window, maintained from query snapshots."""
+
+    def __init__(self, collection: str, child_uid: str, window: float,
+                 callback: Callable[[IntervalWindow], None] | None = None) -> None:
+        """Initialize an empty window.
+
+        Args:
+            collection: Tracker ("sleep", "feed", "diaper" or "health").
+            child_uid: Child unique identifier.
+            window: Seconds of history to keep, ending now.
+            callback: Called with the window after every applied snapshot.
+        """
+        self.collection = collection
+        self.child_uid = child_uid
+        self.window = window
+        self.callback = callback
+        self.version = 0  # incremented per applied snapshot
+        self._lock = threading.Lock()
+        self._documents: dict[tuple[WindowSource, str], list[IntervalRecord]] = {}
+        self._update_times: dict[tuple[WindowSource, str], Any] = {}
+
+    @property
+    def start_timestamp(self) -> float:
+        """Current start of the window (Unix timestamp in seconds)."""
+        return time.time() - self.window
+
+    def records(self, start_timestamp: float | None = None, end_timestamp: float | None = None
+                ) -> list[IntervalRecord]:
+        """Entries in the window (optionally narrowed to a range), in start order."""
+        lower = self.start_timestamp if start_timestamp is None else max(start_timestamp, self.start_timestamp)
+        with self._lock:
+            records = [
+                record for records in self._documents.values() for record in records
+                if record.start_sec >= lower and (end_timestamp is None or record.start_sec < end_timestamp)
+            ]
+        records.sort(key=lambda record: record.start_sec)
+        return records
+
+    def __len__(self) -> int:
+        return len(self.records())
+
+    def apply(self, source: WindowSource, snapshots: Iterable[Any]) -> None:
+        """Apply one query snapshot: all documents currently matching the ``source`` query.
+
+        Every snapshot replaces what was received from ``source`` before, so a
+        snapshot that was never applied (a dispatcher coalesced or dropped it)
+        loses nothing. Documents with an unchanged update time keep their
+        decoded entries.
+        """
+        start = self.start_timestamp
+        with self._lock:
+            current = set()
+            for snapshot in snapshots:
+                key = (source, snapshot.id)
+                current.add(key)
+                update_time = getattr(snapshot, "update_time", None)
+                if key not in self._documents or update_time is None or self._update_times.get(key) != update_time:
+                    self._documents[key] = self._decode(snapshot, source, start)
+                    self._update_times[key] = update_time
+            for key in [key for key in self._documents if key[0] == source and key not in current]:
+                del self._documents[key]
+                self._update_times.pop(key, None)
+            self.version += 1
+        if self.callback is not None:
+            try:
+                self.callback(self)
+            except Exception as err:
+                _LOGGER.error("Interval window callback failed: %s", err)
+
+    def _decode(self, snapshot: Any, source: WindowSource, start: float) -> list[IntervalRecord]:
+        # Regular documents are range-filtered by their query; batch entries are filtered here
+        if source == "batches":
+            return decode_snapshots(self.collection, [snapshot], start)
+        return decode_snapshots(self.collection, [snapshot], expand_multi=False)
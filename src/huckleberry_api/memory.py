@@ -0,0 +1,748 @@
+"""In-memory Firestore stand-in backend.
+
+Implements the subset of the Firestore client API used by HuckleberryAPI on
+top of plain dictionaries, so the whole API can be exercised and benchmarked
+without credentials or a network:
+
+    backend = MemoryBackend(latency=0.005)
+    api = HuckleberryAPI(email, password, timezone="UTC", backend=backend)
+
+Supported: documents and subcollections, ``set`` (with ``merge``), dotted
+field-path ``update``, ``DELETE_FIELD``, ``where``/``order_by``/``limit``
+queries, and document and query snapshot listeners. Listener callbacks run
+synchronously on the writing thread after the write is applied.
+"""
+from __future__ import annotations
+
+import copy
+import itertools
+import json
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator
+
+_LOGGER = logging.getLogger(__name__)
+
+DESCENDING = "DESCENDING"
+ASCENDING = "ASCENDING"
+
+
+class _Sentinel:
+    """Marker value with a readable repr."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __repr__(self) -> str:
+        return f"Sentinel: {self._name}"
+
+
+DELETE_FIELD = _Sentinel("DELETE_FIELD")
+
+
+class DocumentNotFoundError(LookupError):
+    """Raised by ``update()`` when the target document does not exist."""
+
+
+@dataclass(frozen=True)
+class FieldFilter:
+    """Field filter for ``where(filter=...)``, mirroring firestore.FieldFilter."""
+
+    field_path: str
+    op_string: str
+    value: Any
+
+
+_MISSING = object()
+
+
+def _get_field(data: dict[str, Any], field_path: str) -> Any:
+    """Return the value at a dotted field path, or _MISSING."""
+    value: Any = data
+    for part in field_path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set_field(data: dict[str, Any], field_path: str, value: Any) -> None:
+    """Set (or delete, for DELETE_FIELD) the value at a dotted field path."""
+    parts = field_path.split(".")
+    target = data
+    for part in parts[:-1]:
+        child = target.get(part)
+        if not isinstance(child, dict):
+            if value is DELETE_FIELD:
+                return
+            child = {}
+            target[part] = child
+        target = child
+    if value is DELETE_FIELD:
+        target.pop(parts[-1], None)
+    else:
+        target[parts[-1]] = copy.deepcopy(value)
+
+
+def _project(data: dict[str, Any], field_paths: Iterable[str]) -> dict[str, Any]:
+    """Copy only the given dotted field paths of document data, like a Firestore field mask."""
+    projected: dict[str, Any] = {}
+    for field_path in field_paths:
+        value = _get_field(data, field_path)
+        if value is not _MISSING:
+            _set_field(projected, field_path, value)
+    return projected
+
+
+def _merge(target: dict[str, Any], data: dict[str, Any]) -> None:
+    """Deep-merge ``data`` into ``target`` with set(merge=True) semantics."""
+    for key, value in data.items():
+        if value is DELETE_FIELD:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = _strip_sentinels(value)
+
+
+def _strip_sentinels(value: Any) -> Any:
+    """Deep-copy a value, dropping DELETE_FIELD entries in nested maps."""
+    if isinstance(value, dict):
+        return {k: _strip_sentinels(v) for k, v in value.items() if v is not DELETE_FIELD}
+    return copy.deepcopy(value)
+
+
+def _matches(data: dict[str, Any], flt: Any) -> bool:
+    """Evaluate a field filter (this module's or firestore.FieldFilter) against document data."""
+    value = _get_field(data, flt.field_path)
+    op = flt.op_string
+    expected = flt.value
+    if value is _MISSING:
+        return False
+    try:
+        if op == "==":
+            return value == expected
+        if op == "!=":
+            return value != expected and value is not None
+        if op == "<":
+            return value < expected
+        if op == "<=":
+            return value <= expected
+        if op == ">":
+            return value > expected
+        if op == ">=":
+            return value >= expected
+        if op == "in":
+            return value in expected
+        if op == "not-in":
+            return value not in expected and value is not None
+        if op == "array-contains":
+            return isinstance(value, list) and expected in value
+        if op == "array-contains-any":
+            return isinstance(value, list) and any(item in value for item in expected)
+    except TypeError:
+        # Firestore only compares values of the same type
+        return False
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+
+@dataclass
+class MemoryStats:
+    """Operation counters of a MemoryBackend, in Firestore billing units.
+
+    Queries bill one read per returned document and at least one read.
+    Byte counts are JSON-encoded sizes and are only collected when the backend
+    was created with ``measure_bytes=True``.
+    """
+
+    rpcs: int = 0
+    reads: int = 0
+    writes: int = 0
+    deletes: int = 0
+    listener_reads: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+
+@dataclass
+class _StoredDocument:
+    data: dict[str, Any]
+    create_time: datetime
+    update_time: datetime
+
+
+class MemoryDocumentSnapshot:
+    """Snapshot of a document, mirroring firestore.DocumentSnapshot."""
+
+    def __init__(self, reference: MemoryDocumentReference, data: dict[str, Any] | None,
+                 create_time: datetime | None, update_time: datetime | None, read_time: datetime) -> None:
+        self.reference = reference
+        self._data = data
+        self.create_time = create_time
+        self.update_time = update_time
+        self.read_time = read_time
+
+    @property
+    def exists(self) -> bool:
+        """Whether the document exists."""
+        return self._data is not None
+
+    @property
+    def id(self) -> str:
+        """Document ID."""
+        return self.reference.id
+
+    def to_dict(self) -> dict[str, Any] | None:
+        """Return a copy of the document data, or None if it does not exist."""
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field_path: str) -> Any:
+        """Return the value at a dotted field path."""
+        if self._data is None:
+            raise KeyError(field_path)
+        value = _get_field(self._data, field_path)
+        if value is _MISSING:
+            raise KeyError(field_path)
+        return copy.deepcopy(value)
+
+
+class ChangeType(Enum):
+    """Kind of a query result change, mirroring firestore watch.ChangeType."""
+
+    ADDED = 1
+    REMOVED = 2
+    MODIFIED = 3
+
+
+@dataclass(frozen=True)
+class MemoryDocumentChange:
+    """One changed query result, mirroring firestore.DocumentChange."""
+
+    type: ChangeType
+    document: MemoryDocumentSnapshot
+    old_index: int  # position in the previous results, -1 if added
+    new_index: int  # position in the new results, -1 if removed
+
+
+class MemoryWatch:
+    """Handle returned by ``on_snapshot``."""
+
+    def __init__(self, unsubscribe: Callable[[], None]) -> None:
+        self._unsubscribe = unsubscribe
+
+    def unsubscribe(self) -> None:
+        """Stop delivering snapshots."""
+        self._unsubscribe()
+
+
+class MemoryQuery:
+    """Query over a collection, mirroring firestore.Query."""
+
+    def __init__(self, backend: MemoryBackend, collection_path: str, filters: tuple[Any, ...] = (),
+                 orders: tuple[tuple[str, str], ...] = (), limit_count: int | None = None,
+                 projection: tuple[str, ...] | None = None) -> None:
+        self._backend = backend
+        self._collection_path = collection_path
+        self._filters = filters
+        self._orders = orders
+        self._limit = limit_count
+        self._projection = projection
+
+    def _copy(self, **changes: Any) -> MemoryQuery:
+        params = {
+            "filters": self._filters,
+            "orders": self._orders,
+            "limit_count": self._limit,
+            "projection": self._projection,
+        }
+        params.update(changes)
+        return MemoryQuery(self._backend, self._collection_path, **params)
+
+    def where(self, field_path: str | None = None, op_string: str | None = None, value: Any = None, *,
+              filter: Any = None) -> MemoryQuery:
+        """Add a field filter."""
+        if filter is None:
+            if field_path is None or op_string is None:
+                raise ValueError("where() requires a filter or field_path/op_string/value")
+            filter = FieldFilter(field_path, op_string, value)
+        return self._copy(filters=self._filters + (filter,))
+
+    def order_by(self, field_path: str, direction: str = ASCENDING) -> MemoryQuery:
+        """Add an ordering."""
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count: int) -> MemoryQuery:
+        """Limit the number of results."""
+        return self._copy(limit_count=count)
+
+    def select(self, field_paths: Iterable[str]) -> MemoryQuery:
+        """Return only the given field paths of each matching document."""
+        return self._copy(projection=tuple(field_paths))
+
+    def _run(self) -> list[tuple[str, _StoredDocument]]:
+        """Evaluate the query against the current store."""
+        docs = self._backend._collection_items(self._collection_path)
+        results = [
+            (doc_id, stored) for doc_id, stored in docs
+            if all(_matches(stored.data, flt) for flt in self._filters)
+        ]
+        # Documents missing an order_by field are excluded, as in Firestore
+        for field_path, _ in self._orders:
+            results = [item for item in results if _get_field(item[1].data, field_path) is not _MISSING]
+        for field_path, direction in reversed(self._orders):
+            results.sort(key=lambda item, fp=field_path: _get_field(item[1].data, fp),
+                         reverse=direction == DESCENDING)
+        if self._limit is not None:
+            results = results[:self._limit]
+        return results
+
+    def stream(self, transaction: Any = None, retry: Any = None, timeout: float | None = None
+               ) -> Iterator[MemoryDocumentSnapshot]:
+        """Run the query and yield matching document snapshots."""
+        self._backend._start_rpc()
+        with self._backend._lock:
+            snapshots = self._snapshots(self._backend._now())
+        self._backend._count(
+            reads=max(1, len(snapshots)),
+            bytes_read=sum(self._backend._size(snapshot._data) for snapshot in snapshots),
+        )
+        if self._backend.document_latency > 0:
+            time.sleep(self._backend.document_latency * len(snapshots))
+        yield from snapshots
+
+    def get(self, transaction: Any = None, retry: Any = None, timeout: float | None = None
+            ) -> list[MemoryDocumentSnapshot]:
+        """Run the query and return matching document snapshots."""
+        return list(self.stream())
+
+    def on_snapshot(self, callback: Callable[[list[MemoryDocumentSnapshot], list[MemoryDocumentChange], datetime],
+                                             None]) -> MemoryWatch:
+        """Watch the query; the callback receives all results with the changes since the last call."""
+        return self._backend._watch_query(self, callback)
+
+    def _snapshots(self, read_time: datetime) -> list[MemoryDocumentSnapshot]:
+        """Current results as snapshots (the caller holds the backend lock)."""
+        return [
+            MemoryDocumentSnapshot(
+                MemoryDocumentReference(self._backend, f"{self._collection_path}/{doc_id}"),
+                copy.deepcopy(stored.data) if self._projection is None
+                else _project(stored.data, self._projection),
+                stored.create_time, stored.update_time, read_time,
+            )
+            for doc_id, stored in self._run()
+        ]
+
+    def count(self, alias: str | None = None) -> MemoryAggregationQuery:
+        """Count matching documents."""
+        return MemoryAggregationQuery(self).count(alias)
+
+    def sum(self, field_ref: str, alias: str | None = None) -> MemoryAggregationQuery:
+        """Sum a numeric field over matching documents."""
+        return MemoryAggregationQuery(self).sum(field_ref, alias)
+
+    def avg(self, field_ref: str, alias: str | None = None) -> MemoryAggregationQuery:
+        """Average a numeric field over matching documents."""
+        return MemoryAggregationQuery(self).avg(field_ref, alias)
+
+
+@dataclass(frozen=True)
+class MemoryAggregationResult:
+    """One aggregation value, mirroring firestore AggregationResult."""
+
+    alias: str
+    value: Any
+    read_time: datetime | None = None
+
+
+class MemoryAggregationQuery:
+    """Aggregation over a query, mirroring firestore.AggregationQuery.
+
+    Billed like Firestore: one read per started batch of 1000 matching documents.
+    """
+
+    def __init__(self, query: MemoryQuery) -> None:
+        self._query = query
+        self._aggregations: list[tuple[str, str | None, str]] = []
+
+    def _add(self, kind: str, field_ref: str | None, alias: str | None) -> MemoryAggregationQuery:
+        self._aggregations.append((kind, field_ref, alias or f"field_{len(self._aggregations) + 1}"))
+        return self
+
+    def count(self, alias: str | None = None) -> MemoryAggregationQuery:
+        """Add a count aggregation."""
+        return self._add("count", None, alias)
+
+    def sum(self, field_ref: str, alias: str | None = None) -> MemoryAggregationQuery:
+        """Add a sum aggregation."""
+        return self._add("sum", field_ref, alias)
+
+    def avg(self, field_ref: str, alias: str | None = None) -> MemoryAggregationQuery:
+        """Add an average aggregation."""
+        return self._add("avg", field_ref, alias)
+
+    def get(self, transaction: Any = None, retry: Any = None, timeout: float | None = None
+            ) -> list[list[MemoryAggregationResult]]:
+        """Run the aggregation and return one result row."""
+        backend = self._query._backend
+        backend._start_rpc()
+        with backend._lock:
+            docs = [stored.data for _, stored in self._query._run()]
+            read_time = backend._now()
+        results = []
+        for kind, field_ref, alias in self._aggregations:
+            if kind == "count":
+                value: Any = len(docs)
+            else:
+                values = [
+                    value for value in (_get_field(data, field_ref) for data in docs)
+                    if isinstance(value, (int, float)) and not isinstance(value, bool)
+                ]
+                if kind == "sum":
+                    value = sum(values)
+                else:
+                    value = sum(values) / len(values) if values else None
+            results.append(MemoryAggregationResult(alias, value, read_time))
+        backend._count(reads=max(1, -(-len(docs) // 1000)))
+        return [results]
+
+
+class MemoryCollectionReference(MemoryQuery):
+    """Collection reference, mirroring firestore.CollectionReference."""
+
+    def __init__(self, backend: MemoryBackend, path: str) -> None:
+        super().__init__(backend, path)
+        self._path = path
+
+    @property
+    def id(self) -> str:
+        """Collection ID."""
+        return self._path.rsplit("/", 1)[-1]
+
+    @property
+    def path(self) -> str:
+        """Slash-separated collection path."""
+        return self._path
+
+    def document(self, document_id: str | None = None) -> MemoryDocumentReference:
+        """Return a reference to a document in this collection (auto-ID if omitted)."""
+        if document_id is None:
+            document_id = uuid.uuid4().hex[:20]
+        return MemoryDocumentReference(self._backend, f"{self._path}/{document_id}")
+
+    def list_documents(self) -> list[MemoryDocumentReference]:
+        """Return references to all documents in this collection."""
+        return [self.document(doc_id) for doc_id, _ in self._backend._collection_items(self._path)]
+
+
+class MemoryDocumentReference:
+    """Document reference, mirroring firestore.DocumentReference."""
+
+    def __init__(self, backend: MemoryBackend, path: str) -> None:
+        self._backend = backend
+        self.path = path
+
+    @property
+    def id(self) -> str:
+        """Document ID."""
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def parent(self) -> MemoryCollectionReference:
+        """The collection containing this document."""
+        return MemoryCollectionReference(self._backend, self.path.rsplit("/", 1)[0])
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, MemoryDocumentReference) and other.path == self.path
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    def collection(self, collection_id: str) -> MemoryCollectionReference:
+        """Return a subcollection of this document."""
+        return MemoryCollectionReference(self._backend, f"{self.path}/{collection_id}")
+
+    def get(self, field_paths: Any = None, transaction: Any = None, retry: Any = None,
+            timeout: float | None = None) -> MemoryDocumentSnapshot:
+        """Read the document (only the given field paths, if any)."""
+        self._backend._start_rpc()
+        snapshot = self._backend._snapshot(self.path)
+        if field_paths is not None and snapshot._data is not None:
+            snapshot._data = _project(snapshot._data, field_paths)
+        self._backend._count(reads=1, bytes_read=self._backend._size(snapshot._data))
+        return snapshot
+
+    def set(self, document_data: dict[str, Any], merge: bool = False, retry: Any = None,
+            timeout: float | None = None) -> None:
+        """Create or overwrite the document (or merge into it with ``merge=True``)."""
+        self._backend._start_rpc()
+        self._backend._count(writes=1, bytes_written=self._backend._size(document_data))
+
+        def apply(current: dict[str, Any] | None) -> dict[str, Any]:
+            if merge and current is not None:
+                _merge(current, document_data)
+                return current
+            return _strip_sentinels(document_data)
+
+        self._backend._write(self.path, apply)
+
+    def update(self, field_updates: dict[str, Any], option: Any = None, retry: Any = None,
+               timeout: float | None = None) -> None:
+        """Update fields by dotted field path. The document must exist."""
+        self._backend._start_rpc()
+        self._backend._count(writes=1, bytes_written=self._backend._size(field_updates))
+
+        def apply(current: dict[str, Any] | None) -> dict[str, Any]:
+            if current is None:
+                raise DocumentNotFoundError(f"No document to update: {self.path}")
+            for field_path, value in field_updates.items():
+                _set_field(current, field_path, value)
+            return current
+
+        self._backend._write(self.path, apply)
+
+    def delete(self, option: Any = None, retry: Any = None, timeout: float | None = None) -> None:
+        """Delete the document (subcollections are kept, as in Firestore)."""
+        self._backend._start_rpc()
+        self._backend._count(deletes=1)
+        self._backend._write(self.path, lambda current: None)
+
+    def on_snapshot(self, callback: Callable[[list[MemoryDocumentSnapshot], list[Any], datetime], None]
+                    ) -> MemoryWatch:
+        """Watch the document; the callback receives the initial state, then every change."""
+        return self._backend._watch_document(self.path, callback)
+
+
+class MemoryClient:
+    """Client handle bound to a MemoryBackend, mirroring firestore.Client."""
+
+    def __init__(self, backend: MemoryBackend) -> None:
+        self._backend = backend
+
+    def collection(self, collection_path: str) -> MemoryCollectionReference:
+        """Return a collection reference (nested paths like 'sleep/uid/intervals' are allowed)."""
+        return MemoryCollectionReference(self._backend, collection_path)
+
+    def document(self, document_path: str) -> MemoryDocumentReference:
+        """Return a document reference by slash-separated path."""
+        return MemoryDocumentReference(self._backend, document_path)
+
+    def get_all(self, references: Iterable[MemoryDocumentReference], field_paths: Any = None,
+                transaction: Any = None, retry: Any = None, timeout: float | None = None
+                ) -> Iterator[MemoryDocumentSnapshot]:
+        """Read several documents in one RPC (billed one read per document, as in Firestore)."""
+        references = list(references)
+        self._backend._start_rpc()
+        snapshots = []
+        for reference in references:
+            snapshot = self._backend._snapshot(reference.path)
+            if field_paths is not None and snapshot._data is not None:
+                snapshot._data = _project(snapshot._data, field_paths)
+            snapshots.append(snapshot)
+        self._backend._count(reads=len(snapshots),
+                             bytes_read=sum(self._backend._size(snapshot._data) for snapshot in snapshots))
+        yield from snapshots
+
+    def close(self) -> None:
+        """No-op; present for API compatibility."""
+
+
+class MemoryBackend:
+    """Storage backend keeping all documents in process memory.
+
+    One backend holds one shared store; every client created from it (for any
+    token or account) sees the same data, like clients of one Firestore project.
+    """
+
+    def __init__(self, latency: float = 0.0, measure_bytes: bool = False, document_latency: float = 0.0) -> None:
+        """Initialize an empty store.
+
+        Args:
+            latency: Seconds to sleep per RPC, to approximate network round trips.
+            measure_bytes: Also count JSON-encoded payload sizes in ``stats``.
+            document_latency: Seconds to sleep per document a query streams, to
+                approximate the throughput of one stream.
+        """
+        self.latency = latency
+        self.document_latency = document_latency
+        self.measure_bytes = measure_bytes
+        self.stats = MemoryStats()
+        self._stats_lock = threading.Lock()
+        self._lock = threading.RLock()
+        self._collections: dict[str, dict[str, _StoredDocument]] = {}
+        self._watchers: dict[str, dict[int, Callable[..., None]]] = {}
+        self._query_watchers: dict[str, dict[int, _QueryWatch]] = {}
+        self._watch_ids = itertools.count(1)
+        self._last_time = datetime.now(timezone.utc)
+
+    @property
+    def delete_field(self) -> Any:
+        """DELETE_FIELD sentinel understood by this backend."""
+        return DELETE_FIELD
+
+    def warm_up(self) -> None:
+        """No-op; the store needs no connection."""
+
+    def create_client(self, id_token: str) -> MemoryClient:
+        """Create a client; the token is accepted without validation."""
+        return MemoryClient(self)
+
+    def field_filter(self, field_path: str, op_string: str, value: Any) -> FieldFilter:
+        """Build a field filter."""
+        return FieldFilter(field_path, op_string, value)
+
+    def retry_policy(self, call: Any) -> None:
+        """In-memory RPCs never fail transiently, so no retry policy is used."""
+        return None
+
+    def reset_stats(self) -> MemoryStats:
+        """Reset the operation counters, returning the previous values."""
+        with self._stats_lock:
+            previous, self.stats = self.stats, MemoryStats()
+        return previous
+
+    def _start_rpc(self) -> None:
+        """Count one RPC and apply the injected latency."""
+        self._count(rpcs=1)
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def _count(self, **counters: int) -> None:
+        with self._stats_lock:
+            for name, value in counters.items():
+                setattr(self.stats, name, getattr(self.stats, name) + value)
+
+    def _size(self, value: Any) -> int:
+        """JSON-encoded size of a payload, or 0 unless measure_bytes is enabled."""
+        if not self.measure_bytes or value is None:
+            return 0
+        return len(json.dumps(value, default=repr, separators=(",", ":")))
+
+    def _now(self) -> datetime:
+        """Return a strictly increasing timestamp (used as update_time/read_time)."""
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            if now <= self._last_time:
+                now = self._last_time + timedelta(microseconds=1)
+            self._last_time = now
+            return now
+
+    def _collection_items(self, collection_path: str) -> list[tuple[str, _StoredDocument]]:
+        with self._lock:
+            return sorted(self._collections.get(collection_path, {}).items())
+
+    def _snapshot(self, path: str) -> MemoryDocumentSnapshot:
+        collection_path, doc_id = path.rsplit("/", 1)
+        with self._lock:
+            stored = self._collections.get(collection_path, {}).get(doc_id)
+            reference = MemoryDocumentReference(self, path)
+            if stored is None:
+                return MemoryDocumentSnapshot(reference, None, None, None, self._now())
+            return MemoryDocumentSnapshot(reference, copy.deepcopy(stored.data), stored.create_time,
+                                          stored.update_time, self._now())
+
+    def _write(self, path: str, apply: Callable[[dict[str, Any] | None], dict[str, Any] | None]) -> None:
+        """Apply a write to one document and notify its watchers."""
+        collection_path, doc_id = path.rsplit("/", 1)
+        with self._lock:
+            documents = self._collections.setdefault(collection_path, {})
+            stored = documents.get(doc_id)
+            current = copy.deepcopy(stored.data) if stored else None
+            new_data = apply(current)
+            now = self._now()
+            if new_data is None:
+                documents.pop(doc_id, None)
+            elif stored is None:
+                documents[doc_id] = _StoredDocument(new_data, now, now)
+            else:
+                stored.data = new_data
+                stored.update_time = now
+            watchers = list(self._watchers.get(path, {}).values())
+            query_updates = [
+                (watch.callback, *watch.refresh(self._now()))
+                for watch in list(self._query_watchers.get(collection_path, {}).values())
+            ]
+        if watchers:
+            snapshot = self._snapshot(path)
+            for callback in watchers:
+                self._deliver(callback, [snapshot], snapshot.read_time)
+        for callback, snapshots, changes, read_time in query_updates:
+            if changes:
+                self._deliver(callback, snapshots, read_time, changes)
+
+    def _watch_document(self, path: str, callback: Callable[..., None]) -> MemoryWatch:
+        watch_id = next(self._watch_ids)
+        with self._lock:
+            self._watchers.setdefault(path, {})[watch_id] = callback
+        snapshot = self._snapshot(path)
+        self._deliver(callback, [snapshot], snapshot.read_time)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._watchers.get(path, {}).pop(watch_id, None)
+
+        return MemoryWatch(unsubscribe)
+
+    def _watch_query(self, query: MemoryQuery, callback: Callable[..., None]) -> MemoryWatch:
+        watch_id = next(self._watch_ids)
+        watch = _QueryWatch(query, callback)
+        with self._lock:
+            self._query_watchers.setdefault(query._collection_path, {})[watch_id] = watch
+            snapshots, changes, read_time = watch.refresh(self._now())
+        self._deliver(callback, snapshots, read_time, changes)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._query_watchers.get(query._collection_path, {}).pop(watch_id, None)
+
+        return MemoryWatch(unsubscribe)
+
+    def _deliver(self, callback: Callable[..., None], snapshots: list[Any], read_time: datetime,
+                 changes: list[MemoryDocumentChange] | None = None) -> None:
+        # Query listeners are billed per changed document (at least one read per snapshot)
+        billed = snapshots if changes is None else [change.document for change in changes]
+        self._count(
+            listener_reads=max(1, len(billed)) if changes is not None else len(billed),
+            bytes_read=sum(self._size(snapshot._data) for snapshot in billed),
+        )
+        try:
+            callback(snapshots, changes if changes is not None else [], read_time)
+        except Exception as err:
+            # Firestore watch threads log and swallow callback errors as well
+            _LOGGER.error("Snapshot listener callback failed: %s", err)
+
+
+class _QueryWatch:
+    """Query listener state: the result versions last delivered."""
+
+    def __init__(self, query: MemoryQuery, callback: Callable[..., None]) -> None:
+        self.query = query
+        self.callback = callback
+        self._versions: dict[str, tuple[int, datetime | None]] = {}  # path -> (index, update_time)
+
+    def refresh(self, read_time: datetime
+                ) -> tuple[list[MemoryDocumentSnapshot], list[MemoryDocumentChange], datetime]:
+        """Re-run the query and diff it against the last results (the caller holds the backend lock)."""
+        snapshots = self.query._snapshots(read_time)
+        versions = {
+            snapshot.reference.path: (index, snapshot.update_time) for index, snapshot in enumerate(snapshots)
+        }
+        changes = [
+            MemoryDocumentChange(ChangeType.REMOVED, MemoryDocumentSnapshot(
+                MemoryDocumentReference(self.query._backend, path), None, None, None, read_time), index, -1)
+            for path, (index, _) in self._versions.items() if path not in versions
+        ]
+        for snapshot in snapshots:
+            path = snapshot.reference.path
+            new_index = versions[path][0]
+            if path not in self._versions:
+                changes.append(MemoryDocumentChange(ChangeType.ADDED, snapshot, -1, new_index))
+            elif self._versions[path][1] != snapshot.update_time:
+                changes.append(MemoryDocumentChange(ChangeType.MODIFIED, snapshot, self._versions[path][0],
+                                                    new_index))
+        self._versions = versions
+        return snapshots, changes, read_time
@@ -0,0 +1,323 @@
+"""Session pool for serving many accounts from one process.
+
+A SessionPool holds one HuckleberryAPI session per account and shares the
+process-wide resources between them: one storage backend (so RestBackend's
+HTTPS connection pool and, with ``shared_poller=True``, its listener polling
+thread), one bounded worker pool, one token refresh scheduler thread and one
+set of limits on concurrent RPCs and active listeners:
+
+    pool = SessionPool(RestBackend(shared_poller=True), max_workers=8, max_listeners=5000)
+    pool.start()
+    api = pool.add("household-1", email, password, "Europe/London")
+    api.setup_realtime_listener(child_uid, on_sleep)
+
+Token refreshes are scheduled ahead of expiry with random jitter, so
+thousands of sessions do not refresh in the same second. With the default
+FirestoreBackend every session still opens its own gRPC channel and watch
+threads; use RestBackend for large pools.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping
+
+from .api import HuckleberryAPI
+
+if TYPE_CHECKING:
+    from ._instrument import RpcCall
+    from .backend import StorageBackend
+    from .costs import CostMeter
+    from .dispatch import CallbackDispatcher
+    from .ratelimit import RateLimiter
+    from .tracing import Tracer
+
+_LOGGER = logging.getLogger(__name__)
+
+# Delay before retrying a failed authentication or refresh
+REFRESH_RETRY_DELAY = 60.0
+
+
+class ListenerLimitError(RuntimeError):
+    """Raised when setting up a listener would exceed the pool's listener limit."""
+
+
+class SessionLimits:
+    """Caps on concurrent RPCs and active listeners shared by many sessions."""
+
+    def __init__(self, max_concurrent_rpcs: int | None = None, max_listeners: int | None = None) -> None:
+        """Initialize the limits.
+
+        Args:
+            max_concurrent_rpcs: RPCs allowed in flight at once; further RPCs wait.
+            max_listeners: Active listeners allowed; further listeners raise ListenerLimitError.
+        """
+        self.max_concurrent_rpcs = max_concurrent_rpcs
+        self.max_listeners = max_listeners
+        self._rpc_slots = threading.BoundedSemaphore(max_concurrent_rpcs) if max_concurrent_rpcs else None
+        self._lock = threading.Lock()
+        self._listeners: set[tuple[int, str]] = set()
+        self._rpcs_in_flight = 0
+
+    @contextmanager
+    def rpc_slot(self, call: RpcCall) -> Iterator[None]:
+        """RPC hook holding one concurrency slot for the duration of the RPC."""
+        if self._rpc_slots is not None:
+            self._rpc_slots.acquire()
+        with self._lock:
+            self._rpcs_in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._rpcs_in_flight -= 1
+            if self._rpc_slots is not None:
+                self._rpc_slots.release()
+
+    def acquire_listener(self, owner: object, key: str) -> None:
+        """Take a listener slot for ``key`` of ``owner``; taking a held slot again is a no-op."""
+        slot = (id(owner), key)
+        with self._lock:
+            if slot in self._listeners:
+                return
+            if self.max_listeners is not None and len(self._listeners) >= self.max_listeners:
+                raise ListenerLimitError(f"Listener limit of {self.max_listeners} reached")
+            self._listeners.add(slot)
+
+    def release_listener(self, owner: object, key: str) -> None:
+        """Release the listener slot for ``key`` of ``owner``."""
+        with self._lock:
+            self._listeners.discard((id(owner), key))
+
+    def release_listeners(self, owner: object) -> None:
+        """Release all listener slots of ``owner``."""
+        with self._lock:
+            self._listeners = {slot for slot in self._listeners if slot[0] != id(owner)}
+
+    @property
+    def active_listeners(self) -> int:
+        """Number of listener slots taken."""
+        return len(self._listeners)
+
+    @property
+    def rpcs_in_flight(self) -> int:
+        """Number of RPCs currently running."""
+        return self._rpcs_in_flight
+
+
+@dataclass
+class PoolStats:
+    """Counters of a SessionPool."""
+
+    sessions: int = 0
+    active_listeners: int = 0
+    rpcs_in_flight: int = 0
+    refreshes: int = 0
+    refresh_failures: int = 0
+
+
+class SessionPool:
+    """Many account sessions sharing one backend, worker pool and set of limits."""
+
+    def __init__(
+        self,
+        backend: StorageBackend | None = None,
+        max_workers: int = 8,
+        max_concurrent_rpcs: int | None = 64,
+        max_listeners: int | None = None,
+        refresh_margin: float = 600.0,
+        refresh_jitter: float = 300.0,
+        tracer: Tracer | None = None,
+        dispatcher: CallbackDispatcher | None = None,
+        rate_limiter: RateLimiter | None = None,
+        account_rates: Mapping[str, float] | None = None,
+        cost_meter: CostMeter | None = None,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            backend: Storage backend shared by all sessions (defaults to FirestoreBackend).
+            max_workers: Worker threads for token refreshes and ``submit()``.
+            max_concurrent_rpcs: RPCs allowed in flight across all sessions (None: unlimited).
+            max_listeners: Active listeners allowed across all sessions (None: unlimited).
+            refresh_margin: Refresh tokens this many seconds before they expire.
+            refresh_jitter: Refresh up to this many seconds earlier still, chosen at
+                random per session to spread refreshes out.
+            tracer: Optional tracer passed to every session.
+            dispatcher: Optional CallbackDispatcher shared by the listeners of every session.
+            rate_limiter: Optional global RateLimiter; each session added gets a child
+                limiter with ``account_rates`` (keys "reads", "writes", "auth").
+            account_rates: Per-account calls per second (ignored without ``rate_limiter``).
+            cost_meter: Optional CostMeter shared by every session, counting billed
+                operations per account and enforcing per-account budgets.
+        """
+        if backend is None:
+            from .backend import FirestoreBackend
+
+            backend = FirestoreBackend()
+        self.backend = backend
+        self.limits = SessionLimits(max_concurrent_rpcs, max_listeners)
+        self.refresh_margin = refresh_margin
+        self.refresh_jitter = refresh_jitter
+        self._tracer = tracer
+        self.dispatcher = dispatcher
+        self.rate_limiter = rate_limiter
+        self.account_rates = dict(account_rates or {})
+        self.cost_meter = cost_meter
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="huckleberry-pool")
+        self._lock = threading.Lock()
+        self._sessions: dict[str, HuckleberryAPI] = {}
+        self._schedule: list[tuple[float, int, str]] = []
+        self._due_at: dict[str, float] = {}  # current entry of each session; older heap entries are stale
+        self._sequence = itertools.count()
+        self._pending: set[str] = set()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._refreshes = 0
+        self._refresh_failures = 0
+
+    def add(self, key: str, email: str, password: str, timezone: str) -> HuckleberryAPI:
+        """Create a session for an account; it is authenticated by the refresh scheduler."""
+        rate_limiter = self.rate_limiter.child(**self.account_rates) if self.rate_limiter else None
+        api = HuckleberryAPI(email, password, timezone, tracer=self._tracer, backend=self.backend,
+                             limits=self.limits, dispatcher=self.dispatcher, rate_limiter=rate_limiter,
+                             cost_meter=self.cost_meter)
+        self.attach(key, api)
+        return api
+
+    def attach(self, key: str, api: HuckleberryAPI, due: float | None = None) -> None:
+        """Manage an existing session; its token is refreshed from ``due`` on (default: per its expiry)."""
+        with self._lock:
+            if key in self._sessions:
+                raise ValueError(f"Session {key!r} already exists")
+            self._sessions[key] = api
+            self._push(key, self._due(api) if due is None else due)
+
+    def remove(self, key: str) -> None:
+        """Stop a session's listeners and forget it."""
+        with self._lock:
+            api = self._sessions.pop(key, None)
+            self._due_at.pop(key, None)
+        if api is None:
+            return
+        api.stop_all_listeners()
+        client = api._firestore_client
+        api._firestore_client = None
+        if client is not None and hasattr(client, "close"):
+            try:
+                client.close()
+            except Exception as err:
+                _LOGGER.debug("Error closing client of session %s: %s", key, err)
+
+    def get(self, key: str) -> HuckleberryAPI:
+        """Return the session for ``key``."""
+        return self._sessions[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def keys(self) -> list[str]:
+        """Keys of all sessions."""
+        return list(self._sessions)
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future[Any]:
+        """Run work on the shared worker pool."""
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def stats(self) -> PoolStats:
+        """Current counters."""
+        with self._lock:
+            sessions, refreshes, refresh_failures = len(self._sessions), self._refreshes, self._refresh_failures
+        return PoolStats(
+            sessions=sessions,
+            active_listeners=self.limits.active_listeners,
+            rpcs_in_flight=self.limits.rpcs_in_flight,
+            refreshes=refreshes,
+            refresh_failures=refresh_failures,
+        )
+
+    def start(self) -> None:
+        """Start the refresh scheduler thread."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="huckleberry-pool-refresh", daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the scheduler, all sessions and the worker pool."""
+        self._closed = True
+        self._wake.set()
+        for key in self.keys():
+            self.remove(key)
+        self._executor.shutdown(wait=True)
+
+    def run_due_refreshes(self, now: float | None = None) -> list[Future[None]]:
+        """Submit every session whose refresh is due to the worker pool."""
+        now = time.time() if now is None else now
+        futures = []
+        with self._lock:
+            while self._schedule and self._schedule[0][0] <= now:
+                due, _, key = heapq.heappop(self._schedule)
+                if self._due_at.get(key) != due or key in self._pending:
+                    continue
+                del self._due_at[key]
+                self._pending.add(key)
+                futures.append(self._executor.submit(self._refresh, key))
+        return futures
+
+    def _due(self, api: HuckleberryAPI) -> float:
+        if not api.id_token or not api.token_expires_at:
+            return 0.0
+        return api.token_expires_at - self.refresh_margin - random.uniform(0, self.refresh_jitter)
+
+    def _push(self, key: str, due: float) -> None:
+        self._due_at[key] = due
+        heapq.heappush(self._schedule, (due, next(self._sequence), key))
+        self._wake.set()
+
+    def _refresh(self, key: str) -> None:
+        api = self._sessions.get(key)
+        if api is None:
+            with self._lock:
+                self._pending.discard(key)
+            return
+        try:
+            if api.refresh_token:
+                api.refresh_auth_token()
+            else:
+                api.authenticate()
+            refreshed = True
+            due = self._due(api)
+        except Exception as err:
+            _LOGGER.error("Refreshing session %s failed: %s", key, err)
+            refreshed = False
+            due = time.time() + REFRESH_RETRY_DELAY
+        with self._lock:
+            if refreshed:
+                self._refreshes += 1
+            else:
+                self._refresh_failures += 1
+            self._pending.discard(key)
+            if self._sessions.get(key) is api:
+                self._push(key, due)
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.clear()
+            self.run_due_refreshes()
+            with self._lock:
+                delay = self._schedule[0][0] - time.time() if self._schedule else REFRESH_RETRY_DELAY
+            if delay > 0:
+                self._wake.wait(min(delay, REFRESH_RETRY_DELAY))
@@ -0,0 +1,205 @@
+"""Client-side rate limiting of Firestore and auth calls.
+
+Token buckets with separate budgets for document reads, writes and auth
+calls keep a process below its Firestore and Identity Toolkit quotas instead
+of running into quota errors. A limiter can have a parent, so every account
+gets its own budget and all accounts together share a global one:
+
+    shared = RateLimiter(reads=200, writes=50, auth=2)
+    api = HuckleberryAPI(email, password, timezone, rate_limiter=shared.child(reads=20, writes=5))
+
+Rates are calls per second; each bucket holds ``burst_seconds`` worth of
+calls. Work run inside ``low_priority()`` (such as history sync) yields to
+interactive calls: it waits while interactive calls are waiting and leaves a
+reserve of each bucket for them. The priority is a context variable, so it
+applies to the current thread or task only.
+
+When a call still fails with a quota error after its retries, the bucket is
+emptied so the following calls back off for a refill period.
+"""
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Iterator, Literal
+
+if TYPE_CHECKING:
+    from ._instrument import RpcCall
+
+CallKind = Literal["read", "write", "auth"]
+
+# RPC operations (RpcCall.operation) that write documents; everything else reads
+WRITE_OPERATIONS: frozenset[str] = frozenset({"set", "update", "delete"})
+
+_low_priority: contextvars.ContextVar[bool] = contextvars.ContextVar("huckleberry_low_priority", default=False)
+
+
+@contextmanager
+def low_priority() -> Iterator[None]:
+    """Run the calls made in this block as background work that yields to interactive calls."""
+    token = _low_priority.set(True)
+    try:
+        yield
+    finally:
+        _low_priority.reset(token)
+
+
+def is_quota_error(err: BaseException) -> bool:
+    """Whether an error means a quota was exceeded (gRPC RESOURCE_EXHAUSTED or HTTP 429)."""
+    if type(err).__name__ == "ResourceExhausted":
+        return True
+    response = getattr(err, "response", None)
+    return getattr(response, "status_code", None) == 429
+
+
+@dataclass
+class RateLimitStats:
+    """Counters of one bucket."""
+
+    acquired: int = 0
+    throttled: int = 0  # calls that had to wait
+    wait_s: float = 0.0
+    quota_errors: int = 0
+
+
+class TokenBucket:
+    """Thread-safe token bucket with a reserve kept for interactive callers."""
+
+    def __init__(self, rate: float, burst: float, reserve: float = 0.2) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            burst: Bucket size.
+            reserve: Fraction of the bucket low-priority callers leave for interactive ones.
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.reserve = reserve * burst
+        self.stats = RateLimitStats()
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._interactive_waiting = 0
+
+    def acquire(self, tokens: float = 1.0, background: bool = False) -> float:
+        """Take ``tokens``, waiting as long as needed; returns the seconds waited."""
+        started = time.monotonic()
+        with self._cond:
+            if not background:
+                self._interactive_waiting += 1
+            try:
+                while True:
+                    self._refill()
+                    floor = min(self.reserve, self.burst - tokens) if background else 0.0
+                    blocked = background and self._interactive_waiting > 0
+                    if not blocked and self._tokens - tokens >= floor:
+                        self._tokens -= tokens
+                        break
+                    missing = max(tokens + floor - self._tokens, tokens / 10)
+                    self._cond.wait(missing / self.rate)
+            finally:
+                if not background:
+                    self._interactive_waiting -= 1
+                    self._cond.notify_all()
+            waited = time.monotonic() - started
+            self.stats.acquired += 1
+            if waited > 0.001:
+                self.stats.throttled += 1
+                self.stats.wait_s += waited
+        return waited
+
+    def drain(self) -> None:
+        """Empty the bucket, so callers back off for a refill period (after a quota error)."""
+        with self._cond:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+            self.stats.quota_errors += 1
+
+    @property
+    def available(self) -> float:
+        """Tokens currently in the bucket."""
+        with self._cond:
+            self._refill()
+            return self._tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """Token buckets for reads, writes and auth calls, optionally under a parent limiter."""
+
+    def __init__(self, reads: float | None = None, writes: float | None = None, auth: float | None = None,
+                 burst_seconds: float = 1.0, reserve: float = 0.2, parent: RateLimiter | None = None) -> None:
+        """Initialize the limiter.
+
+        Args:
+            reads: Read RPCs per second (None: unlimited).
+            writes: Write RPCs per second (None: unlimited).
+            auth: Sign-in and token refresh calls per second (None: unlimited).
+            burst_seconds: Seconds worth of calls each bucket holds.
+            reserve: Fraction of each bucket low-priority work leaves for interactive calls.
+            parent: Limiter that must also admit every call (e.g. a global budget).
+        """
+        self.parent = parent
+        self._burst_seconds = burst_seconds
+        self._reserve = reserve
+        self._buckets: dict[CallKind, TokenBucket] = {
+            kind: TokenBucket(rate, max(1.0, rate * burst_seconds), reserve)
+            for kind, rate in (("read", reads), ("write", writes), ("auth", auth)) if rate
+        }
+
+    def child(self, reads: float | None = None, writes: float | None = None, auth: float | None = None
+              ) -> RateLimiter:
+        """Create a limiter (e.g. per account) whose calls also count against this one."""
+        return RateLimiter(reads, writes, auth, self._burst_seconds, self._reserve, parent=self)
+
+    def acquire(self, kind: CallKind) -> float:
+        """Wait until a call of ``kind`` is admitted here and by the parents; returns the seconds waited."""
+        background = _low_priority.get()
+        waited = 0.0
+        limiter: RateLimiter | None = self
+        while limiter is not None:
+            bucket = limiter._buckets.get(kind)
+            if bucket is not None:
+                waited += bucket.acquire(background=background)
+            limiter = limiter.parent
+        return waited
+
+    @contextmanager
+    def limit(self, kind: CallKind) -> Iterator[None]:
+        """Admit one call of ``kind`` and back off if it fails with a quota error."""
+        self.acquire(kind)
+        try:
+            yield
+        except Exception as err:
+            if is_quota_error(err):
+                self.backoff(kind)
+            raise
+
+    @contextmanager
+    def rpc_hook(self, call: RpcCall) -> Iterator[None]:
+        """RPC hook admitting each Firestore RPC as a read or a write."""
+        with self.limit("write" if call.operation in WRITE_OPERATIONS else "read"):
+            yield
+
+    def stats(self) -> dict[CallKind, RateLimitStats]:
+        """Counters of this limiter's buckets (parents not included)."""
+        return {kind: replace(bucket.stats) for kind, bucket in self._buckets.items()}
+
+    def backoff(self, kind: CallKind) -> None:
+        """Empty the ``kind`` buckets here and in the parents after a quota error."""
+        limiter: RateLimiter | None = self
+        while limiter is not None:
+            bucket = limiter._buckets.get(kind)
+            if bucket is not None:
+                bucket.drain()
+            limiter = limiter.parent
@@ -0,0 +1,172 @@
+"""Compact record types for intervals and timer state.
+
+Opt-in alternative to the plain dicts returned by the interval getters. The
+records are frozen, slotted dataclasses, so a record holds only its field
+values (no per-instance ``__dict__``). That matters when months of history
+for many children are kept in memory. Build them directly from Firestore
+snapshots with ``decode_snapshots`` or ``HuckleberryAPI.get_interval_records``:
+
+    records = api.get_interval_records(child_uid, "sleep", start, end)
+    total = sum(record.duration_sec for record in records)
+
+Field names follow the snake_case mapping documented in ``types``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping, Union
+
+
+@dataclass(frozen=True, slots=True)
+class SleepInterval:
+    """Completed sleep (sleep/{child_uid}/intervals)."""
+
+    start_sec: float
+    duration_sec: float
+    offset_min: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class FeedInterval:
+    """Completed feeding (feed/{child_uid}/intervals)."""
+
+    start_sec: float
+    left_duration_sec: float
+    right_duration_sec: float
+    offset_min: float | None = None
+    mode: str | None = None
+    is_multi_entry: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class DiaperInterval:
+    """Diaper change (diaper/{child_uid}/intervals)."""
+
+    start_sec: float
+    mode: str
+    offset_min: float | None = None
+    poo_color: str | None = None
+    poo_consistency: str | None = None
+    amount: Any = None
+
+
+@dataclass(frozen=True, slots=True)
+class HealthEntry:
+    """Growth measurement (health/{child_uid}/data)."""
+
+    start_sec: float
+    offset_min: float | None = None
+    weight: float | None = None
+    height: float | None = None
+    head: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class SleepTimer:
+    """Sleep timer state (sleep/{child_uid} field 'timer')."""
+
+    active: bool
+    paused: bool
+    timer_start_time_ms: float | None = None
+    timer_end_time_ms: float | None = None
+    uuid: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class FeedTimer:
+    """Feed timer state (feed/{child_uid} field 'timer')."""
+
+    active: bool
+    paused: bool
+    feed_start_time_sec: float | None = None
+    timer_start_time_sec: float | None = None
+    left_duration_sec: float = 0.0
+    right_duration_sec: float = 0.0
+    active_side: str | None = None
+    last_side: str | None = None
+    uuid: str | None = None
+
+
+IntervalRecord = Union[SleepInterval, FeedInterval, DiaperInterval, HealthEntry]
+
+
+def decode_sleep_interval(data: Mapping[str, Any], is_multi_entry: bool = False) -> SleepInterval:
+    """Build a SleepInterval from an interval document or batch entry."""
+    return SleepInterval(data["start"], data.get("duration", 0), data.get("offset"))
+
+
+def decode_feed_interval(data: Mapping[str, Any], is_multi_entry: bool = False) -> FeedInterval:
+    """Build a FeedInterval from an interval document or batch entry."""
+    return FeedInterval(data["start"], data.get("leftDuration", 0), data.get("rightDuration", 0),
+                        data.get("offset"), data.get("mode"), is_multi_entry)
+
+
+def decode_diaper_interval(data: Mapping[str, Any], is_multi_entry: bool = False) -> DiaperInterval:
+    """Build a DiaperInterval from an interval document or batch entry."""
+    return DiaperInterval(data["start"], data.get("mode", "unknown"), data.get("offset"),
+                          data.get("pooColor"), data.get("pooConsistency"), data.get("amount"))
+
+
+def decode_health_entry(data: Mapping[str, Any], is_multi_entry: bool = False) -> HealthEntry:
+    """Build a HealthEntry from a data document or batch entry."""
+    return HealthEntry(data["start"], data.get("offset"), data.get("weight"), data.get("height"),
+                       data.get("head"))
+
+
+INTERVAL_DECODERS: dict[str, Callable[[Mapping[str, Any], bool], IntervalRecord]] = {
+    "sleep": decode_sleep_interval,
+    "feed": decode_feed_interval,
+    "diaper": decode_diaper_interval,
+    "health": decode_health_entry,
+}
+
+
+def decode_snapshots(collection: str, snapshots: Iterable[Any], start_timestamp: float | None = None,
+                     end_timestamp: float | None = None, expand_multi: bool = True) -> list[IntervalRecord]:
+    """Decode interval document snapshots, expanding multi-entry batch documents.
+
+    Batch entries are kept only if their start is within the optional range;
+    regular documents are expected to be range-filtered by the query. With
+    ``expand_multi=False`` batch documents are skipped.
+    """
+    decode = INTERVAL_DECODERS[collection]
+    records: list[IntervalRecord] = []
+    for snapshot in snapshots:
+        data = snapshot.to_dict()
+        if not data:
+            continue
+        if not data.get("multi"):
+            if "start" in data:
+                records.append(decode(data, False))
+            continue
+        if not expand_multi or not isinstance(data.get("data"), dict):
+            continue
+        for entry in data["data"].values():
+            if not isinstance(entry, dict) or "start" not in entry:
+                continue
+            if start_timestamp is not None and entry["start"] < start_timestamp:
+                continue
+            if end_timestamp is not None and entry["start"] >= end_timestamp:
+                continue
+            records.append(decode(entry, True))
+    return records
+
+
+def decode_sleep_timer(document: Mapping[str, Any] | None) -> SleepTimer | None:
+    """Timer state of a sleep document (e.g. as received by a listener), or None."""
+    timer = (document or {}).get("timer")
+    if not isinstance(timer, dict):
+        return None
+    return SleepTimer(bool(timer.get("active", False)), bool(timer.get("paused", False)),
+                      timer.get("timerStartTime"), timer.get("timerEndTime"), timer.get("uuid"))
+
+
+def decode_feed_timer(document: Mapping[str, Any] | None) -> FeedTimer | None:
+    """Timer state of a feed document (e.g. as received by a listener), or None."""
+    timer = (document or {}).get("timer")
+    if not isinstance(timer, dict):
+        return None
+    return FeedTimer(bool(timer.get("active", False)), bool(timer.get("paused", False)),
+                     timer.get("feedStartTime"), timer.get("timerStartTime"),
+                     timer.get("leftDuration", 0.0), timer.get("rightDuration", 0.0),
+                     timer.get("activeSide"), timer.get("lastSide"), timer.get("uuid"))
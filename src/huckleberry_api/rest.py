@@ -0,0 +1,807 @@
+"""Lightweight Firestore REST transport.
+
+``RestBackend`` implements the reads, writes, queries and snapshot listeners
+HuckleberryAPI needs over pooled HTTPS against ``FIRESTORE_BASE_URL``, using
+only ``requests``. It never imports ``google-cloud-firestore``, so gRPC and
+protobuf stay out of memory-constrained processes:
+
+    api = HuckleberryAPI(email, password, timezone="UTC", backend=RestBackend())
+
+Snapshot listeners are emulated by polling: each client runs one daemon thread
+that fetches all watched documents with a single ``batchGet`` per interval and
+delivers snapshots whose ``updateTime`` changed. Query listeners re-run their
+query (one ``runQuery`` each) per interval and deliver the added, modified and
+removed results. With ``shared_poller=True`` one thread polls for every
+client of the backend (one ``batchGet`` per client per interval), so many
+accounts do not cost one thread each.
+"""
+from __future__ import annotations
+
+import base64
+import logging
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .const import FIRESTORE_BASE_URL
+
+_LOGGER = logging.getLogger(__name__)
+
+DESCENDING = "DESCENDING"
+ASCENDING = "ASCENDING"
+
+_OPERATORS = {
+    "==": "EQUAL",
+    "!=": "NOT_EQUAL",
+    "<": "LESS_THAN",
+    "<=": "LESS_THAN_OR_EQUAL",
+    ">": "GREATER_THAN",
+    ">=": "GREATER_THAN_OR_EQUAL",
+    "in": "IN",
+    "not-in": "NOT_IN",
+    "array-contains": "ARRAY_CONTAINS",
+    "array-contains-any": "ARRAY_CONTAINS_ANY",
+}
+# Comparisons with None are sent as unary filters, as Firestore rejects null values in field filters
+_NULL_OPERATORS = {"==": "IS_NULL", "!=": "IS_NOT_NULL"}
+_SIMPLE_SEGMENT = re.compile(r"^[A-Za-z_][A-Za-z_0-9]*$")
+_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class _Sentinel:
+    """Marker value with a readable repr."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __repr__(self) -> str:
+        return f"Sentinel: {self._name}"
+
+
+DELETE_FIELD = _Sentinel("DELETE_FIELD")
+
+
+@dataclass(frozen=True)
+class FieldFilter:
+    """Field filter for ``where(filter=...)``, mirroring firestore.FieldFilter."""
+
+    field_path: str
+    op_string: str
+    value: Any
+
+
+@dataclass
+class RestRetry:
+    """Retry policy for REST calls: retries throttling and server errors with backoff."""
+
+    attempts: int = 4
+    initial: float = 0.1
+    multiplier: float = 2.0
+    on_error: Callable[[Exception], None] | None = None
+
+
+# --- Value encoding -------------------------------------------------------
+
+def encode_value(value: Any) -> dict[str, Any]:
+    """Encode a Python value as a Firestore REST ``Value``."""
+    if value is None:
+        return {"nullValue": None}
+    if isinstance(value, bool):
+        return {"booleanValue": value}
+    if isinstance(value, int):
+        return {"integerValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    if isinstance(value, bytes):
+        return {"bytesValue": base64.b64encode(value).decode()}
+    if isinstance(value, datetime):
+        return {"timestampValue": value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")}
+    if isinstance(value, dict):
+        return {"mapValue": {"fields": encode_fields(value)}}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [encode_value(item) for item in value]}}
+    raise TypeError(f"Cannot encode {type(value).__name__} as a Firestore value")
+
+
+def encode_fields(data: dict[str, Any]) -> dict[str, Any]:
+    """Encode a mapping as Firestore REST ``fields``, skipping DELETE_FIELD values."""
+    return {key: encode_value(value) for key, value in data.items() if value is not DELETE_FIELD}
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an RFC 3339 timestamp with up to nanosecond precision."""
+    match = re.match(r"^(.*?)(?:\.(\d+))?(Z|[+-]\d\d:\d\d)$", value)
+    if not match:
+        raise ValueError(f"Invalid timestamp: {value}")
+    base, fraction, zone = match.groups()
+    micros = (fraction or "0")[:6].ljust(6, "0")
+    zone = "+00:00" if zone == "Z" else zone
+    return datetime.fromisoformat(f"{base}.{micros}{zone}")
+
+
+def decode_value(value: dict[str, Any]) -> Any:
+    """Decode a Firestore REST ``Value`` into a Python value."""
+    if "nullValue" in value:
+        return None
+    if "booleanValue" in value:
+        return value["booleanValue"]
+    if "integerValue" in value:
+        return int(value["integerValue"])
+    if "doubleValue" in value:
+        return float(value["doubleValue"])
+    if "stringValue" in value:
+        return value["stringValue"]
+    if "mapValue" in value:
+        return decode_fields(value["mapValue"].get("fields", {}))
+    if "arrayValue" in value:
+        return [decode_value(item) for item in value["arrayValue"].get("values", [])]
+    if "timestampValue" in value:
+        return parse_timestamp(value["timestampValue"])
+    if "bytesValue" in value:
+        return base64.b64decode(value["bytesValue"])
+    if "referenceValue" in value:
+        return value["referenceValue"]
+    if "geoPointValue" in value:
+        return value["geoPointValue"]
+    raise ValueError(f"Unknown Firestore value: {value}")
+
+
+def decode_fields(fields: dict[str, Any]) -> dict[str, Any]:
+    """Decode Firestore REST ``fields`` into a dict."""
+    return {key: decode_value(value) for key, value in fields.items()}
+
+
+def quote_field_path(field_path: str) -> str:
+    """Quote each segment of a dotted field path that is not a simple identifier."""
+    return ".".join(
+        segment if _SIMPLE_SEGMENT.match(segment) else "`" + segment.replace("`", "\\`") + "`"
+        for segment in field_path.split(".")
+    )
+
+
+def _leaf_paths(data: dict[str, Any], prefix: tuple[str, ...] = ()) -> list[tuple[str, ...]]:
+    """Field paths of all leaves in a nested mapping (empty maps count as leaves)."""
+    paths: list[tuple[str, ...]] = []
+    for key, value in data.items():
+        path = prefix + (key,)
+        if isinstance(value, dict) and value:
+            paths.extend(_leaf_paths(value, path))
+        else:
+            paths.append(path)
+    return paths
+
+
+def _expand(field_updates: dict[str, Any]) -> dict[str, Any]:
+    """Expand dotted update keys into nested maps, dropping DELETE_FIELD values."""
+    data: dict[str, Any] = {}
+    for field_path, value in field_updates.items():
+        if value is DELETE_FIELD:
+            continue
+        parts = field_path.split(".")
+        target = data
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = value
+    return data
+
+
+# --- Client objects -------------------------------------------------------
+
+class RestDocumentSnapshot:
+    """Snapshot of a document, mirroring firestore.DocumentSnapshot."""
+
+    def __init__(self, reference: RestDocumentReference, data: dict[str, Any] | None,
+                 create_time: datetime | None = None, update_time: datetime | None = None,
+                 read_time: datetime | None = None) -> None:
+        self.reference = reference
+        self._data = data
+        self.create_time = create_time
+        self.update_time = update_time
+        self.read_time = read_time
+
+    @classmethod
+    def from_document(cls, client: RestClient, document: dict[str, Any], read_time: str | None = None
+                      ) -> RestDocumentSnapshot:
+        """Build a snapshot from a REST ``Document`` resource."""
+        return cls(
+            RestDocumentReference(client, client.path_from_name(document["name"])),
+            decode_fields(document.get("fields", {})),
+            parse_timestamp(document["createTime"]) if "createTime" in document else None,
+            parse_timestamp(document["updateTime"]) if "updateTime" in document else None,
+            parse_timestamp(read_time) if read_time else None,
+        )
+
+    @property
+    def exists(self) -> bool:
+        """Whether the document exists."""
+        return self._data is not None
+
+    @property
+    def id(self) -> str:
+        """Document ID."""
+        return self.reference.id
+
+    def to_dict(self) -> dict[str, Any] | None:
+        """Return the document data, or None if it does not exist."""
+        return self._data
+
+    def get(self, field_path: str) -> Any:
+        """Return the value at a dotted field path."""
+        value: Any = self._data
+        for part in field_path.split("."):
+            if not isinstance(value, dict) or part not in value:
+                raise KeyError(field_path)
+            value = value[part]
+        return value
+
+
+class RestQuery:
+    """Query over a collection, mirroring firestore.Query."""
+
+    def __init__(self, client: RestClient, collection_path: str, filters: tuple[Any, ...] = (),
+                 orders: tuple[tuple[str, str], ...] = (), limit_count: int | None = None,
+                 projection: tuple[str, ...] | None = None) -> None:
+        self._client = client
+        self._collection_path = collection_path
+        self._filters = filters
+        self._orders = orders
+        self._limit = limit_count
+        self._projection = projection
+
+    def _copy(self, **changes: Any) -> RestQuery:
+        params = {"filters": self._filters, "orders": self._orders, "limit_count": self._limit,
+                  "projection": self._projection}
+        params.update(changes)
+        return RestQuery(self._client, self._collection_path, **params)
+
+    def where(self, field_path: str | None = None, op_string: str | None = None, value: Any = None, *,
+              filter: Any = None) -> RestQuery:
+        """Add a field filter."""
+        if filter is None:
+            if field_path is None or op_string is None:
+                raise ValueError("where() requires a filter or field_path/op_string/value")
+            filter = FieldFilter(field_path, op_string, value)
+        return self._copy(filters=self._filters + (filter,))
+
+    def order_by(self, field_path: str, direction: str = ASCENDING) -> RestQuery:
+        """Add an ordering."""
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count: int) -> RestQuery:
+        """Limit the number of results."""
+        return self._copy(limit_count=count)
+
+    def select(self, field_paths: Iterable[str]) -> RestQuery:
+        """Return only the given field paths of each matching document."""
+        return self._copy(projection=tuple(field_paths))
+
+    def _structured_query(self) -> dict[str, Any]:
+        collection_id = self._collection_path.rsplit("/", 1)[-1]
+        query: dict[str, Any] = {"from": [{"collectionId": collection_id}]}
+        if self._projection is not None:
+            query["select"] = {"fields": [{"fieldPath": quote_field_path(path)} for path in self._projection]}
+        filters = [
+            {"unaryFilter": {
+                "field": {"fieldPath": quote_field_path(flt.field_path)},
+                "op": _NULL_OPERATORS[flt.op_string],
+            }} if flt.value is None and flt.op_string in _NULL_OPERATORS else
+            {"fieldFilter": {
+                "field": {"fieldPath": quote_field_path(flt.field_path)},
+                "op": _OPERATORS[flt.op_string],
+                "value": encode_value(flt.value),
+            }}
+            for flt in self._filters
+        ]
+        if len(filters) == 1:
+            query["where"] = filters[0]
+        elif filters:
+            query["where"] = {"compositeFilter": {"op": "AND", "filters": filters}}
+        if self._orders:
+            query["orderBy"] = [
+                {"field": {"fieldPath": quote_field_path(field_path)}, "direction": direction}
+                for field_path, direction in self._orders
+            ]
+        if self._limit is not None:
+            query["limit"] = self._limit
+        return query
+
+    def _parent_url(self) -> str:
+        parent = self._collection_path.rsplit("/", 1)[0] if "/" in self._collection_path else ""
+        return f"{self._client.base_url}/{parent}" if parent else self._client.base_url
+
+    def stream(self, transaction: Any = None, retry: RestRetry | None = None, timeout: float | None = None
+               ) -> Iterator[RestDocumentSnapshot]:
+        """Run the query and yield matching document snapshots."""
+        response = self._client.request(
+            "POST", f"{self._parent_url()}:runQuery", json={"structuredQuery": self._structured_query()},
+            retry=retry, timeout=timeout,
+        )
+        for item in response.json():
+            if "document" in item:
+                yield RestDocumentSnapshot.from_document(self._client, item["document"], item.get("readTime"))
+
+    def get(self, transaction: Any = None, retry: RestRetry | None = None, timeout: float | None = None
+            ) -> list[RestDocumentSnapshot]:
+        """Run the query and return matching document snapshots."""
+        return list(self.stream(retry=retry, timeout=timeout))
+
+    def on_snapshot(self, callback: Callable[[list[RestDocumentSnapshot], list[RestDocumentChange],
+                                              datetime | None], None]) -> RestWatch:
+        """Watch the query by polling; the callback receives all results with the changes since the last call."""
+        return self._client.poller.watch_query(self, callback)
+
+    def count(self, alias: str | None = None) -> RestAggregationQuery:
+        """Count matching documents."""
+        return RestAggregationQuery(self).count(alias)
+
+    def sum(self, field_ref: str, alias: str | None = None) -> RestAggregationQuery:
+        """Sum a numeric field over matching documents."""
+        return RestAggregationQuery(self).sum(field_ref, alias)
+
+    def avg(self, field_ref: str, alias: str | None = None) -> RestAggregationQuery:
+        """Average a numeric field over matching documents."""
+        return RestAggregationQuery(self).avg(field_ref, alias)
+
+
+@dataclass(frozen=True)
+class RestAggregationResult:
+    """One aggregation value, mirroring firestore AggregationResult."""
+
+    alias: str
+    value: Any
+    read_time: datetime | None = None
+
+
+class RestAggregationQuery:
+    """Aggregation over a query, sent as a single runAggregationQuery request."""
+
+    def __init__(self, query: RestQuery) -> None:
+        self._query = query
+        self._aggregations: list[dict[str, Any]] = []
+
+    def _add(self, kind: str, field_ref: str | None, alias: str | None) -> RestAggregationQuery:
+        aggregation: dict[str, Any] = {"alias": alias or f"field_{len(self._aggregations) + 1}"}
+        aggregation[kind] = {"field": {"fieldPath": quote_field_path(field_ref)}} if field_ref else {}
+        self._aggregations.append(aggregation)
+        return self
+
+    def count(self, alias: str | None = None) -> RestAggregationQuery:
+        """Add a count aggregation."""
+        return self._add("count", None, alias)
+
+    def sum(self, field_ref: str, alias: str | None = None) -> RestAggregationQuery:
+        """Add a sum aggregation."""
+        return self._add("sum", field_ref, alias)
+
+    def avg(self, field_ref: str, alias: str | None = None) -> RestAggregationQuery:
+        """Add an average aggregation."""
+        return self._add("avg", field_ref, alias)
+
+    def get(self, transaction: Any = None, retry: RestRetry | None = None, timeout: float | None = None
+            ) -> list[list[RestAggregationResult]]:
+        """Run the aggregation and return one result row."""
+        query = self._query
+        body = {"structuredAggregationQuery": {
+            "structuredQuery": query._structured_query(),
+            "aggregations": self._aggregations,
+        }}
+        response = query._client.request("POST", f"{query._parent_url()}:runAggregationQuery", json=body,
+                                         retry=retry, timeout=timeout)
+        rows = []
+        for item in response.json():
+            if "result" not in item:
+                continue
+            read_time = parse_timestamp(item["readTime"]) if "readTime" in item else None
+            fields = item["result"].get("aggregateFields", {})
+            rows.append([
+                RestAggregationResult(aggregation["alias"], decode_value(fields[aggregation["alias"]]), read_time)
+                for aggregation in self._aggregations if aggregation["alias"] in fields
+            ])
+        return rows
+
+
+class RestCollectionReference(RestQuery):
+    """Collection reference, mirroring firestore.CollectionReference."""
+
+    def __init__(self, client: RestClient, path: str) -> None:
+        super().__init__(client, path)
+        self.path = path
+
+    @property
+    def id(self) -> str:
+        """Collection ID."""
+        return self.path.rsplit("/", 1)[-1]
+
+    def document(self, document_id: str | None = None) -> RestDocumentReference:
+        """Return a reference to a document in this collection (auto-ID if omitted)."""
+        if document_id is None:
+            document_id = uuid.uuid4().hex[:20]
+        return RestDocumentReference(self._client, f"{self.path}/{document_id}")
+
+
+class RestDocumentReference:
+    """Document reference, mirroring firestore.DocumentReference."""
+
+    def __init__(self, client: RestClient, path: str) -> None:
+        self._client = client
+        self.path = path
+
+    @property
+    def id(self) -> str:
+        """Document ID."""
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def url(self) -> str:
+        """REST resource URL of the document."""
+        return f"{self._client.base_url}/{self.path}"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RestDocumentReference) and other.path == self.path
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    def collection(self, collection_id: str) -> RestCollectionReference:
+        """Return a subcollection of this document."""
+        return RestCollectionReference(self._client, f"{self.path}/{collection_id}")
+
+    def get(self, field_paths: Any = None, transaction: Any = None, retry: RestRetry | None = None,
+            timeout: float | None = None) -> RestDocumentSnapshot:
+        """Read the document."""
+        params = [("mask.fieldPaths", quote_field_path(path)) for path in field_paths or ()]
+        response = self._client.request("GET", self.url, params=params, retry=retry, timeout=timeout,
+                                        allow_not_found=True)
+        if response.status_code == 404:
+            return RestDocumentSnapshot(self, None)
+        return RestDocumentSnapshot.from_document(self._client, response.json())
+
+    def set(self, document_data: dict[str, Any], merge: bool = False, retry: RestRetry | None = None,
+            timeout: float | None = None) -> None:
+        """Create or overwrite the document (or merge into it with ``merge=True``)."""
+        params = []
+        if merge:
+            params = [("updateMask.fieldPaths", quote_field_path(".".join(path)))
+                      for path in _leaf_paths(document_data)]
+            data = _strip_deletes(document_data)
+        else:
+            data = document_data
+        self._client.request("PATCH", self.url, params=params, json={"fields": encode_fields(data)},
+                             retry=retry, timeout=timeout)
+
+    def update(self, field_updates: dict[str, Any], option: Any = None, retry: RestRetry | None = None,
+               timeout: float | None = None) -> None:
+        """Update fields by dotted field path. The document must exist."""
+        params = [("updateMask.fieldPaths", quote_field_path(path)) for path in field_updates]
+        params.append(("currentDocument.exists", "true"))
+        self._client.request("PATCH", self.url, params=params,
+                             json={"fields": encode_fields(_expand(field_updates))}, retry=retry, timeout=timeout)
+
+    def delete(self, option: Any = None, retry: RestRetry | None = None, timeout: float | None = None) -> None:
+        """Delete the document."""
+        self._client.request("DELETE", self.url, retry=retry, timeout=timeout)
+
+    def on_snapshot(self, callback: Callable[[list[RestDocumentSnapshot], list[Any], datetime | None], None]
+                    ) -> RestWatch:
+        """Watch the document by polling; the callback receives the initial state, then every change."""
+        return self._client.poller.watch(self, callback)
+
+
+def _strip_deletes(data: dict[str, Any]) -> dict[str, Any]:
+    """Drop DELETE_FIELD values from nested maps (their paths stay in the update mask)."""
+    return {
+        key: _strip_deletes(value) if isinstance(value, dict) else value
+        for key, value in data.items() if value is not DELETE_FIELD
+    }
+
+
+class ChangeType(Enum):
+    """Kind of a query result change, mirroring firestore watch.ChangeType."""
+
+    ADDED = 1
+    REMOVED = 2
+    MODIFIED = 3
+
+
+@dataclass(frozen=True)
+class RestDocumentChange:
+    """One changed query result, mirroring firestore.DocumentChange."""
+
+    type: ChangeType
+    document: RestDocumentSnapshot
+    old_index: int  # position in the previous results, -1 if added
+    new_index: int  # position in the new results, -1 if removed
+
+
+def _query_changes(client: RestClient, previous: dict[str, tuple[int, datetime | None]],
+                   snapshots: list[RestDocumentSnapshot]
+                   ) -> tuple[dict[str, tuple[int, datetime | None]], list[RestDocumentChange]]:
+    """Diff query results against the versions of the previous poll."""
+    versions = {snapshot.reference.path: (index, snapshot.update_time) for index, snapshot in enumerate(snapshots)}
+    changes = [
+        RestDocumentChange(ChangeType.REMOVED, RestDocumentSnapshot(RestDocumentReference(client, path), None),
+                           index, -1)
+        for path, (index, _) in previous.items() if path not in versions
+    ]
+    for snapshot in snapshots:
+        path = snapshot.reference.path
+        if path not in previous:
+            changes.append(RestDocumentChange(ChangeType.ADDED, snapshot, -1, versions[path][0]))
+        elif previous[path][1] != snapshot.update_time:
+            changes.append(RestDocumentChange(ChangeType.MODIFIED, snapshot, previous[path][0], versions[path][0]))
+    return versions, changes
+
+
+class RestWatch:
+    """Handle returned by ``on_snapshot``."""
+
+    def __init__(self, poller: _Poller, watch_id: int) -> None:
+        self._poller = poller
+        self._watch_id = watch_id
+
+    def unsubscribe(self) -> None:
+        """Stop delivering snapshots."""
+        self._poller.unwatch(self._watch_id)
+
+
+class _Poller:
+    """Polls watched documents with a single batchGet per client and interval."""
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._watches: dict[int, tuple[RestDocumentReference, Callable[..., None]]] = {}
+        self._versions: dict[int, datetime | None] = {}
+        self._queries: dict[int, tuple[RestQuery, Callable[..., None]]] = {}
+        self._query_versions: dict[int, dict[str, tuple[int, datetime | None]]] = {}
+        self._next_id = 0
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def watch(self, reference: RestDocumentReference, callback: Callable[..., None]) -> RestWatch:
+        with self._lock:
+            watch_id = self._add(self._watches, (reference, callback))
+        self._wake.set()
+        return RestWatch(self, watch_id)
+
+    def watch_query(self, query: RestQuery, callback: Callable[..., None]) -> RestWatch:
+        with self._lock:
+            watch_id = self._add(self._queries, (query, callback))
+        self._wake.set()
+        return RestWatch(self, watch_id)
+
+    def _add(self, watches: dict[int, Any], entry: Any) -> int:
+        self._next_id += 1
+        watches[self._next_id] = entry
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="huckleberry-rest-poller", daemon=True)
+            self._thread.start()
+        return self._next_id
+
+    def unwatch(self, watch_id: int) -> None:
+        with self._lock:
+            self._watches.pop(watch_id, None)
+            self._versions.pop(watch_id, None)
+            self._queries.pop(watch_id, None)
+            self._query_versions.pop(watch_id, None)
+        self._wake.set()
+
+    def stop(self, client: RestClient | None = None) -> None:
+        """Drop the watches of one client, or all watches."""
+        with self._lock:
+            for watch_id, (reference, _) in list(self._watches.items()):
+                if client is None or reference._client is client:
+                    del self._watches[watch_id]
+                    self._versions.pop(watch_id, None)
+            for watch_id, (query, _) in list(self._queries.items()):
+                if client is None or query._client is client:
+                    del self._queries[watch_id]
+                    self._query_versions.pop(watch_id, None)
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                watches = dict(self._watches)
+                queries = dict(self._queries)
+            if not watches and not queries:
+                with self._lock:
+                    if not self._watches and not self._queries:
+                        self._thread = None
+                        return
+                continue
+            try:
+                self._poll(watches)
+                self._poll_queries(queries)
+            except Exception as err:
+                _LOGGER.error("Polling watched documents failed: %s", err)
+            self._wake.clear()
+            self._wake.wait(self._interval)
+
+    def _poll(self, watches: dict[int, tuple[RestDocumentReference, Callable[..., None]]]) -> None:
+        by_client: dict[RestClient, list[RestDocumentReference]] = {}
+        for reference, _ in watches.values():
+            by_client.setdefault(reference._client, []).append(reference)
+        snapshots: dict[tuple[RestClient, str], RestDocumentSnapshot] = {}
+        for client, references in by_client.items():
+            try:
+                for snapshot in client.get_all(references):
+                    snapshots[(client, snapshot.reference.path)] = snapshot
+            except Exception as err:
+                _LOGGER.error("Polling watched documents failed: %s", err)
+        for watch_id, (reference, callback) in watches.items():
+            snapshot = snapshots.get((reference._client, reference.path))
+            if snapshot is None:
+                continue
+            with self._lock:
+                if watch_id not in self._watches:
+                    continue
+                first = watch_id not in self._versions
+                changed = first or self._versions[watch_id] != snapshot.update_time
+                self._versions[watch_id] = snapshot.update_time
+            if changed:
+                try:
+                    callback([snapshot], [], snapshot.read_time)
+                except Exception as err:
+                    _LOGGER.error("Snapshot listener callback failed: %s", err)
+
+    def _poll_queries(self, queries: dict[int, tuple[RestQuery, Callable[..., None]]]) -> None:
+        for watch_id, (query, callback) in queries.items():
+            try:
+                snapshots = query.get()
+            except Exception as err:
+                _LOGGER.error("Polling watched query failed: %s", err)
+                continue
+            with self._lock:
+                if watch_id not in self._queries:
+                    continue
+                first = watch_id not in self._query_versions
+                versions, changes = _query_changes(query._client, self._query_versions.get(watch_id, {}), snapshots)
+                self._query_versions[watch_id] = versions
+            if first or changes:
+                read_time = snapshots[0].read_time if snapshots else None
+                try:
+                    callback(snapshots, changes, read_time)
+                except Exception as err:
+                    _LOGGER.error("Snapshot listener callback failed: %s", err)
+
+
+class RestClient:
+    """Firestore REST client bound to one ID token, mirroring firestore.Client."""
+
+    def __init__(self, session: requests.Session, base_url: str, id_token: str, poll_interval: float,
+                 default_retry: RestRetry, poller: _Poller | None = None) -> None:
+        self._session = session
+        self.base_url = base_url
+        self._id_token = id_token
+        self._default_retry = default_retry
+        self._documents_prefix = base_url.split("/v1/", 1)[1] + "/"
+        self.poller = poller if poller is not None else _Poller(poll_interval)
+
+    def path_from_name(self, name: str) -> str:
+        """Convert a document resource name to a slash-separated document path."""
+        return name[len(self._documents_prefix):] if name.startswith(self._documents_prefix) else name
+
+    def collection(self, collection_path: str) -> RestCollectionReference:
+        """Return a collection reference (nested paths like 'sleep/uid/intervals' are allowed)."""
+        return RestCollectionReference(self, collection_path)
+
+    def document(self, document_path: str) -> RestDocumentReference:
+        """Return a document reference by slash-separated path."""
+        return RestDocumentReference(self, document_path)
+
+    def get_all(self, references: list[RestDocumentReference], field_paths: Any = None,
+                retry: RestRetry | None = None, timeout: float | None = None) -> Iterator[RestDocumentSnapshot]:
+        """Read several documents in one batchGet request."""
+        if not references:
+            return
+        body: dict[str, Any] = {"documents": [self._documents_prefix + ref.path for ref in references]}
+        if field_paths is not None:
+            body["mask"] = {"fieldPaths": [quote_field_path(path) for path in field_paths]}
+        response = self.request("POST", f"{self.base_url}:batchGet", json=body, retry=retry, timeout=timeout)
+        for item in response.json():
+            if "found" in item:
+                yield RestDocumentSnapshot.from_document(self, item["found"], item.get("readTime"))
+            elif "missing" in item:
+                yield RestDocumentSnapshot(
+                    RestDocumentReference(self, self.path_from_name(item["missing"])), None,
+                    read_time=parse_timestamp(item["readTime"]) if "readTime" in item else None,
+                )
+
+    def request(self, method: str, url: str, retry: RestRetry | None = None, timeout: float | None = None,
+                allow_not_found: bool = False, **kwargs: Any) -> requests.Response:
+        """Send an authenticated request, retrying throttling and server errors."""
+        retry = retry or self._default_retry
+        delay = retry.initial
+        headers = {"Authorization": f"Bearer {self._id_token}"}
+        for attempt in range(1, retry.attempts + 1):
+            try:
+                response = self._session.request(method, url, headers=headers, timeout=timeout or 30, **kwargs)
+                if response.status_code in _RETRY_STATUS and attempt < retry.attempts:
+                    raise requests.HTTPError(f"{response.status_code} for {url}", response=response)
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as err:
+                if attempt >= retry.attempts:
+                    raise
+                if retry.on_error is not None:
+                    retry.on_error(err)
+                time.sleep(delay)
+                delay *= retry.multiplier
+                continue
+            if allow_not_found and response.status_code == 404:
+                return response
+            response.raise_for_status()
+            return response
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        """Stop polling; the shared HTTP session (and poller) stay open for other clients."""
+        self.poller.stop(self)
+
+
+class RestBackend:
+    """Storage backend using the Firestore REST API over pooled HTTPS.
+
+    One backend owns one ``requests.Session``; all clients created from it
+    (one per ID token) share its connection pool.
+    """
+
+    def __init__(self, base_url: str = FIRESTORE_BASE_URL, poll_interval: float = 5.0, pool_size: int = 10,
+                 session: requests.Session | None = None, shared_poller: bool = False) -> None:
+        """Initialize the backend.
+
+        Args:
+            base_url: Firestore REST documents URL.
+            poll_interval: Seconds between polls for snapshot listeners.
+            pool_size: Maximum number of pooled HTTPS connections.
+            session: Optional preconfigured session (its adapters are left as is).
+            shared_poller: Poll the listeners of all clients from one thread
+                instead of one thread per client.
+        """
+        self.base_url = base_url
+        self.poll_interval = poll_interval
+        self._poller = _Poller(poll_interval) if shared_poller else None
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+        self.session = session
+
+    @property
+    def delete_field(self) -> Any:
+        """DELETE_FIELD sentinel understood by this backend."""
+        return DELETE_FIELD
+
+    def warm_up(self) -> None:
+        """Open a pooled HTTPS connection (DNS and TLS) before the first authenticated request."""
+        origin = self.base_url.split("/v1/", 1)[0]
+        try:
+            self.session.request("HEAD", origin, timeout=10)
+        except requests.RequestException as err:
+            _LOGGER.debug("Warming up %s failed: %s", origin, err)
+
+    def create_client(self, id_token: str) -> RestClient:
+        """Create a client that authenticates requests with the given ID token."""
+        return RestClient(self.session, self.base_url, id_token, self.poll_interval, RestRetry(), self._poller)
+
+    def field_filter(self, field_path: str, op_string: str, value: Any) -> FieldFilter:
+        """Build a field filter."""
+        return FieldFilter(field_path, op_string, value)
+
+    def retry_policy(self, call: Any) -> RestRetry:
+        """Retry throttling and server errors, counting each retry on the call."""
+
+        def on_error(err: Exception) -> None:
+            call.retries += 1
+            _LOGGER.debug("Retrying Firestore %s on %s after error: %s", call.operation, call.path, err)
+
+        return RestRetry(on_error=on_error)
@@ -0,0 +1,149 @@
+"""Incrementally maintained per-day and per-week rollups.
+
+A RollupStore keeps, per child and tracker, the entry count and field totals
+of each local day and ISO week (weeks start on Monday). It is seeded once from
+history and then kept current from the API's interval notifications, which
+cover both this client's own writes and the latest entries seen by real-time
+listeners. Reads are dictionary lookups and need no Firestore round trip:
+
+    store = RollupStore("Europe/London")
+    store.attach(api)
+    store.seed(api, child_uid, start, end)
+    api.setup_realtime_listener(child_uid, on_sleep)
+    store.day(child_uid, "sleep", date.today()).totals["duration"]
+
+Entries are bucketed by the local day of their start; a sleep crossing
+midnight counts fully on the day it started.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
+from zoneinfo import ZoneInfo
+
+from .ratelimit import low_priority
+
+if TYPE_CHECKING:
+    from .api import HuckleberryAPI
+
+# Numeric fields summed per tracker
+SUMMED_FIELDS: dict[str, tuple[str, ...]] = {
+    "sleep": ("duration",),
+    "feed": ("leftDuration", "rightDuration"),
+    "diaper": (),
+    "health": (),
+}
+# Fields whose values are counted per tracker (e.g. diaper modes)
+COUNTED_FIELDS: dict[str, str] = {"diaper": "mode"}
+
+
+@dataclass
+class Rollup:
+    """Aggregate of the entries in one period."""
+
+    count: int = 0
+    totals: dict[str, float] = field(default_factory=dict)
+
+    def copy(self) -> Rollup:
+        """Return an independent copy."""
+        return Rollup(self.count, dict(self.totals))
+
+
+class RollupStore:
+    """Thread-safe per-day and per-week rollups for each child and tracker."""
+
+    def __init__(self, timezone_name: str | None = None) -> None:
+        """Initialize the store.
+
+        Args:
+            timezone_name: IANA time zone used for entries without a stored offset
+                (defaults to UTC).
+        """
+        self._timezone = ZoneInfo(timezone_name) if timezone_name else timezone.utc
+        self._lock = threading.Lock()
+        self._days: dict[tuple[str, str, date], Rollup] = {}
+        self._weeks: dict[tuple[str, str, date], Rollup] = {}
+        self._seen: dict[tuple[str, str], set[float]] = {}
+
+    def attach(self, api: HuckleberryAPI) -> None:
+        """Receive interval notifications from an API client."""
+        api.add_interval_observer(self.add)
+
+    def detach(self, api: HuckleberryAPI) -> None:
+        """Stop receiving interval notifications from an API client."""
+        api.remove_interval_observer(self.add)
+
+    def seed(self, api: HuckleberryAPI, child_uid: str, start_timestamp: int, end_timestamp: int) -> int:
+        """Load a child's history once (as low-priority work); returns the number of entries added."""
+        with low_priority():
+            events = api.get_calendar_events(child_uid, start_timestamp, end_timestamp)
+        return self.add_many(child_uid, events)
+
+    def add_many(self, child_uid: str, events: Mapping[str, Iterable[Mapping[str, Any]]]) -> int:
+        """Add events keyed by tracker (as from get_calendar_events); returns the number added."""
+        return sum(
+            self.add(tracker, child_uid, entry)
+            for tracker, entries in events.items() if tracker in SUMMED_FIELDS
+            for entry in entries
+        )
+
+    def add(self, tracker: str, child_uid: str, entry: Mapping[str, Any]) -> bool:
+        """Add one entry unless an entry with the same start was already added."""
+        start = entry.get("start")
+        if tracker not in SUMMED_FIELDS or not isinstance(start, (int, float)):
+            return False
+        day = self._local_day(float(start), entry.get("offset"))
+        week = day - timedelta(days=day.weekday())
+        with self._lock:
+            seen = self._seen.setdefault((child_uid, tracker), set())
+            if start in seen:
+                return False
+            seen.add(start)
+            for rollup in (self._days.setdefault((child_uid, tracker, day), Rollup()),
+                           self._weeks.setdefault((child_uid, tracker, week), Rollup())):
+                self._apply(rollup, tracker, entry)
+        return True
+
+    @staticmethod
+    def _apply(rollup: Rollup, tracker: str, entry: Mapping[str, Any]) -> None:
+        rollup.count += 1
+        for name in SUMMED_FIELDS[tracker]:
+            value = entry.get(name)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                rollup.totals[name] = rollup.totals.get(name, 0) + value
+        counted = COUNTED_FIELDS.get(tracker)
+        if counted and isinstance(entry.get(counted), str):
+            name = f"{counted}:{entry[counted]}"
+            rollup.totals[name] = rollup.totals.get(name, 0) + 1
+
+    def _local_day(self, start: float, offset: Any) -> date:
+        if isinstance(offset, (int, float)):
+            return (datetime.fromtimestamp(start, timezone.utc) - timedelta(minutes=offset)).date()
+        return datetime.fromtimestamp(start, self._timezone).date()
+
+    def day(self, child_uid: str, tracker: str, day: date) -> Rollup:
+        """Rollup of one local day."""
+        with self._lock:
+            rollup = self._days.get((child_uid, tracker, day))
+            return rollup.copy() if rollup else Rollup()
+
+    def week(self, child_uid: str, tracker: str, day: date) -> Rollup:
+        """Rollup of the ISO week (Monday to Sunday) containing ``day``."""
+        monday = day - timedelta(days=day.weekday())
+        with self._lock:
+            rollup = self._weeks.get((child_uid, tracker, monday))
+            return rollup.copy() if rollup else Rollup()
+
+    def clear(self, child_uid: str | None = None) -> None:
+        """Forget the rollups of one child, or of all children."""
+        with self._lock:
+            if child_uid is None:
+                self._days.clear()
+                self._weeks.clear()
+                self._seen.clear()
+                return
+            for table in (self._days, self._weeks, self._seen):
+                for key in [key for key in table if key[0] == child_uid]:
+                    del table[key]
@@ -0,0 +1,87 @@
+"""Sharded range queries: one long range streamed as several concurrent queries.
+
+A range getter over years of history (a backfill, say) runs one ordered
+Firestore query, so it is bounded by the throughput of a single stream. With
+RangeSharding, the interval getters split ranges longer than ``shard_span``
+into consecutive time shards and stream them concurrently on a small thread
+pool:
+
+    api = HuckleberryAPI(email, password, timezone,
+                         range_sharding=RangeSharding(shard_span=90 * 86400, max_workers=4))
+
+Shards are half-open ``[start, end)`` ranges, like the getters' own filter, and
+are yielded back in shard order, so the merged documents stay in ``start``
+order. A document seen by more than one shard (its start was moved across a
+shard edge while the shards were streaming) is yielded once. Every shard is a
+separate query: on Firestore an empty shard is still billed one read.
+"""
+from __future__ import annotations
+
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator
+
+# Streams the documents of one [start, end) range in start order
+RangeQuery = Callable[[float, float], Iterable[Any]]
+
+
+@dataclass(frozen=True)
+class RangeSharding:
+    """How the interval getters split long ranges into concurrently streamed shards."""
+
+    shard_span: float = 30 * 86400  # seconds per shard; shorter ranges run as one query
+    max_workers: int = 4  # shards streamed at the same time
+
+    def __post_init__(self) -> None:
+        if self.shard_span <= 0:
+            raise ValueError("shard_span must be positive")
+        if self.max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+    def shards(self, start: float, end: float) -> list[tuple[float, float]]:
+        """Consecutive ``[start, end)`` shards covering the range (one shard for short or empty ranges)."""
+        bounds = []
+        shard_start = start
+        while end - shard_start > self.shard_span:
+            bounds.append((shard_start, shard_start + self.shard_span))
+            shard_start += self.shard_span
+        bounds.append((shard_start, end))
+        return bounds
+
+
+def stream_sharded(query: RangeQuery, start: float, end: float, sharding: RangeSharding) -> Iterator[Any]:
+    """Stream ``query`` over ``[start, end)`` shard by shard, with up to ``max_workers`` shards concurrently.
+
+    Documents are yielded in shard order as soon as their shard and all earlier
+    ones are complete, de-duplicated by document path. Each shard runs in a
+    copy of the caller's context, so tracing spans, cost attribution and rate
+    limit priority apply as if the caller ran it. A failing shard raises its
+    exception; shards not started yet are cancelled.
+    """
+    bounds = sharding.shards(start, end)
+    if len(bounds) == 1:
+        yield from query(start, end)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(sharding.max_workers, len(bounds)),
+                            thread_name_prefix="huckleberry-shard") as pool:
+        futures: list[Future[list[Any]]] = [
+            pool.submit(contextvars.copy_context().run, _collect, query, shard_start, shard_end)
+            for shard_start, shard_end in bounds
+        ]
+        try:
+            seen: set[str] = set()
+            for future in futures:
+                for doc in future.result():
+                    path = doc.reference.path
+                    if path not in seen:
+                        seen.add(path)
+                        yield doc
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _collect(query: RangeQuery, start: float, end: float) -> list[Any]:
+    return list(query(start, end))
@@ -0,0 +1,89 @@
+"""Coalescing of identical concurrent calls.
+
+When several threads make the same read at the same time (a dashboard and a
+coordinator both refreshing one child, say), only the first one runs it; the
+others wait for it and receive copies of its result, or its exception. Calls
+are shared only while one is in flight, so a call started after another
+finished always runs again and nothing is served stale.
+
+HuckleberryAPI coalesces its read methods (``const.READ_METHODS``) keyed by
+method name and arguments, e.g. (``"get_calendar_events"``, child, start, end).
+"""
+from __future__ import annotations
+
+import copy
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters of a SingleFlight group."""
+
+    calls: int = 0  # calls that ran
+    shared: int = 0  # calls answered by a concurrent identical call
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Thread-safe group of in-flight calls keyed by what they compute."""
+
+    def __init__(self) -> None:
+        """Initialize an empty group."""
+        self.stats = SingleFlightStats()
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def do(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        """Run ``call``, or wait for the identical call in flight under ``key`` and share its result.
+
+        The caller that runs the call gets its result; waiting callers get deep
+        copies, so callers modifying their result do not affect each other.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+                self.stats.calls += 1
+            else:
+                leader = False
+                flight.waiters += 1
+                self.stats.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        result = None
+        try:
+            result = call()
+            return result
+        except BaseException as err:
+            flight.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                waiters = flight.waiters
+            if waiters and flight.error is None:
+                # Snapshot taken before the caller gets the result and can modify it
+                flight.result = copy.deepcopy(result)
+            flight.done.set()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently running."""
+        return len(self._flights)
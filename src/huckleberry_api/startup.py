@@ -0,0 +1,125 @@
+"""Pipelined startup: sign in, read the first state and start listening.
+
+A cold start done step by step costs one round trip per step: sign in, create
+the Firestore client (and its channel) on first use, read the user document,
+read every child document, read every tracker document, then set up one
+listener after the other. ``HuckleberryAPI.startup`` overlaps and batches
+these steps:
+
+1. The backend warms up (imports, DNS, TLS connection) while signing in.
+2. The children and the state of all their trackers come from one user
+   document read plus one batched ``get_dashboard`` read.
+3. All listeners are registered concurrently on a small thread pool.
+
+The returned StartupReport holds the first state and a per-phase timing
+breakdown:
+
+    report = api.startup(callback=on_update)
+    print(report.phases, report.time_to_first_state)
+"""
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Sequence
+
+if TYPE_CHECKING:
+    from .api import HuckleberryAPI
+    from .types import ChildDashboard, ChildData
+
+_LOGGER = logging.getLogger(__name__)
+
+# Receives (collection, child_uid, data) for every listener update
+StartupCallback = Callable[[str, str, Any], None]
+
+
+@dataclass
+class StartupReport:
+    """Result of HuckleberryAPI.startup.
+
+    ``phases`` maps each phase to its wall time in seconds: "auth" and
+    "warm_up" run concurrently, then "client", "children", "state" and
+    "listeners" run in sequence.
+    """
+
+    phases: dict[str, float] = field(default_factory=dict)
+    children: list[ChildData] = field(default_factory=list)
+    dashboards: dict[str, ChildDashboard] = field(default_factory=dict)
+    listeners: int = 0
+    errors: list[str] = field(default_factory=list)  # listeners that could not be set up
+    total: float = 0.0
+
+    @property
+    def time_to_first_state(self) -> float:
+        """Seconds until ``dashboards`` was available."""
+        return (max(self.phases.get("auth", 0.0), self.phases.get("warm_up", 0.0))
+                + sum(self.phases.get(phase, 0.0) for phase in ("client", "children", "state")))
+
+
+def run_startup(api: HuckleberryAPI, collections: Sequence[str], callback: StartupCallback | None,
+                deltas: bool = False, max_workers: int = 8) -> StartupReport:
+    """Run the pipelined startup for ``api`` (see HuckleberryAPI.startup)."""
+    report = StartupReport()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="huckleberry-startup") as pool:
+        warm_up = pool.submit(_timed, _warm_up, api)
+        auth_started = time.perf_counter()
+        api._ensure_authenticated()
+        report.phases["auth"] = time.perf_counter() - auth_started
+        try:
+            report.phases["warm_up"] = warm_up.result()
+        except Exception as err:  # warming up is an optimization only
+            _LOGGER.debug("Backend warm-up failed: %s", err)
+            report.phases["warm_up"] = 0.0
+
+        report.phases["client"] = _timed(api._get_firestore_client)
+
+        phase_started = time.perf_counter()
+        child_uids = api._child_uids()
+        report.phases["children"] = time.perf_counter() - phase_started
+
+        phase_started = time.perf_counter()
+        report.dashboards = api.get_dashboard(child_uids) if child_uids else {}
+        report.children = [dashboard["child"] for dashboard in report.dashboards.values() if dashboard.get("child")]
+        report.phases["state"] = time.perf_counter() - phase_started
+
+        phase_started = time.perf_counter()
+        if callback is not None:
+            targets = [(collection, child_uid) for child_uid in child_uids for collection in collections]
+            futures = [
+                (collection, child_uid, pool.submit(_listen, api, collection, child_uid, callback, deltas))
+                for collection, child_uid in targets
+            ]
+            for collection, child_uid, future in futures:
+                try:
+                    future.result()
+                    report.listeners += 1
+                except Exception as err:
+                    _LOGGER.error("Setting up %s listener for child %s failed: %s", collection, child_uid, err)
+                    report.errors.append(f"{collection}/{child_uid}: {err}")
+        report.phases["listeners"] = time.perf_counter() - phase_started
+    report.total = time.perf_counter() - started
+    _LOGGER.info("Startup finished in %.3fs: %s", report.total,
+                 ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in report.phases.items()))
+    return report
+
+
+def _timed(func: Callable[..., Any], *args: Any) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def _warm_up(api: HuckleberryAPI) -> None:
+    warm_up = getattr(api._backend, "warm_up", None)
+    if warm_up is not None:
+        warm_up()
+
+
+def _listen(api: HuckleberryAPI, collection: str, child_uid: str, callback: StartupCallback, deltas: bool) -> None:
+    def on_update(data: Any) -> None:
+        callback(collection, child_uid, data)
+
+    api._setup_listener(collection, child_uid, on_update, deltas)  # type: ignore[arg-type]
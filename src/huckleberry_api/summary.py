@@ -0,0 +1,184 @@
+"""Per-local-day summaries of tracker history.
+
+Buckets sleep, feed and diaper events into days in the child's local time and
+returns one compact table with a row per day. Each event's stored ``offset``
+(minutes, negative east of UTC, as written by the app) converts its start to
+local time. Sleep is split at local midnight and into day and night parts
+using the child's ``night_start_min`` and ``morning_cutoff_min``.
+
+All bucketing is vectorized with numpy, an optional dependency:
+
+    pip install "huckleberry-api[analytics]"
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from datetime import date, tzinfo
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the extra
+    np = None  # type: ignore[assignment]
+
+from .timezones import to_local
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+DAY_SECONDS = 86400
+DIAPER_MODES = ("pee", "poo", "both", "dry")
+
+
+def require_numpy() -> None:
+    """Raise ImportError with an install hint when numpy is missing."""
+    if np is None:
+        raise ImportError('numpy is required for summaries: pip install "huckleberry-api[analytics]"')
+
+
+@dataclass(frozen=True)
+class DailySummary:
+    """Per-day totals as parallel numpy arrays, one element per local day.
+
+    Days run from the first to the last day with any event; days without
+    events have zero totals. Durations are in seconds.
+    """
+
+    day: npt.NDArray[Any]  # datetime64[D]
+    sleep_s: npt.NDArray[Any]
+    day_sleep_s: npt.NDArray[Any]
+    night_sleep_s: npt.NDArray[Any]
+    naps: npt.NDArray[Any]
+    feeds: npt.NDArray[Any]
+    feed_left_s: npt.NDArray[Any]
+    feed_right_s: npt.NDArray[Any]
+    diapers_pee: npt.NDArray[Any]
+    diapers_poo: npt.NDArray[Any]
+    diapers_both: npt.NDArray[Any]
+    diapers_dry: npt.NDArray[Any]
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """Return the table as a list of row dicts (``day`` as datetime.date)."""
+        columns = {field.name: getattr(self, field.name).tolist() for field in fields(self)}
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+    def row(self, day: date) -> dict[str, Any] | None:
+        """Return the row for one day, or None if it is outside the table."""
+        index = np.searchsorted(self.day, np.datetime64(day, "D"))
+        if index >= len(self.day) or self.day[index] != np.datetime64(day, "D"):
+            return None
+        return {field.name: getattr(self, field.name)[index].item() for field in fields(self)}
+
+
+def _column(events: Sequence[Mapping[str, Any]], key: str, default: float = 0.0) -> npt.NDArray[Any]:
+    return np.fromiter(
+        (default if (value := event.get(key)) is None else value for event in events),
+        dtype=np.float64, count=len(events),
+    )
+
+
+def _local_starts(events: Sequence[Mapping[str, Any]], default_offset_min: float,
+                  zone: str | tzinfo | None) -> npt.NDArray[Any]:
+    """Local wall-clock starts in seconds, using each event's stored offset."""
+    if zone is not None:
+        return to_local(_column(events, "start"), zone, [event.get("offset") for event in events]).local
+    return _column(events, "start") - _column(events, "offset", default_offset_min) * 60
+
+
+def _night_seconds_before(seconds_of_day: npt.NDArray[Any], night_start_s: float,
+                          morning_cutoff_s: float) -> npt.NDArray[Any]:
+    """Night seconds between local midnight and a time of day.
+
+    Night runs from midnight to the morning cutoff and from night start to midnight.
+    """
+    return np.minimum(seconds_of_day, morning_cutoff_s) + np.maximum(seconds_of_day - night_start_s, 0.0)
+
+
+def _bincount(days: npt.NDArray[Any], first_day: int, length: int,
+              weights: npt.NDArray[Any] | None = None) -> npt.NDArray[Any]:
+    return np.bincount(days - first_day, weights=weights, minlength=length)[:length]
+
+
+def summarize_days(
+    events: Mapping[str, Sequence[Mapping[str, Any]]],
+    night_start_min: int = 1140,
+    morning_cutoff_min: int = 420,
+    default_offset_min: float = 0.0,
+    timezone: str | tzinfo | None = None,
+) -> DailySummary:
+    """Bucket events into local days.
+
+    Args:
+        events: Event lists keyed by tracker, as returned by get_calendar_events
+            ("sleep" with start/duration, "feed" with start/leftDuration/rightDuration,
+            "diaper" with start/mode). Missing trackers are treated as empty.
+        night_start_min: Local minute of day when night starts (ChildData.night_start_min).
+        morning_cutoff_min: Local minute of day when night ends (ChildData.morning_cutoff_min).
+        default_offset_min: Offset used for events without a stored offset.
+        timezone: Zone for events without a stored offset; overrides default_offset_min
+            and follows DST transitions within the range.
+
+    Returns:
+        DailySummary with one row per local day. A sleep counts as a nap on the
+        day it starts if it starts between the morning cutoff and night start.
+    """
+    require_numpy()
+    sleeps = events.get("sleep") or []
+    feeds = events.get("feed") or []
+    diapers = events.get("diaper") or []
+    night_start_s = night_start_min * 60.0
+    morning_cutoff_s = morning_cutoff_min * 60.0
+
+    # Sleep: split each interval into per-day pieces
+    sleep_start = _local_starts(sleeps, default_offset_min, timezone)
+    sleep_end = sleep_start + np.maximum(_column(sleeps, "duration"), 0.0)
+    first = np.floor(sleep_start / DAY_SECONDS).astype(np.int64)
+    last = np.maximum(first, np.ceil(sleep_end / DAY_SECONDS).astype(np.int64) - 1)
+    pieces = last - first + 1
+    owner = np.repeat(np.arange(len(sleeps)), pieces)
+    piece_day = first[owner] + np.arange(pieces.sum()) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    day_origin = piece_day * float(DAY_SECONDS)
+    piece_start = np.maximum(sleep_start[owner], day_origin) - day_origin
+    piece_end = np.minimum(sleep_end[owner], day_origin + DAY_SECONDS) - day_origin
+    piece_night = (_night_seconds_before(piece_end, night_start_s, morning_cutoff_s)
+                   - _night_seconds_before(piece_start, night_start_s, morning_cutoff_s))
+    start_of_day = sleep_start - first * float(DAY_SECONDS)
+    is_nap = (start_of_day >= morning_cutoff_s) & (start_of_day < night_start_s)
+
+    feed_day = np.floor(_local_starts(feeds, default_offset_min, timezone) / DAY_SECONDS).astype(np.int64)
+    diaper_day = np.floor(_local_starts(diapers, default_offset_min, timezone) / DAY_SECONDS).astype(np.int64)
+    diaper_mode = np.array([diaper.get("mode") for diaper in diapers], dtype=object)
+
+    all_days = np.concatenate([piece_day, first, feed_day, diaper_day])
+    if not len(all_days):
+        empty_float = np.zeros(0)
+        empty_int = np.zeros(0, dtype=np.int64)
+        return DailySummary(np.zeros(0, dtype="datetime64[D]"), empty_float, empty_float, empty_float,
+                            empty_int, empty_int, empty_float, empty_float,
+                            empty_int, empty_int, empty_int, empty_int)
+    first_day = int(all_days.min())
+    length = int(all_days.max()) - first_day + 1
+
+    sleep_s = _bincount(piece_day, first_day, length, piece_end - piece_start)
+    night_sleep_s = _bincount(piece_day, first_day, length, piece_night)
+    diaper_counts = {
+        mode: _bincount(diaper_day[diaper_mode == mode], first_day, length) for mode in DIAPER_MODES
+    }
+    return DailySummary(
+        day=np.arange(first_day, first_day + length).astype("datetime64[D]"),
+        sleep_s=sleep_s,
+        day_sleep_s=sleep_s - night_sleep_s,
+        night_sleep_s=night_sleep_s,
+        naps=_bincount(first[is_nap], first_day, length),
+        feeds=_bincount(feed_day, first_day, length),
+        feed_left_s=_bincount(feed_day, first_day, length, _column(feeds, "leftDuration")),
+        feed_right_s=_bincount(feed_day, first_day, length, _column(feeds, "rightDuration")),
+        diapers_pee=diaper_counts["pee"],
+        diapers_poo=diaper_counts["poo"],
+        diapers_both=diaper_counts["both"],
+        diapers_dry=diaper_counts["dry"],
+    )
+
@@ -0,0 +1,194 @@
+"""Time zone offset helpers.
+
+Offsets use the convention of the stored ``offset`` field: minutes *behind*
+UTC, so UTC+2 is -120 (like JavaScript's ``getTimezoneOffset``).
+
+A zone's DST transitions are searched once per zone and UTC year and cached,
+so ``offset_minutes`` and ``transition_table`` answer from the cached years,
+also when historical timestamps of many different years are mixed.
+``to_local`` converts arrays of epoch starts to local wall time and day
+numbers in one vectorized pass. It uses the stored offsets where present and
+a transition table of the zone for the rest; it needs numpy (the "analytics"
+extra).
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone, tzinfo
+from typing import TYPE_CHECKING, Any, Sequence
+from zoneinfo import ZoneInfo
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the extra
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+DAY_SECONDS = 86400
+# How far ahead next_transition looks by default
+TRANSITION_HORIZON = 400 * DAY_SECONDS
+
+_cache_lock = threading.Lock()
+# (zone, UTC year) -> (offset at the year's start, transition instants, offset from each instant on),
+# offsets in seconds east of UTC
+_year_cache: dict[tuple[tzinfo, int], tuple[int, tuple[float, ...], tuple[int, ...]]] = {}
+
+
+def _zone(zone: str | tzinfo) -> tzinfo:
+    return ZoneInfo(zone) if isinstance(zone, str) else zone
+
+
+def utcoffset_seconds(zone: str | tzinfo, timestamp: float) -> int:
+    """UTC offset of the zone at an instant, in seconds (positive east of UTC)."""
+    offset = datetime.fromtimestamp(timestamp, _zone(zone)).utcoffset()
+    return int(offset.total_seconds()) if offset is not None else 0
+
+
+def next_transition(zone: str | tzinfo, after: float, until: float | None = None) -> float | None:
+    """First instant after ``after`` at which the zone's UTC offset changes.
+
+    Scans in one-day steps up to ``until`` (default: TRANSITION_HORIZON ahead),
+    then bisects to the second. Returns None if the offset does not change.
+    """
+    zone = _zone(zone)
+    until = after + TRANSITION_HORIZON if until is None else until
+    offset = utcoffset_seconds(zone, after)
+    low = after
+    while low < until:
+        high = min(low + DAY_SECONDS, until)
+        if utcoffset_seconds(zone, high) != offset:
+            # Transitions fall on whole seconds
+            low, high = math.floor(low), math.ceil(high)
+            while high - low > 1:
+                middle = (low + high) // 2
+                if utcoffset_seconds(zone, middle) == offset:
+                    low = middle
+                else:
+                    high = middle
+            return float(high)
+        low = high
+    return None
+
+
+def _year_start(year: int) -> float:
+    return datetime(year, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+def _utc_year(timestamp: float) -> int:
+    return datetime.fromtimestamp(timestamp, timezone.utc).year
+
+
+def _year_offsets(zone: tzinfo, year: int) -> tuple[int, tuple[float, ...], tuple[int, ...]]:
+    """Offsets of the zone over a UTC year, searched once per (zone, year) and cached.
+
+    Returns the offset at the start of the year and the transitions after it,
+    up to and including the start of the next year.
+    """
+    key = (zone, year)
+    # Lock-free read: dict lookups are atomic and entries are never replaced
+    cached = _year_cache.get(key)
+    if cached is not None:
+        return cached
+
+    instants: list[float] = []
+    offsets: list[int] = []
+    instant, until = _year_start(year), _year_start(year + 1)
+    while (instant := next_transition(zone, instant, until=until)) is not None:
+        instants.append(instant)
+        offsets.append(utcoffset_seconds(zone, instant))
+    entry = (utcoffset_seconds(zone, _year_start(year)), tuple(instants), tuple(offsets))
+    with _cache_lock:
+        _year_cache[key] = entry
+    return entry
+
+
+def offset_minutes(zone: str | tzinfo, timestamp: float | None = None) -> float:
+    """Offset of the zone in stored-field minutes, from its transitions cached per year."""
+    now = time.time() if timestamp is None else timestamp
+    opening, instants, offsets = _year_offsets(_zone(zone), _utc_year(now))
+    index = bisect.bisect_right(instants, now)
+    return -(offsets[index - 1] if index else opening) / 60
+
+
+def transition_table(zone: str | tzinfo, start: float, end: float) -> tuple[list[float], list[int]]:
+    """Offsets of the zone between ``start`` and ``end``.
+
+    Transitions are searched once per zone and UTC year and cached, so repeated
+    tables over the same years cost no scan.
+
+    Returns (instants, offsets): ``offsets[i]`` (seconds east of UTC) applies from
+    ``instants[i]`` until the next instant; ``instants[0]`` is ``start``.
+    """
+    zone = _zone(zone)
+    instants = [float(start)]
+    offsets = [utcoffset_seconds(zone, start)]
+    year = _utc_year(start)
+    while _year_start(year) < end:
+        _, year_instants, year_offsets = _year_offsets(zone, year)
+        for instant, offset in zip(year_instants, year_offsets):
+            if start < instant <= end:
+                instants.append(instant)
+                offsets.append(offset)
+        year += 1
+    return instants, offsets
+
+
+@dataclass(frozen=True)
+class LocalTimes:
+    """Local wall-clock times of a batch of instants."""
+
+    local: npt.NDArray[Any]  # local wall-clock seconds since the epoch
+    day: npt.NDArray[Any]  # local day number (days since 1970-01-01)
+    offset: npt.NDArray[Any]  # offset used, in stored-field minutes
+
+    def dates(self) -> npt.NDArray[Any]:
+        """Local days as datetime64[D]."""
+        return self.day.astype("datetime64[D]")
+
+
+def to_local(starts: Sequence[float] | npt.NDArray[Any], zone: str | tzinfo | None = None,
+             offsets: Sequence[float | None] | npt.NDArray[Any] | None = None) -> LocalTimes:
+    """Convert epoch starts to local wall time and day numbers in one pass.
+
+    Args:
+        starts: Epoch seconds.
+        zone: Zone for instants without a stored offset (default: UTC).
+        offsets: Stored offsets in minutes (None or NaN where missing). Used as is,
+            so each entry keeps the offset it was recorded with.
+
+    Returns:
+        LocalTimes with local seconds, day numbers and the offsets used.
+    """
+    if np is None:
+        raise ImportError('numpy is required for bulk conversion: pip install "huckleberry-api[analytics]"')
+    starts = np.asarray(starts, dtype=np.float64)
+    if offsets is None:
+        stored = np.full(len(starts), np.nan)
+    else:
+        stored = np.array([np.nan if value is None else value for value in offsets], dtype=np.float64)
+    missing = np.isnan(stored)
+
+    if missing.any():
+        missing_starts = starts[missing]
+        if zone is None:
+            stored[missing] = 0.0
+        else:
+            instants, table = transition_table(zone, float(missing_starts.min()), float(missing_starts.max()))
+            index = np.searchsorted(np.asarray(instants), missing_starts, side="right") - 1
+            stored[missing] = -np.asarray(table, dtype=np.float64)[np.maximum(index, 0)] / 60
+
+    local = starts - stored * 60
+    day = np.floor(local / DAY_SECONDS).astype(np.int64)
+    return LocalTimes(local=local, day=day, offset=stored)
+
+
+def offset_at(instants: list[float], offsets: list[int], timestamp: float) -> int:
+    """Look up a UTC offset (seconds) in a transition_table result."""
+    return offsets[max(bisect.bisect_right(instants, timestamp) - 1, 0)]
+
@@ -0,0 +1,154 @@
+"""Tracing hooks for Huckleberry API.
+
+The hook interface is the subset of the OpenTelemetry tracer API that the
+client needs, so an ``opentelemetry.trace.Tracer`` can be passed directly.
+``RecordingTracer`` is a dependency-free in-process implementation that keeps
+finished spans in memory, for tests and offline diagnostics.
+"""
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Iterator, Protocol
+
+if TYPE_CHECKING:
+    from ._instrument import RpcCall
+
+
+class Span(Protocol):
+    """Span interface used by the client (subset of ``opentelemetry.trace.Span``)."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set a single span attribute."""
+
+    def record_exception(self, exception: BaseException) -> None:
+        """Record an exception raised inside the span."""
+
+
+class Tracer(Protocol):
+    """Tracer interface used by the client (subset of ``opentelemetry.trace.Tracer``)."""
+
+    def start_as_current_span(self, name: str, attributes: dict[str, Any] | None = None) -> ContextManager[Span]:
+        """Start a span that is the parent of spans started inside its context."""
+
+
+def hash_child_uid(child_uid: str) -> str:
+    """Return a stable, non-reversible identifier for a child UID.
+
+    Child UIDs are account data, so spans carry this hash instead of the raw value.
+    """
+    return hashlib.sha256(child_uid.encode()).hexdigest()[:16]
+
+
+@dataclass
+class RecordedSpan:
+    """A finished span captured by RecordingTracer."""
+
+    name: str
+    span_id: int
+    parent_id: int | None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_time: float = 0.0
+    end_time: float = 0.0
+    status: str = "OK"
+    exception: BaseException | None = None
+
+    @property
+    def duration(self) -> float:
+        """Span duration in seconds."""
+        return self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set a single span attribute."""
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException) -> None:
+        """Record an exception and mark the span as failed."""
+        self.exception = exception
+        self.status = "ERROR"
+
+
+class RecordingTracer:
+    """In-process tracer that stores finished spans in memory.
+
+    Parent/child relationships follow the current context, so spans started on
+    the calling thread nest under the enclosing API method span.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty recorder."""
+        self.spans: list[RecordedSpan] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._current: contextvars.ContextVar[RecordedSpan | None] = contextvars.ContextVar(
+            f"huckleberry_span_{id(self)}", default=None
+        )
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, attributes: dict[str, Any] | None = None
+    ) -> Iterator[RecordedSpan]:
+        """Start a span and make it current until the context exits."""
+        parent = self._current.get()
+        span = RecordedSpan(
+            name=name,
+            span_id=next(self._ids),
+            parent_id=parent.span_id if parent else None,
+            attributes=dict(attributes or {}),
+            start_time=time.perf_counter(),
+        )
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as err:
+            span.record_exception(err)
+            raise
+        finally:
+            self._current.reset(token)
+            span.end_time = time.perf_counter()
+            with self._lock:
+                self.spans.append(span)
+
+    def find(self, name: str) -> list[RecordedSpan]:
+        """Return finished spans with the given name, in completion order."""
+        with self._lock:
+            return [span for span in self.spans if span.name == name]
+
+    def children(self, parent: RecordedSpan) -> list[RecordedSpan]:
+        """Return the direct children of a span."""
+        with self._lock:
+            return [span for span in self.spans if span.parent_id == parent.span_id]
+
+    def clear(self) -> None:
+        """Drop all recorded spans."""
+        with self._lock:
+            self.spans.clear()
+
+
+def rpc_span_hook(tracer: Tracer) -> Callable[[RpcCall], ContextManager[Span]]:
+    """Build an RPC hook that opens one span per Firestore call."""
+
+    @contextmanager
+    def hook(call: RpcCall) -> Iterator[Span]:
+        attributes: dict[str, Any] = {
+            "db.system": "firestore",
+            "db.operation": call.operation,
+            "huckleberry.collection": call.collection,
+        }
+        if call.subcollection:
+            attributes["huckleberry.subcollection"] = call.subcollection
+        if call.child_uid:
+            attributes["huckleberry.child_uid_hash"] = hash_child_uid(call.child_uid)
+        with tracer.start_as_current_span(f"firestore.{call.operation}", attributes=attributes) as span:
+            try:
+                yield span
+            finally:
+                span.set_attribute("huckleberry.document_count", call.documents)
+                span.set_attribute("huckleberry.retry_count", call.retries)
+
+    return hook
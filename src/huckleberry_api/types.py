@@ -332,6 +332,45 @@ class FeedIntervalData(TypedDict):
     end_offset_min: NotRequired[float]
 
 
+class ChildDashboard(TypedDict):
+    """Current state of one child across all trackers.
+
+    Returned by HuckleberryAPI.get_dashboard, which reads the sleep, feed,
+    diaper and health documents (and the child profile) of any number of
+    children with one batched request.
+
+    - child: profile as returned by get_children (omitted with include_profile=False)
+    - sleep_timer / feed_timer: current timer state, None if there is no timer
+    - last_sleep / last_nursing / last_side / last_diaper: prefs.last* entries, None if missing
+    - growth: latest growth entry as returned by get_growth_data
+    """
+    child_uid: str
+    child: NotRequired[ChildData | None]
+    sleep_timer: SleepTimerData | None
+    feed_timer: FeedTimerData | None
+    last_sleep: LastSleepData | None
+    last_nursing: LastNursingData | None
+    last_side: LastSideData | None
+    last_diaper: LastDiaperData | None
+    growth: GrowthData
+
+
+class IntervalTotals(TypedDict):
+    """Aggregated totals over interval entries in a time range.
+
+    Returned by HuckleberryAPI.get_interval_totals. Regular interval documents
+    are aggregated server-side; entries of multi-entry batch documents are
+    merged in client-side.
+
+    - count: number of entries with start in the range
+    - sums: field name → sum of numeric values (e.g. "duration" for sleep)
+    - averages: field name → mean of numeric values, None if no entry has the field
+    """
+    count: int
+    sums: dict[str, float]
+    averages: dict[str, float | None]
+
+
 # --- Firebase Raw Types (camelCase) ---
 # These types match the exact structure stored in Firestore.
 # Use these when constructing payloads for set() or update().
@@ -0,0 +1,176 @@
+"""Async iterator API for real-time document updates.
+
+``HuckleberryAPI.watch`` returns a WatchStream that turns listener callbacks
+(which arrive on foreign threads) into an ordered async stream, merging any
+number of trackers and children:
+
+    async with api.watch([child_a, child_b], ["sleep", "feed"]) as updates:
+        async for update in updates:
+            print(update.collection, update.child_uid, update.data)
+
+The stream holds at most ``max_pending`` updates. When it is full the
+delivering thread waits for the consumer (backpressure), so pair it with a
+CallbackDispatcher to keep slow consumers from stalling the watch thread.
+Closing the stream, leaving the ``async with`` block or cancelling the
+consuming task unsubscribes its listeners.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator, Sequence
+
+if TYPE_CHECKING:
+    from .api import HuckleberryAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+_stream_ids = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class WatchUpdate:
+    """One update of a watched document."""
+
+    collection: str
+    child_uid: str
+    data: Any  # document dict, or a DocumentDelta for streams with deltas=True
+    received_at: float  # time.time() when the update arrived
+
+
+class WatchStream:
+    """Ordered async stream of updates from several listeners."""
+
+    def __init__(self, api: HuckleberryAPI, child_uids: Sequence[str], collections: Sequence[str],
+                 deltas: bool = False, max_pending: int = 100) -> None:
+        """Initialize the stream; listeners are set up by ``start()`` (or entering/iterating it)."""
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self._api = api
+        self._targets = [(collection, child_uid) for child_uid in child_uids for collection in collections]
+        self._deltas = deltas
+        self._prefix = f"watch{next(_stream_ids)}:"
+        self._keys: list[str] = []
+        self._items: deque[WatchUpdate] = deque()
+        self._space = threading.Semaphore(max_pending)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._ready: asyncio.Event | None = None
+        self._closed = False
+        self._started = False
+        self.dropped = 0  # updates dropped because the stream was full and the event loop delivered them
+
+    async def start(self) -> None:
+        """Subscribe the listeners (in a worker thread, since setup does blocking I/O)."""
+        if self._started:
+            return
+        self._started = True
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        try:
+            await self._loop.run_in_executor(None, self._subscribe)
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self) -> None:
+        """Unsubscribe the listeners and end the stream."""
+        if self._closed:
+            return
+        self._closed = True
+        self._space.release(len(self._items) + 1)  # wake producers waiting for space
+        if self._ready is not None:
+            self._ready.set()
+        if self._keys:
+            keys, self._keys = self._keys, []
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._unsubscribe, keys)
+
+    @property
+    def pending(self) -> int:
+        """Updates received but not consumed yet."""
+        return len(self._items)
+
+    async def __aenter__(self) -> WatchStream:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def __aiter__(self) -> AsyncIterator[WatchUpdate]:
+        await self.start()
+        try:
+            while True:
+                yield await self.next()
+        except StopAsyncIteration:
+            return
+        finally:
+            await self.aclose()
+
+    async def next(self) -> WatchUpdate:
+        """Wait for the next update; raises StopAsyncIteration once the stream is closed."""
+        await self.start()
+        assert self._ready is not None
+        while not self._items:
+            if self._closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        update = self._items.popleft()
+        self._space.release()
+        return update
+
+    def _subscribe(self) -> None:
+        for collection, child_uid in self._targets:
+            key = f"{self._prefix}{collection}_{child_uid}"
+            self._keys.append(key)
+
+            def on_update(data: Any, collection: str = collection, child_uid: str = child_uid) -> None:
+                self._offer(WatchUpdate(collection, child_uid, data, time.time()))
+
+            self._api._setup_listener(collection, child_uid, on_update, self._deltas, key=key)
+
+    def _unsubscribe(self, keys: list[str]) -> None:
+        for key in keys:
+            self._api._stop_listener(key)
+
+    def _offer(self, update: WatchUpdate) -> None:
+        """Hand an update to the event loop, waiting for space unless called on the loop itself."""
+        loop = self._loop
+        if self._closed or loop is None or loop.is_closed():
+            return
+        if self._on_loop_thread(loop):
+            # Waiting here would block the consumer itself: drop the oldest update instead
+            if not self._space.acquire(blocking=False) and self._items:
+                self._items.popleft()
+                self.dropped += 1
+            self._append(update)
+            return
+        while not self._space.acquire(timeout=0.5):
+            if self._closed or loop.is_closed():
+                return
+        if self._closed:
+            return
+        try:
+            loop.call_soon_threadsafe(self._append, update)
+        except RuntimeError:  # loop closed meanwhile
+            _LOGGER.debug("Dropping update for closed event loop")
+
+    @staticmethod
+    def _on_loop_thread(loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
+    def _append(self, update: WatchUpdate) -> None:
+        if self._closed:
+            return
+        self._items.append(update)
+        assert self._ready is not None
+        self._ready.set()
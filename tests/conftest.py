@@ -3,10 +3,12 @@
 These fixtures are automatically discovered by pytest and available to all test files.
 """
 import os
+import time
+from typing import Iterator
 
 import pytest
 
-from huckleberry_api import HuckleberryAPI
+from huckleberry_api import HuckleberryAPI, MemoryBackend
 
 
 @pytest.fixture(scope="module")
@@ -35,3 +37,47 @@ def child_uid(api: HuckleberryAPI) -> str:
     if not children:
         pytest.skip("No children found in test account")
     return children[0]["uid"]
+
+
+OFFLINE_USER_UID = "offline-user"
+OFFLINE_CHILD_UID = "offline-child"
+
+
+@pytest.fixture
+def memory_backend() -> MemoryBackend:
+    """Create an empty in-memory storage backend."""
+    return MemoryBackend()
+
+
+@pytest.fixture
+def memory_api(memory_backend: MemoryBackend) -> Iterator[HuckleberryAPI]:
+    """Create an API instance on the in-memory backend, signed in without network access.
+
+    The store is seeded with one user and one child (OFFLINE_CHILD_UID).
+    """
+    api_instance = HuckleberryAPI(
+        email="offline@example.com", password="offline", timezone="UTC", backend=memory_backend
+    )
+    api_instance.id_token = "offline-token"
+    api_instance.refresh_token = "offline-refresh"
+    api_instance.user_uid = OFFLINE_USER_UID
+    api_instance.token_expires_at = time.time() + 3600
+
+    client = memory_backend.create_client("offline-token")
+    client.collection("users").document(OFFLINE_USER_UID).set({"childList": [{"cid": OFFLINE_CHILD_UID}]})
+    client.collection("childs").document(OFFLINE_CHILD_UID).set({
+        "childsName": "Offline Baby",
+        "birthdate": "2025-01-01",
+        "nightStart": 1140,
+        "morningCutoff": 420,
+    })
+
+    yield api_instance
+
+    api_instance.stop_all_listeners()
+
+
+@pytest.fixture
+def memory_child_uid(memory_api: HuckleberryAPI) -> str:
+    """Child UID seeded into the in-memory store."""
+    return OFFLINE_CHILD_UID
@@ -0,0 +1,77 @@
+"""Smoke tests for the offline benchmark suite."""
+import json
+from pathlib import Path
+
+from benchmarks import concurrency, memory, operations
+from benchmarks.common import write_results
+
+
+class TestOperationsBenchmark:
+    """Keep the benchmark suite runnable."""
+
+    def test_quick_run_counts_operations(self, tmp_path: Path) -> None:
+        """A quick run covers every scenario and reports RPC and read counts."""
+        measurements = operations.run(latency=0.0, repeats=1, quick=True)
+        by_name = {(m.name, tuple(sorted(m.params.items()))): m for m in measurements}
+
+        children = by_name[("get_children", (("children", 5),))]
+        assert children.rpcs == 6  # user document + one read per child
+        assert children.reads == 6
+
+        calendar = [m for m in measurements if m.name == "get_calendar_events"]
+        assert [m.params["days"] for m in calendar] == [1, 7, 30]
+        assert calendar[-1].reads > calendar[0].reads
+        assert all(m.bytes_read > 0 for m in calendar)
+
+        fan_out = next(m for m in measurements if m.name == "log_diaper:fan_out")
+        assert fan_out.listener_reads == 2  # one diaper listener per child
+
+        sequential = by_name[("startup:sequential", (("children", 2),))]
+        pipelined = by_name[("startup:pipelined", (("children", 2),))]
+        assert pipelined.rpcs == 2  # user document + one batched read
+        assert pipelined.rpcs < sequential.rpcs
+
+        output = tmp_path / "results.json"
+        write_results(output, "operations", measurements, {"quick": True})
+        document = json.loads(output.read_text())
+        assert document["suite"] == "operations"
+        assert len(document["results"]) == len(measurements)
+
+
+class TestMemoryBenchmark:
+    """Keep the memory benchmark runnable."""
+
+    def test_records_retain_less_than_dicts(self) -> None:
+        """Every tracker is measured in both forms, and records are smaller."""
+        measurements = memory.run(days=7, multi_docs=1, multi_entries=10)
+        by_key = {(m.name, m.params["form"]): m.extra for m in measurements}
+
+        assert len(by_key) == 8
+        for collection in memory.GETTERS:
+            dicts = by_key[(f"history_memory:{collection}", "dict")]
+            records = by_key[(f"history_memory:{collection}", "record")]
+            assert dicts["entries"] == records["entries"] > 0
+            assert records["bytes_retained"] < dicts["bytes_retained"]
+
+    def test_session_memory(self) -> None:
+        """Per-account session memory is reported for each pool size."""
+        measurements = memory.run_sessions((5,))
+        assert measurements[0].extra["listeners"] == 5
+        assert measurements[0].extra["bytes_per_account"] > 0
+
+
+class TestConcurrencyBenchmark:
+    """Keep the concurrency stress benchmark runnable."""
+
+    def test_threads_scale_and_refresh_once(self) -> None:
+        """The benchmark runs every scenario (timings are not asserted; see test_thread_safety)."""
+        measurements = concurrency.run(latency=0.005, calls=16, thread_counts=(1, 8), backfill_days=120)
+        throughput = [m for m in measurements if m.name == "concurrency:get_sleep_intervals"]
+        assert [m.params["threads"] for m in throughput] == [1, 8]
+
+        herds = [m for m in measurements if m.name == "concurrency:token_refresh"]
+        assert [m.extra["refreshes"] for m in herds] == [1, 1]
+        assert all(m.extra["listeners"] == 1 for m in herds)  # recreated once, not per thread
+
+        backfills = [m for m in measurements if m.name == "concurrency:sharded_backfill"]
+        assert len({m.extra["entries"] for m in backfills}) == 1  # same entries however the range is split
@@ -0,0 +1,87 @@
+"""Read cache tests for Huckleberry API (offline, on the in-memory backend)."""
+import time
+
+import pytest
+
+from huckleberry_api import HuckleberryAPI, MemoryBackend, ReadCache
+from huckleberry_api.memory import MemoryDocumentReference
+
+
+def _cached_api(backend: MemoryBackend, cache: ReadCache) -> HuckleberryAPI:
+    api = HuckleberryAPI("offline@example.com", "offline", "UTC", backend=backend, read_cache=cache)
+    api.id_token, api.user_uid, api.token_expires_at = "offline-token", "offline-user", time.time() + 3600
+    return api
+
+
+class TestReadCache:
+    """Test TTL caching and invalidation."""
+
+    def test_children_served_locally_until_ttl(self, memory_api: HuckleberryAPI,
+                                               memory_backend: MemoryBackend) -> None:
+        """Repeated get_children calls make no RPCs until the TTL passes; callers get copies."""
+        cache = ReadCache({"get_children": 0.2})
+        api = _cached_api(memory_backend, cache)
+
+        first = api.get_children()
+        rpcs = memory_backend.stats.rpcs
+        first[0]["name"] = "changed by caller"
+        assert api.get_children()[0]["name"] == "Offline Baby"
+        assert memory_backend.stats.rpcs == rpcs
+        assert cache.stats.hits == 1
+
+        time.sleep(0.25)
+        api.get_children()
+        assert memory_backend.stats.rpcs == rpcs + 2
+
+    def test_own_writes_invalidate(self, memory_api: HuckleberryAPI, memory_backend: MemoryBackend,
+                                   memory_child_uid: str) -> None:
+        """log_growth drops the cached growth data of its child."""
+        api = _cached_api(memory_backend, ReadCache())
+        memory_backend.create_client("t").collection("health").document(memory_child_uid).set({"prefs": {}})
+
+        api.log_growth(memory_child_uid, weight=3.5)
+        assert api.get_growth_data(memory_child_uid)["weight"] == 3.5
+        api.log_growth(memory_child_uid, weight=4.0)
+        assert api.get_growth_data(memory_child_uid)["weight"] == 4.0
+
+    def test_listener_snapshots_invalidate(self, memory_api: HuckleberryAPI, memory_backend: MemoryBackend,
+                                           memory_child_uid: str) -> None:
+        """Changes made elsewhere are picked up as soon as a listener on the document sees them."""
+        cache = ReadCache()
+        api = _cached_api(memory_backend, cache)
+        other = memory_backend.create_client("t").collection("health").document(memory_child_uid)
+        other.set({"prefs": {"lastGrowthEntry": {"weight": 3.0, "start": 1}}})
+
+        assert api.get_growth_data(memory_child_uid)["weight"] == 3.0
+        api.setup_health_listener(memory_child_uid, lambda data: None)
+        other.set({"prefs": {"lastGrowthEntry": {"weight": 3.2, "start": 2}}})
+        assert api.get_growth_data(memory_child_uid)["weight"] == 3.2
+        assert cache.stats.invalidations >= 1
+        api.stop_all_listeners()
+
+    def test_failed_read_not_cached(self, memory_api: HuckleberryAPI, memory_backend: MemoryBackend,
+                                    memory_child_uid: str, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A failed read returns the empty fallback once; the next read after recovery returns real data."""
+        cache = ReadCache()
+        api = _cached_api(memory_backend, cache)
+        memory_backend.create_client("t").collection("health").document(memory_child_uid).set(
+            {"prefs": {"lastGrowthEntry": {"weight": 3.0, "start": 1}}})
+        get = MemoryDocumentReference.get
+
+        def unavailable(*args: object, **kwargs: object) -> None:
+            raise ConnectionError("Firestore unavailable")
+
+        monkeypatch.setattr(MemoryDocumentReference, "get", unavailable)
+        assert "weight" not in api.get_growth_data(memory_child_uid)
+        monkeypatch.setattr(MemoryDocumentReference, "get", get)
+        assert api.get_growth_data(memory_child_uid)["weight"] == 3.0
+        assert len(cache) == 1
+
+    def test_size_bound_and_unknown_methods(self) -> None:
+        """The least recently used results are evicted; methods without known dependencies are refused."""
+        cache = ReadCache(max_entries=2)
+        for child in ("a", "b", "c"):
+            cache.load("get_growth_data", repr((child,)), child, lambda: {"weight": 1})
+        assert len(cache) == 2 and cache.stats.evictions == 1
+        with pytest.raises(ValueError):
+            ReadCache({"get_calendar_events": 60})
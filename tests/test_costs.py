@@ -0,0 +1,142 @@
+"""Cost meter tests for Huckleberry API (offline, on the in-memory backend)."""
+import time
+from typing import Any
+
+import pytest
+
+from huckleberry_api import BudgetExceededError, CostBudget, CostMeter, HuckleberryAPI, MemoryBackend
+
+
+class _TokenResponse:
+    """Stand-in for the token endpoint's response."""
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict[str, Any]:
+        return {"id_token": "refreshed-token", "refresh_token": "refreshed", "expires_in": "3600"}
+
+
+def _metered_api(backend: MemoryBackend, meter: CostMeter) -> HuckleberryAPI:
+    api = HuckleberryAPI("offline@example.com", "offline", "UTC", backend=backend, cost_meter=meter)
+    api.id_token, api.user_uid, api.token_expires_at = "offline-token", "offline-user", time.time() + 3600
+    return api
+
+
+def _seed_history(backend: MemoryBackend, child_uid: str) -> None:
+    client = backend.create_client("offline-token")
+    for collection, subcollection in (("sleep", "intervals"), ("feed", "intervals"), ("diaper", "data"),
+                                      ("health", "data")):
+        intervals = client.collection(collection).document(child_uid).collection(subcollection)
+        intervals.document("a").set({"start": 100, "duration": 60, "mode": "pee", "type": "health"})
+        intervals.document("batch").set({"multi": True, "data": {"x": {"start": 200, "duration": 5}}})
+
+
+class TestCostMeter:
+    """Test cost accounting and budgets."""
+
+    def test_counts_per_method_child_and_account(self, memory_api: HuckleberryAPI, memory_backend: MemoryBackend,
+                                                 memory_child_uid: str) -> None:
+        """Calendar reads are attributed to the outermost method, writes and deletes are counted apart."""
+        _seed_history(memory_backend, memory_child_uid)
+        meter = CostMeter()
+        api = _metered_api(memory_backend, meter)
+
+        api.get_calendar_events(memory_child_uid, 0, 1000)
+        api.start_sleep(memory_child_uid)
+        api.cancel_sleep(memory_child_uid)
+
+        calendar = meter.by_method()["get_calendar_events"]
+        assert calendar.reads == 8  # one regular document and one batch in each of four trackers
+        assert "get_sleep_intervals" not in meter.by_method()
+        assert meter.by_method()["start_sleep"].writes == 1
+        assert meter.by_child()[memory_child_uid].reads >= 8
+        assert meter.by_account()["offline-user"].writes == 2
+        assert meter.total().deletes == 0
+
+    def test_listener_snapshots_are_reads(self, memory_api: HuckleberryAPI, memory_backend: MemoryBackend,
+                                          memory_child_uid: str) -> None:
+        """Every listener snapshot is billed one read per delivered document."""
+        meter = CostMeter()
+        api = _metered_api(memory_backend, meter)
+        api.setup_realtime_listener(memory_child_uid, lambda data: None)
+        api.start_sleep(memory_child_uid)
+        api.stop_all_listeners()
+
+        # The initial snapshot of the missing document is billed too
+        assert meter.by_method()["listener:sleep"].reads == 2
+
+    def test_batched_get_bills_missing_documents(self, memory_api: HuckleberryAPI, memory_backend: MemoryBackend,
+                                                 memory_child_uid: str) -> None:
+        """get_dashboard is billed for every requested document, including trackers never written."""
+        meter = CostMeter()
+        api = _metered_api(memory_backend, meter)
+        memory_backend.create_client("t").collection("sleep").document(memory_child_uid).set({"prefs": {}})
+
+        api.get_dashboard(memory_child_uid)
+        assert meter.by_method()["get_dashboard"].reads == 5  # four trackers, one of them stored, and the profile
+
+    def test_hard_budget_raises(self, memory_api: HuckleberryAPI, memory_backend: MemoryBackend,
+                                memory_child_uid: str) -> None:
+        """A method starting after a hard budget is used up raises before any RPC."""
+        budget = CostBudget(reads=2, hard=True)
+        meter = CostMeter([budget])
+        api = _metered_api(memory_backend, meter)
+
+        api.get_children()  # user and child documents
+        with pytest.raises(BudgetExceededError) as excinfo:
+            api.get_children()
+        assert excinfo.value.usage.reads == 2
+        assert meter.usage(budget, "offline-user").reads == 2
+
+    def test_hard_budget_spares_sessions_and_other_operations(self, memory_api: HuckleberryAPI,
+                                                              memory_backend: MemoryBackend,
+                                                              memory_child_uid: str) -> None:
+        """An exhausted reads budget refuses reads only; token refresh, listeners and blind writes still run."""
+        budget = CostBudget(reads=1, hard=True)
+        api = _metered_api(memory_backend, CostMeter([budget]))
+        api.refresh_token = "offline-refresh"
+        api._post_auth = lambda *args: _TokenResponse()  # type: ignore[method-assign]
+        memory_backend.create_client("t").collection("diaper").document(memory_child_uid).set({"prefs": {}})
+
+        api.get_growth_data(memory_child_uid)
+        with pytest.raises(BudgetExceededError):
+            api.get_growth_data(memory_child_uid)
+        api.setup_realtime_listener(memory_child_uid, lambda data: None)
+        api.refresh_auth_token()
+        api.maintain_session()
+        api.log_diaper(memory_child_uid, mode="pee")
+        assert api.id_token == "refreshed-token"
+        assert len(api._listeners) == 1
+        with pytest.raises(BudgetExceededError):
+            api.pause_sleep(memory_child_uid)  # reads the timer before writing
+        api.stop_all_listeners()
+
+    def test_writes_budget_spares_reads(self, memory_api: HuckleberryAPI, memory_backend: MemoryBackend,
+                                        memory_child_uid: str) -> None:
+        """An exhausted writes budget refuses writes only."""
+        api = _metered_api(memory_backend, CostMeter([CostBudget(writes=1, hard=True)]))
+        memory_backend.create_client("t").collection("diaper").document(memory_child_uid).set({"prefs": {}})
+
+        api.log_diaper(memory_child_uid, mode="pee")
+        with pytest.raises(BudgetExceededError):
+            api.log_diaper(memory_child_uid, mode="poo")
+        assert api.get_growth_data(memory_child_uid) is not None
+
+    def test_soft_budget_serves_last_result(self, memory_api: HuckleberryAPI, memory_backend: MemoryBackend,
+                                            memory_child_uid: str) -> None:
+        """Over a soft budget, reads repeat their last result and writes still run."""
+        meter = CostMeter([CostBudget(reads=4, scope="child")])
+        api = _metered_api(memory_backend, meter)
+        _seed_history(memory_backend, memory_child_uid)
+
+        first = api.get_sleep_intervals(memory_child_uid, 0, 1000)
+        api.get_feed_intervals(memory_child_uid, 0, 1000)
+        reads = meter.total().reads
+        api.start_sleep(memory_child_uid)
+        assert api.get_sleep_intervals(memory_child_uid, 0, 1000) == first
+
+        assert meter.total().reads == reads
+        assert meter.fallbacks == 1
+        assert api.get_sleep_intervals(memory_child_uid, 0, 999) is not None  # not remembered: runs
+        assert meter.fallbacks == 1
@@ -0,0 +1,73 @@
+"""Delta listener tests for Huckleberry API (offline)."""
+from typing import Any
+
+import pytest
+
+from huckleberry_api import DocumentDelta, FieldChange, HuckleberryAPI
+from huckleberry_api.deltas import MISSING, diff_documents
+
+
+class TestDiffDocuments:
+    """Test field-level diffs."""
+
+    def test_nested_changes(self) -> None:
+        """Maps are compared field by field; added, removed and replaced fields are reported."""
+        old = {"timer": {"active": True, "paused": False}, "prefs": {"lastSide": {"side": "left"}}, "gone": 1}
+        new = {"timer": {"active": True, "paused": True}, "prefs": {"lastSide": "right"}, "added": [1, 2]}
+
+        assert diff_documents(old, new) == [
+            FieldChange("timer.paused", False, True),
+            FieldChange("prefs.lastSide", {"side": "left"}, "right"),
+            FieldChange("gone", 1, MISSING),
+            FieldChange("added", MISSING, [1, 2]),
+        ]
+        assert diff_documents(new, new) == []
+
+    def test_delta_helpers(self) -> None:
+        """changed() matches a path, its parents and its children."""
+        delta = DocumentDelta({}, (FieldChange("timer.paused", False, True),))
+        assert delta.changed("timer") and delta.changed("timer.paused.x") and not delta.changed("prefs")
+        assert delta.get("timer.paused") == FieldChange("timer.paused", False, True)
+        assert delta.paths == ("timer.paused",)
+
+
+class TestDeltaListeners:
+    """Test listener delivery on the in-memory backend."""
+
+    def test_deltas_and_duplicate_suppression(self, memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+        """Only changes are delivered, and unchanged snapshots are not delivered at all."""
+        ref = memory_api._get_firestore_client().collection("sleep").document(memory_child_uid)
+        ref.set({"timer": {"active": False}, "prefs": {}})
+        deltas: list[DocumentDelta] = []
+        memory_api.setup_realtime_listener(memory_child_uid, deltas.append, deltas=True)
+
+        ref.set({"timer": {"active": False}, "prefs": {}})  # same content, new update time
+        ref.update({"timer.active": True})
+
+        assert [delta.initial for delta in deltas] == [True, False]
+        assert deltas[1].changes == (FieldChange("timer.active", False, True),)
+        assert deltas[1].document["timer"] == {"active": True}
+
+    def test_resubscription_after_refresh_is_suppressed(self, memory_api: HuckleberryAPI, memory_child_uid: str,
+                                                        monkeypatch: pytest.MonkeyPatch) -> None:
+        """Listeners recreated after a token refresh keep their options and skip unchanged state."""
+        ref = memory_api._get_firestore_client().collection("feed").document(memory_child_uid)
+        ref.set({"prefs": {"lastSide": {"side": "left"}}})
+        deltas: list[DocumentDelta] = []
+        memory_api.setup_feed_listener(memory_child_uid, deltas.append, deltas=True)
+
+        class _Response:
+            status_code = 200
+
+            def raise_for_status(self) -> None:
+                pass
+
+            def json(self) -> dict[str, Any]:
+                return {"id_token": "new-token", "refresh_token": "new-refresh", "expires_in": "3600"}
+
+        monkeypatch.setattr(memory_api, "_post_auth", lambda *args: _Response())
+        memory_api.refresh_auth_token()
+        ref.update({"prefs.lastSide.side": "right"})
+
+        assert len(deltas) == 2
+        assert deltas[1].changes == (FieldChange("prefs.lastSide.side", "left", "right"),)
@@ -0,0 +1,95 @@
+"""Callback dispatch tests for Huckleberry API (offline)."""
+import threading
+import time
+
+from huckleberry_api import CallbackDispatcher, DocumentDelta, FieldChange, HuckleberryAPI, MemoryBackend
+
+
+def _wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.005)
+
+
+class TestCallbackDispatcher:
+    """Test queueing, dropping and coalescing."""
+
+    def _blocked(self, dispatcher: CallbackDispatcher, delivered: list[int]) -> threading.Event:
+        release = threading.Event()
+        dispatcher.dispatch("listener", release.wait)  # occupies the listener until released
+        _wait_for(lambda: dispatcher.depth("listener") == 0)
+        for index in range(5):
+            dispatcher.dispatch("listener", lambda index=index: delivered.append(index))
+        return release
+
+    def test_bounded_queue_drops_oldest(self) -> None:
+        """A full queue drops its oldest snapshot; deliveries stay in order."""
+        dispatcher = CallbackDispatcher(max_pending=3)
+        delivered: list[int] = []
+        release = self._blocked(dispatcher, delivered)
+
+        assert dispatcher.depth("listener") == 3
+        assert dispatcher.stats().pending == 3
+        release.set()
+        _wait_for(lambda: len(delivered) == 3)
+        dispatcher.shutdown()
+
+        assert delivered == [2, 3, 4]
+        stats = dispatcher.stats()
+        assert (stats.submitted, stats.delivered, stats.dropped, stats.max_depth) == (6, 4, 2, 3)
+
+    def test_latest_wins(self) -> None:
+        """With coalescing only the newest pending snapshot is delivered."""
+        dispatcher = CallbackDispatcher(coalesce=True)
+        delivered: list[int] = []
+        release = self._blocked(dispatcher, delivered)
+        release.set()
+        dispatcher.shutdown()
+
+        assert delivered == [4]
+        assert dispatcher.stats().coalesced == 4
+
+    def test_failures_are_counted(self) -> None:
+        """A failing callback does not stop later deliveries."""
+        dispatcher = CallbackDispatcher()
+        delivered: list[int] = []
+        dispatcher.dispatch("listener", lambda: 1 / 0)
+        dispatcher.dispatch("listener", lambda: delivered.append(1))
+        dispatcher.shutdown()
+
+        assert delivered == [1]
+        assert dispatcher.stats().failed == 1
+
+
+def test_coalesced_listener_deltas(memory_backend: MemoryBackend) -> None:
+    """A slow listener gets one delta covering every coalesced change, off the writer's thread."""
+    dispatcher = CallbackDispatcher(coalesce=True)
+    api = HuckleberryAPI(email="offline@example.com", password="offline", timezone="UTC",
+                         backend=memory_backend, dispatcher=dispatcher)
+    api.id_token, api.token_expires_at = "offline-token", time.time() + 3600
+    ref = memory_backend.create_client("seed").collection("sleep").document("child")
+    ref.set({"timer": {"active": False, "paused": False}})
+
+    started, release = threading.Event(), threading.Event()
+    deltas: list[DocumentDelta] = []
+    threads: set[str] = set()
+
+    def on_sleep(delta: DocumentDelta) -> None:
+        threads.add(threading.current_thread().name)
+        deltas.append(delta)
+        started.set()
+        release.wait()
+
+    api.setup_realtime_listener("child", on_sleep, deltas=True)
+    started.wait(2)
+    ref.update({"timer.active": True})
+    ref.update({"timer.paused": True})
+    ref.update({"timer.paused": False})  # back to the delivered value of this field
+    release.set()
+    _wait_for(lambda: len(deltas) == 2)
+    api.stop_all_listeners()
+    dispatcher.shutdown()
+
+    assert deltas[1].changes == (FieldChange("timer.active", False, True),)
+    assert threading.current_thread().name not in threads
+    assert dispatcher.stats().coalesced == 2
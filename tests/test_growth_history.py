@@ -0,0 +1,93 @@
+"""Growth history analytics tests for Huckleberry API (offline)."""
+from datetime import datetime, timezone
+
+import pytest
+
+from huckleberry_api import HuckleberryAPI
+
+np = pytest.importorskip("numpy")
+
+from huckleberry_api.growth import growth_history, percentiles, reference_values, z_scores  # noqa: E402
+
+BIRTH = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+DAY = 86400
+
+
+class TestGrowthHistory:
+    """Test unit normalization, velocity, interpolation and reference lookups."""
+
+    def test_units_normalized_and_sorted(self) -> None:
+        """Imperial entries are converted to kg and cm; entries without measurements are dropped."""
+        history = growth_history([
+            {"start": BIRTH + 30 * DAY, "weight": 10.0, "weightUnits": "lbs", "head": 14.5, "headUnits": "hin"},
+            {"start": BIRTH, "weight": 3.5, "weightUnits": "kg", "height": 50.0, "heightUnits": "cm"},
+            {"start": BIRTH + 10 * DAY, "mode": "medication"},
+            {"start": BIRTH + 20 * DAY, "weight": 4.0},  # units missing: metric, as log_growth defaults
+        ], birthday="2025-01-01", sex="girl")
+
+        assert history.age_days.tolist() == [0, 20, 30]
+        assert history.weight_kg == pytest.approx([3.5, 4.0, 4.5359237])
+        assert history.head_cm[2] == pytest.approx(36.83)
+        assert np.isnan(history.height_cm[1:]).all()
+
+    def test_velocity_and_interpolation(self) -> None:
+        """Rates between consecutive measurements; values are interpolated, not extrapolated."""
+        history = growth_history([
+            {"start": BIRTH + 10 * DAY, "weight": 4.0},
+            {"start": BIRTH + 24 * DAY, "weight": 4.7},
+            {"start": BIRTH + 24 * DAY, "height": 54.0},
+        ], birthday="2025-01-01")
+
+        ages, rates = history.velocity("weight", per_days=7)
+        assert ages.tolist() == [17] and rates == pytest.approx([0.35])
+        values = history.at_age("weight", [10, 17, 30])
+        assert values[:2] == pytest.approx([4.0, 4.35]) and np.isnan(values[2])
+        assert np.isnan(history.percentiles("weight")).all()  # sex unknown
+
+    def test_reference_lookups(self) -> None:
+        """The median has z 0 and percentile 50; z-scores round-trip through the reference values."""
+        ages = np.array([0.0, 45.0, 365.0])
+        median = reference_values("weight", "boy", ages)
+        assert z_scores("weight", "boy", ages, median) == pytest.approx([0, 0, 0], abs=1e-9)
+        assert percentiles([-1.96, 0, 1.96]) == pytest.approx([2.5, 50, 97.5], abs=0.01)
+
+        heavy = reference_values("weight", "girl", ages, z=2.0)
+        assert z_scores("weight", "girl", ages, heavy) == pytest.approx([2, 2, 2])
+        assert np.isnan(z_scores("head", "boy", [800], [50])).all()  # beyond 24 months
+
+
+# Published WHO percentiles (P3, P50, P97) at birth and at 12 months, in kg or cm
+WHO_PERCENTILES = {
+    ("weight", "boy"): {0: (2.5, 3.3, 4.3), 365: (7.8, 9.6, 11.8)},
+    ("weight", "girl"): {0: (2.4, 3.2, 4.2), 365: (7.1, 8.9, 11.3)},
+    ("height", "boy"): {0: (46.3, 49.9, 53.4), 365: (71.3, 75.7, 80.2)},
+    ("height", "girl"): {0: (45.6, 49.1, 52.7), 365: (69.2, 74.0, 78.8)},
+    ("head", "boy"): {0: (32.1, 34.5, 36.9), 365: (43.6, 46.1, 48.5)},
+    ("head", "girl"): {0: (31.7, 33.9, 36.1), 365: (42.3, 44.9, 47.4)},
+}
+
+
+@pytest.mark.parametrize(("measure", "sex"), list(WHO_PERCENTILES))
+def test_reference_tables_match_who_percentiles(measure: str, sex: str) -> None:
+    """The bundled LMS tables reproduce the published WHO P3, P50 and P97 values."""
+    z = 1.880793608  # P97
+    for age_days, published in WHO_PERCENTILES[(measure, sex)].items():
+        values = reference_values(measure, sex, [age_days] * 3, [-z, 0.0, z])
+        assert np.round(values, 1).tolist() == list(published)
+
+
+def test_api_growth_history(memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+    """get_growth_history reads the child's birthday and sex and all logged entries."""
+    client = memory_api._get_firestore_client()
+    client.collection("childs").document(memory_child_uid).update({"gender": "boy"})
+    data = client.collection("health").document(memory_child_uid).collection("data")
+    data.document("a").set({"start": BIRTH + 2 * DAY, "type": "health", "mode": "growth", "weight": 7.7,
+                            "weightUnits": "lbs"})
+    data.document("batch").set({"multi": True, "data": {"x": {"start": BIRTH + 40 * DAY, "height": 55.0,
+                                                              "heightUnits": "cm"}}})
+
+    history = memory_api.get_growth_history(memory_child_uid)
+
+    assert history.age_days.tolist() == [2, 40]
+    assert history.weight_kg[0] == pytest.approx(7.7 * 0.45359237)
+    assert 0 < history.percentiles("height")[1] < 100
@@ -0,0 +1,99 @@
+"""Live interval window tests for Huckleberry API (offline, on the in-memory backend)."""
+import time
+from typing import Any
+
+from huckleberry_api import CallbackDispatcher, HuckleberryAPI, IntervalWindow, MemoryBackend, SleepInterval
+
+
+class TestIntervalListener:
+    """Test query listeners keeping an interval window current."""
+
+    def test_window_follows_history_edits(self, memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+        """Added, edited and deleted entries (regular and batched) are applied incrementally."""
+        now = int(time.time())
+        client = memory_api._get_firestore_client()
+        intervals = client.collection("sleep").document(memory_child_uid).collection("intervals")
+        intervals.document("recent").set({"start": now - 3600, "duration": 600, "offset": 0})
+        intervals.document("ancient").set({"start": now - 30 * 86400, "duration": 600, "offset": 0})
+        intervals.document("batch").set({"multi": True, "data": {
+            "e1": {"start": now - 7200, "duration": 60},
+            "e2": {"start": now - 40 * 86400, "duration": 60},
+        }})
+        updates: list[int] = []
+        window = memory_api.setup_interval_listener(memory_child_uid, "sleep", window=86400,
+                                                    callback=lambda window: updates.append(window.version))
+
+        assert isinstance(window, IntervalWindow)
+        assert [record.start_sec for record in window.records()] == [now - 7200, now - 3600]
+        assert updates == [1, 2]  # initial snapshot of each query
+
+        intervals.document("new").set({"start": now - 60, "duration": 30, "offset": 0})
+        intervals.document("recent").update({"duration": 900})
+        intervals.document("batch").update({"data.e1.duration": 120})
+        records = window.records()
+        assert records == [
+            SleepInterval(now - 7200, 120),
+            SleepInterval(now - 3600, 900, 0),
+            SleepInterval(now - 60, 30, 0),
+        ]
+
+        intervals.document("recent").delete()
+        assert [record.start_sec for record in window.records()] == [now - 7200, now - 60]
+        assert window.records(now - 600) == [SleepInterval(now - 60, 30, 0)]
+
+        # Only changed documents are re-read
+        memory_api._backend.reset_stats()
+        intervals.document("other").set({"start": now - 30, "duration": 10})
+        assert memory_api._backend.stats.listener_reads == 1
+
+    def test_stop_and_refresh(self, memory_api: HuckleberryAPI, memory_child_uid: str,
+                              monkeypatch: Any) -> None:
+        """Listeners are recreated on token refresh and removed by stop_interval_listener."""
+        now = int(time.time())
+        intervals = memory_api._get_firestore_client().collection("feed").document(
+            memory_child_uid).collection("intervals")
+        intervals.document("a").set({"start": now - 60, "leftDuration": 5})
+        window = memory_api.setup_interval_listener(memory_child_uid, "feed")
+        assert len(memory_api._listeners) == 2
+
+        class _Response:
+            def raise_for_status(self) -> None:
+                pass
+
+            def json(self) -> dict[str, Any]:
+                return {"id_token": "new-token", "refresh_token": "new-refresh", "expires_in": "3600"}
+
+        monkeypatch.setattr(memory_api, "_post_auth", lambda *args: _Response())
+        memory_api.refresh_auth_token()
+        intervals.document("b").set({"start": now - 30, "leftDuration": 7})
+        assert [record.left_duration_sec for record in window.records()] == [5, 7]
+
+        memory_api.stop_interval_listener(memory_child_uid, "feed")
+        intervals.document("c").set({"start": now - 10, "leftDuration": 9})
+        assert len(window) == 2
+        assert memory_api._listeners == {}
+
+    def test_coalesced_snapshots_lose_nothing(self, memory_api: HuckleberryAPI, memory_backend: MemoryBackend,
+                                              memory_child_uid: str) -> None:
+        """A coalescing dispatcher drops pending snapshots; the window still ends up matching the query."""
+        now = int(time.time())
+        intervals = memory_backend.create_client("t").collection("sleep").document(
+            memory_child_uid).collection("intervals")
+        intervals.document("kept").set({"start": now - 3600, "duration": 600})
+        intervals.document("deleted").set({"start": now - 1800, "duration": 600})
+        dispatcher = CallbackDispatcher(coalesce=True, max_workers=1)
+        api = HuckleberryAPI("offline@example.com", "offline", "UTC", backend=memory_backend, dispatcher=dispatcher)
+        api.id_token, api.user_uid, api.token_expires_at = "offline-token", "offline-user", time.time() + 3600
+
+        window = api.setup_interval_listener(memory_child_uid, "sleep", window=86400,
+                                             callback=lambda window: time.sleep(0.02))
+        for index in range(10):
+            intervals.document(f"new{index}").set({"start": now - 600 + index, "duration": 10})
+        intervals.document("kept").update({"duration": 900})
+        intervals.document("deleted").delete()
+        dispatcher.shutdown()
+        api.stop_all_listeners()
+
+        assert dispatcher.stats().coalesced > 0
+        expected = [SleepInterval(now - 3600, 900)] + [SleepInterval(now - 600 + index, 10) for index in range(10)]
+        assert window.records() == expected
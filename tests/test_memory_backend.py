@@ -0,0 +1,363 @@
+"""In-memory backend tests for Huckleberry API (offline)."""
+import time
+from typing import Any
+
+import pytest
+
+from huckleberry_api import HuckleberryAPI, MemoryBackend
+from huckleberry_api.memory import DELETE_FIELD, DocumentNotFoundError, FieldFilter, MemoryAggregationQuery
+
+
+class TestMemoryDocuments:
+    """Test document operations of the in-memory store."""
+
+    def test_set_merge_and_update(self, memory_backend: MemoryBackend) -> None:
+        """set(merge=True) deep-merges and update() applies dotted field paths."""
+        doc = memory_backend.create_client("t").collection("sleep").document("c1")
+        doc.set({"timer": {"active": True, "paused": False}, "prefs": {"a": 1}})
+        doc.set({"timer": {"paused": True}}, merge=True)
+        doc.update({"prefs.b.c": 2, "timer.active": DELETE_FIELD})
+
+        data = doc.get().to_dict()
+        assert data == {"timer": {"paused": True}, "prefs": {"a": 1, "b": {"c": 2}}}
+
+    def test_update_missing_document_raises(self, memory_backend: MemoryBackend) -> None:
+        """update() requires an existing document, as in Firestore."""
+        doc = memory_backend.create_client("t").collection("diaper").document("missing")
+        with pytest.raises(DocumentNotFoundError):
+            doc.update({"prefs.x": 1})
+
+    def test_snapshot_is_a_copy(self, memory_backend: MemoryBackend) -> None:
+        """Mutating returned data does not change the store."""
+        doc = memory_backend.create_client("t").collection("feed").document("c1")
+        doc.set({"timer": {"active": True}})
+        doc.get().to_dict()["timer"]["active"] = False
+        assert doc.get().to_dict() == {"timer": {"active": True}}
+
+    def test_injected_latency(self) -> None:
+        """Each RPC sleeps for the configured latency."""
+        backend = MemoryBackend(latency=0.02)
+        doc = backend.create_client("t").collection("feed").document("c1")
+        started = time.perf_counter()
+        doc.set({"a": 1})
+        doc.get()
+        assert time.perf_counter() - started >= 0.04
+
+
+class TestMemoryQueries:
+    """Test queries of the in-memory store."""
+
+    def test_where_and_order_by(self, memory_backend: MemoryBackend) -> None:
+        """Range filters and ordering behave like Firestore."""
+        intervals = memory_backend.create_client("t").collection("sleep").document("c1").collection("intervals")
+        for doc_id, start in (("a", 30), ("b", 10), ("c", 20), ("d", 50)):
+            intervals.document(doc_id).set({"start": start})
+        intervals.document("multi").set({"multi": True, "data": {}})
+
+        docs = intervals.where(filter=FieldFilter("start", ">=", 10)).where(
+            filter=FieldFilter("start", "<", 50)
+        ).order_by("start").stream()
+        assert [doc.id for doc in docs] == ["b", "c", "a"]
+
+        multi = list(intervals.where(filter=FieldFilter("multi", "==", True)).stream())
+        assert [doc.id for doc in multi] == ["multi"]
+
+        newest = list(intervals.order_by("start", direction="DESCENDING").limit(1).stream())
+        assert newest[0].id == "d"
+
+    def test_field_projection(self) -> None:
+        """select() and get(field_paths) return only the requested fields and count fewer bytes."""
+        backend = MemoryBackend(measure_bytes=True)
+        client = backend.create_client("token")
+        ref = client.collection("sleep").document("c1")
+        ref.set({"prefs": {"lastSleep": {"start": 1}, "notes": "x" * 500}, "timer": {"active": False}})
+
+        assert ref.get(field_paths=["prefs.lastSleep"]).to_dict() == {"prefs": {"lastSleep": {"start": 1}}}
+        projected = backend.reset_stats().bytes_read
+        ref.get()
+        assert projected < backend.reset_stats().bytes_read
+
+        intervals = client.collection("sleep/c1/intervals")
+        intervals.document("a").set({"start": 5, "duration": 10, "details": {"notes": "long"}})
+        assert [doc.to_dict() for doc in intervals.select(["start", "missing"]).where("start", ">", 0).stream()] == [
+            {"start": 5}]
+
+    def test_aggregation_query(self, memory_backend: MemoryBackend) -> None:
+        """count/sum/avg return one row and bill one read per 1000 matches."""
+        intervals = memory_backend.create_client("t").collection("sleep").document("c1").collection("intervals")
+        for index in range(1500):
+            intervals.document(f"d{index}").set({"start": index, "duration": 2})
+        memory_backend.reset_stats()
+
+        row = intervals.where(filter=FieldFilter("start", "<", 1200)).count(alias="n").sum(
+            "duration", alias="total").avg("duration", alias="mean").get()[0]
+
+        assert {result.alias: result.value for result in row} == {"n": 1200, "total": 2400, "mean": 2.0}
+        assert memory_backend.stats.rpcs == 1
+        assert memory_backend.stats.reads == 2
+
+
+class TestMemoryListeners:
+    """Test snapshot listeners of the in-memory store."""
+
+    def test_document_listener(self, memory_backend: MemoryBackend) -> None:
+        """Listeners get the initial state, every write, and nothing after unsubscribe."""
+        doc = memory_backend.create_client("t").collection("sleep").document("c1")
+        received: list[Any] = []
+        watch = doc.on_snapshot(lambda docs, changes, read_time: received.append(docs[0].to_dict()))
+
+        doc.set({"timer": {"active": True}})
+        watch.unsubscribe()
+        doc.set({"timer": {"active": False}})
+
+        assert received == [None, {"timer": {"active": True}}]
+
+    def test_query_listener(self, memory_backend: MemoryBackend) -> None:
+        """Query listeners get the initial results, then added, modified and removed documents."""
+        intervals = memory_backend.create_client("t").collection("sleep/c1/intervals")
+        intervals.document("a").set({"start": 100})
+        received: list[list[tuple[str, str]]] = []
+        watch = intervals.where("start", ">=", 50).on_snapshot(
+            lambda docs, changes, read_time: received.append(
+                [(change.type.name, change.document.id) for change in changes]))
+
+        intervals.document("b").set({"start": 200})
+        intervals.document("a").update({"start": 150})
+        intervals.document("old").set({"start": 10})  # outside the query: no snapshot
+        intervals.document("b").update({"start": 20})  # leaves the query
+        watch.unsubscribe()
+        intervals.document("c").set({"start": 300})
+
+        assert received == [[("ADDED", "a")], [("ADDED", "b")], [("MODIFIED", "a")], [("REMOVED", "b")]]
+
+
+class TestApiOnMemoryBackend:
+    """Exercise HuckleberryAPI end to end without a network."""
+
+    def test_get_children(self, memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+        """Children are read from the seeded user and child documents."""
+        children = memory_api.get_children()
+        assert [child["uid"] for child in children] == [memory_child_uid]
+        assert children[0]["name"] == "Offline Baby"
+
+    def test_sleep_cycle_creates_interval(self, memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+        """A completed sleep is returned by get_sleep_intervals."""
+        memory_api.start_sleep(memory_child_uid)
+        memory_api.pause_sleep(memory_child_uid)
+        memory_api.resume_sleep(memory_child_uid)
+        memory_api.complete_sleep(memory_child_uid)
+
+        now = int(time.time())
+        intervals = memory_api.get_sleep_intervals(memory_child_uid, now - 60, now + 60)
+        assert len(intervals) == 1
+
+        data = memory_api._get_firestore_client().collection("sleep").document(memory_child_uid).get().to_dict()
+        assert data["timer"]["active"] is False
+        assert "lastSleep" in data["prefs"]
+
+    def test_feeding_cycle_deletes_timer_fields(self, memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+        """complete_feeding removes the per-side durations via DELETE_FIELD."""
+        memory_api.start_feeding(memory_child_uid, side="left")
+        memory_api.pause_feeding(memory_child_uid)
+        memory_api.switch_feeding_side(memory_child_uid)
+        memory_api.complete_feeding(memory_child_uid)
+
+        data = memory_api._get_firestore_client().collection("feed").document(memory_child_uid).get().to_dict()
+        assert data["timer"]["active"] is False
+        assert "leftDuration" not in data["timer"]
+        assert "activeSide" not in data["timer"]
+        assert data["prefs"]["lastNursing"]["mode"] == "breast"
+
+    def test_multi_entry_documents(self, memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+        """Batched multi-entry documents are filtered by range alongside regular documents."""
+        intervals = memory_api._get_firestore_client().collection("diaper").document(
+            memory_child_uid).collection("intervals")
+        intervals.document("regular").set({"start": 150, "mode": "pee"})
+        intervals.document("batch").set({"multi": True, "data": {
+            "e1": {"start": 100, "mode": "poo"},
+            "e2": {"start": 500, "mode": "both"},
+        }})
+
+        events = memory_api.get_diaper_intervals(memory_child_uid, 0, 200)
+        assert sorted(event["start"] for event in events) == [100, 150]
+
+    def test_batch_summaries_prune_and_follow_versions(self, memory_api: HuckleberryAPI,
+                                                       memory_child_uid: str) -> None:
+        """Batch versions are decoded once, batches outside the range are skipped, and updates are seen."""
+        intervals = memory_api._get_firestore_client().collection("sleep").document(
+            memory_child_uid).collection("intervals")
+        intervals.document("old").set({"multi": True, "data": {
+            f"e{index}": {"start": 1000 + index, "duration": 1} for index in range(50)}})
+        intervals.document("recent").set({"multi": True, "data": {
+            "b": {"start": 5002, "duration": 2}, "a": {"start": 5001, "duration": 1}}})
+        stats = memory_api.batch_index.stats
+
+        assert [e["start"] for e in memory_api.get_sleep_intervals(memory_child_uid, 5000, 6000)] == [5001, 5002]
+        assert (stats.misses, stats.hits, stats.pruned) == (2, 0, 1)
+        assert len(memory_api.get_sleep_intervals(memory_child_uid, 1010, 1020)) == 10
+        assert (stats.misses, stats.hits, stats.pruned) == (2, 2, 2)
+
+        intervals.document("recent").update({"data.c": {"start": 5003, "duration": 3}})
+        assert len(memory_api.get_sleep_intervals(memory_child_uid, 5000, 6000)) == 3
+        assert stats.misses == 3
+
+    def test_getters_project_fields(self, memory_api: HuckleberryAPI, memory_child_uid: str,
+                                    memory_backend: MemoryBackend) -> None:
+        """Getters download only decoded fields unless extra fields are requested."""
+        intervals = memory_api._get_firestore_client().collection("sleep").document(
+            memory_child_uid).collection("intervals")
+        intervals.document("a").set({"start": 100, "duration": 60, "details": {"sleepLocations": {"car": True}}})
+        intervals.document("m").set({"multi": True, "data": {"x": {"start": 150, "duration": 5, "notes": "n"}}})
+
+        memory_backend.measure_bytes = True
+        memory_backend.reset_stats()
+        assert memory_api.get_sleep_intervals(memory_child_uid, 0, 200)[0] == {
+            "start": 100, "duration": 60, "offset": None}
+        projected = memory_backend.reset_stats().bytes_read
+
+        intervals_with_details = memory_api.get_sleep_intervals(
+            memory_child_uid, 0, 200, extra_fields=("details.sleepLocations", "notes"))
+        assert intervals_with_details[0]["details.sleepLocations"] == {"car": True}
+        assert intervals_with_details[1]["notes"] == "n"
+        assert projected < memory_backend.reset_stats().bytes_read
+
+    def test_timer_operations_read_only_the_timer(self, memory_api: HuckleberryAPI, memory_child_uid: str,
+                                                  memory_backend: MemoryBackend) -> None:
+        """Pause, resume and complete download the timer, not the tracker's prefs."""
+        memory_api.start_feeding(memory_child_uid)
+        memory_api._get_firestore_client().collection("feed").document(memory_child_uid).update(
+            {"prefs.history": ["x" * 100] * 100})
+        memory_backend.measure_bytes = True
+        memory_backend.reset_stats()
+        memory_api.pause_feeding(memory_child_uid)
+        memory_api.resume_feeding(memory_child_uid)
+        memory_api.switch_feeding_side(memory_child_uid)
+        memory_api.complete_feeding(memory_child_uid)
+        assert memory_backend.stats.reads == 4
+        assert memory_backend.stats.bytes_read < 4 * 1000
+
+    def test_interval_totals(self, memory_api: HuckleberryAPI, memory_child_uid: str,
+                             memory_backend: MemoryBackend) -> None:
+        """Totals merge server-side aggregates with the multi-entry batches the range getters see."""
+        intervals = memory_api._get_firestore_client().collection("sleep").document(
+            memory_child_uid).collection("intervals")
+        intervals.document("a").set({"start": 100, "duration": 60})
+        intervals.document("b").set({"start": 150, "duration": 30})
+        intervals.document("late").set({"start": 900, "duration": 30})
+        intervals.document("batch").set({"multi": True, "data": {
+            "e1": {"start": 120, "duration": 90, "awake": 30},
+            "e2": {"start": 500, "duration": 10},
+        }})
+
+        totals = memory_api.get_interval_totals(memory_child_uid, "sleep", 0, 200, avg_fields=("duration",))
+        assert totals == {"count": 3, "sums": {"duration": 180}, "averages": {"duration": 60.0}}
+
+        # Averages count only the documents holding the field, also when its values are zero
+        intervals.document("zero").set({"start": 10, "duration": 0, "awake": 0})
+        intervals.document("awake").set({"start": 20, "awake": 0})
+        totals = memory_api.get_interval_totals(memory_child_uid, "sleep", 0, 200, sum_fields=(),
+                                                avg_fields=("duration", "awake"))
+        assert totals == {"count": 5, "sums": {}, "averages": {"duration": 45.0, "awake": 10.0}}
+
+        # A changed batch is merged at once; unchanged batch versions are not decoded again
+        intervals.document("batch").update({"data.e3": {"start": 700, "duration": 20}})
+        memory_backend.reset_stats()
+        misses = memory_api.batch_index.stats.misses
+        totals = memory_api.get_interval_totals(memory_child_uid, "sleep", 0, 1000)
+        assert totals["count"] == 8 and totals["sums"] == {"duration": 240}
+        assert memory_backend.stats.rpcs == 2
+        assert memory_api.batch_index.stats.misses == misses + 1
+        assert totals["sums"]["duration"] == sum(
+            event["duration"] for event in memory_api.get_sleep_intervals(memory_child_uid, 0, 1000))
+        assert memory_api.batch_index.stats.misses == misses + 1
+
+    def test_interval_totals_mixed_documents(self, memory_api: HuckleberryAPI, memory_child_uid: str,
+                                             memory_backend: MemoryBackend,
+                                             monkeypatch: pytest.MonkeyPatch) -> None:
+        """Regular and batch feed documents add up like the getter's entries; failures are not zeros."""
+        intervals = memory_api._get_firestore_client().collection("feed").document(
+            memory_child_uid).collection("intervals")
+        intervals.document("a").set({"start": 100, "mode": "breast", "leftDuration": 300, "rightDuration": 120})
+        intervals.document("b").set({"start": 110, "mode": "breast", "rightDuration": 60})
+        # A batch document carrying a top-level start of its own is still only counted through its entries
+        intervals.document("batch").set({"multi": True, "start": 120, "leftDuration": 999, "data": {
+            "e1": {"start": 130, "leftDuration": 200, "rightDuration": 0},
+            "e2": {"start": 140, "rightDuration": 240},
+        }})
+
+        memory_backend.reset_stats()
+        totals = memory_api.get_interval_totals(memory_child_uid, "feed", 0, 200, avg_fields=("leftDuration",))
+        events = memory_api.get_feed_intervals(memory_child_uid, 0, 200)
+        assert totals == {
+            "count": len(events),
+            "sums": {field: sum(event[field] for event in events) for field in ("leftDuration", "rightDuration")},
+            "averages": {"leftDuration": 250.0},
+        }
+        assert memory_backend.stats.rpcs == 2 + 2  # one aggregation for all fields and the batches, then the getter
+
+        def unavailable(*args: object, **kwargs: object) -> None:
+            raise ConnectionError("Firestore unavailable")
+
+        monkeypatch.setattr(MemoryAggregationQuery, "get", unavailable)
+        assert memory_api.get_interval_totals(memory_child_uid, "feed", 0, 200) is None
+
+    def test_dashboard_single_batched_read(self, memory_api: HuckleberryAPI, memory_child_uid: str,
+                                           memory_backend: MemoryBackend) -> None:
+        """get_dashboard reads all tracker documents and the profile in one RPC."""
+        client = memory_api._get_firestore_client()
+        for collection in ("diaper", "health"):
+            client.collection(collection).document(memory_child_uid).set({"prefs": {}})
+        memory_api.start_sleep(memory_child_uid)
+        memory_api.start_feeding(memory_child_uid, side="right")
+        memory_api.log_diaper(memory_child_uid, "pee")
+        memory_api.log_growth(memory_child_uid, weight=5.0)
+        memory_backend.reset_stats()
+
+        dashboard = memory_api.get_dashboard(memory_child_uid)[memory_child_uid]
+
+        assert memory_backend.stats.rpcs == 1
+        assert dashboard["child"]["name"] == "Offline Baby"
+        assert dashboard["sleep_timer"]["active"] is True
+        assert dashboard["sleep_timer"]["timer_start_time_ms"] > 0
+        assert dashboard["feed_timer"]["active_side"] == "right"
+        assert dashboard["last_sleep"] is None
+        assert dashboard["last_diaper"]["mode"] == "pee"
+        assert dashboard["growth"]["weight"] == 5.0
+        assert dashboard["growth"] == memory_api.get_growth_data(memory_child_uid)
+
+        # Without child_uids the children come from the user document (one more read)
+        memory_backend.reset_stats()
+        assert list(memory_api.get_dashboard(include_profile=False)) == [memory_child_uid]
+        assert memory_backend.stats.rpcs == 2
+
+    def test_startup_pipeline(self, memory_api: HuckleberryAPI, memory_child_uid: str,
+                              memory_backend: MemoryBackend) -> None:
+        """startup() reads children and state in two RPCs and registers every listener."""
+        client = memory_api._get_firestore_client()
+        for collection in ("sleep", "feed", "diaper", "health"):
+            client.collection(collection).document(memory_child_uid).set({"prefs": {}})
+        memory_backend.reset_stats()
+        updates: list[tuple[str, str]] = []
+
+        report = memory_api.startup(
+            callback=lambda collection, child_uid, data: updates.append((collection, child_uid)))
+
+        assert memory_backend.stats.rpcs == 2
+        assert [child["uid"] for child in report.children] == [memory_child_uid]
+        assert list(report.dashboards) == [memory_child_uid]
+        assert report.listeners == 4 and not report.errors
+        assert set(report.phases) == {"auth", "warm_up", "client", "children", "state", "listeners"}
+        assert report.time_to_first_state <= report.total
+        assert sorted(updates) == sorted((c, memory_child_uid) for c in ("sleep", "feed", "diaper", "health"))
+
+        memory_api.log_diaper(memory_child_uid, "pee")
+        assert updates[-1] == ("diaper", memory_child_uid)
+
+    def test_listener_receives_updates(self, memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+        """Real-time listeners work against the in-memory store."""
+        updates: list[Any] = []
+        memory_api.setup_feed_listener(memory_child_uid, updates.append)
+        memory_api.start_feeding(memory_child_uid, side="right")
+
+        assert updates[-1]["timer"]["active"] is True
+        assert updates[-1]["timer"]["activeSide"] == "right"
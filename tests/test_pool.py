@@ -0,0 +1,127 @@
+"""Session pool tests for Huckleberry API (offline)."""
+import threading
+import time
+
+import pytest
+
+from huckleberry_api import HuckleberryAPI, ListenerLimitError, MemoryBackend, SessionPool
+
+
+def _sign_in(api: HuckleberryAPI, expires_in: float = 3600) -> None:
+    api.id_token = "offline-token"
+    api.refresh_token = "offline-refresh"
+    api.user_uid = "offline-user"
+    api.token_expires_at = time.time() + expires_in
+
+
+@pytest.fixture
+def pool(memory_backend: MemoryBackend) -> SessionPool:
+    """Create a pool on the in-memory backend."""
+    pool = SessionPool(memory_backend, max_workers=2, max_listeners=2, refresh_margin=600, refresh_jitter=0)
+    yield pool
+    pool.close()
+
+
+class TestRefreshScheduling:
+    """Test token refresh scheduling."""
+
+    def test_refreshes_only_due_sessions(self, pool: SessionPool, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Sessions are refreshed refresh_margin before expiry and rescheduled after."""
+        refreshed: list[str] = []
+        for key, expires_in in (("soon", 300), ("later", 7200)):
+            api = HuckleberryAPI(f"{key}@example.com", "secret", "UTC", backend=pool.backend, limits=pool.limits)
+            _sign_in(api, expires_in)
+            pool.attach(key, api)
+
+            def refresh(api: HuckleberryAPI = api, key: str = key) -> None:
+                refreshed.append(key)
+                api.token_expires_at = time.time() + 3600
+
+            monkeypatch.setattr(api, "refresh_auth_token", refresh)
+
+        for future in pool.run_due_refreshes():
+            future.result()
+
+        assert refreshed == ["soon"]
+        assert pool.stats().refreshes == 1
+        assert pool.run_due_refreshes() == []  # rescheduled ahead of the new expiry
+
+    def test_authenticates_new_sessions(self, pool: SessionPool, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Sessions without a token are authenticated; failures are counted and retried later."""
+        api = pool.add("new", "new@example.com", "secret", "UTC")
+        monkeypatch.setattr(api, "authenticate", lambda: (_ for _ in ()).throw(RuntimeError("offline")))
+
+        for future in pool.run_due_refreshes():
+            future.result()
+
+        assert pool.stats().refresh_failures == 1
+        assert pool.run_due_refreshes() == []
+
+    def test_concurrent_refreshes_all_counted(self, pool: SessionPool, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Refreshes finishing together on the worker threads are each counted."""
+        sessions = 20
+        barrier = threading.Barrier(2, timeout=5)  # both workers refresh at the same time
+        for index in range(sessions):
+            api = HuckleberryAPI(f"s{index}@example.com", "secret", "UTC", backend=pool.backend, limits=pool.limits)
+            _sign_in(api, 300)
+            pool.attach(f"s{index}", api)
+
+            def refresh(api: HuckleberryAPI = api) -> None:
+                barrier.wait()
+                api.token_expires_at = time.time() + 3600
+
+            monkeypatch.setattr(api, "refresh_auth_token", refresh)
+
+        for future in pool.run_due_refreshes():
+            future.result()
+
+        assert pool.stats().refreshes == sessions
+
+
+class TestLimits:
+    """Test the shared listener and RPC limits."""
+
+    def test_listener_limit(self, pool: SessionPool) -> None:
+        """Listeners beyond max_listeners raise; stopping listeners frees their slots."""
+        first = pool.add("a", "a@example.com", "secret", "UTC")
+        second = pool.add("b", "b@example.com", "secret", "UTC")
+        _sign_in(first)
+        _sign_in(second)
+
+        first.setup_realtime_listener("child-a", lambda data: None)
+        first.setup_realtime_listener("child-a", lambda data: None)  # same listener, same slot
+        second.setup_feed_listener("child-b", lambda data: None)
+        with pytest.raises(ListenerLimitError):
+            second.setup_diaper_listener("child-b", lambda data: None)
+
+        first.stop_all_listeners()
+        second.setup_diaper_listener("child-b", lambda data: None)
+        assert pool.stats().active_listeners == 2
+
+    def test_rpc_limit(self) -> None:
+        """No more than max_concurrent_rpcs RPCs run at once across sessions."""
+        pool = SessionPool(MemoryBackend(latency=0.05), max_concurrent_rpcs=2)
+        peak = 0
+        lock = threading.Lock()
+
+        def read(key: str) -> None:
+            nonlocal peak
+            api = pool.add(key, f"{key}@example.com", "secret", "UTC")
+            _sign_in(api)
+            client = api._get_firestore_client()
+            with lock:
+                peak = max(peak, pool.stats().rpcs_in_flight)
+            client.collection("users").document(key).get()
+            with lock:
+                peak = max(peak, pool.stats().rpcs_in_flight)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=read, args=(f"user-{index}",)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert time.perf_counter() - started >= 0.1  # 4 RPCs of 50 ms, 2 at a time
+        assert peak <= 2
+        pool.close()
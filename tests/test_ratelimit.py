@@ -0,0 +1,111 @@
+"""Rate limiter tests for Huckleberry API (offline, on the in-memory backend)."""
+import threading
+import time
+
+import pytest
+
+from huckleberry_api import HuckleberryAPI, MemoryBackend, RateLimiter, SessionPool, low_priority
+from huckleberry_api.ratelimit import TokenBucket
+
+
+class _QuotaError(Exception):
+    """Stand-in for google.api_core.exceptions.ResourceExhausted."""
+
+
+_QuotaError.__name__ = "ResourceExhausted"
+
+
+class TestTokenBucket:
+    """Test the token bucket."""
+
+    def test_throttles_to_rate(self) -> None:
+        """After the burst, calls are admitted at the configured rate."""
+        bucket = TokenBucket(rate=50, burst=2)
+        started = time.monotonic()
+        for _ in range(7):
+            bucket.acquire()
+        elapsed = time.monotonic() - started
+
+        assert elapsed >= 0.09  # 5 calls beyond the burst at 50/s
+        assert bucket.stats.acquired == 7
+        assert bucket.stats.throttled >= 4
+
+    def test_background_yields_to_interactive(self) -> None:
+        """Low-priority callers keep a reserve free and wait for queued interactive callers."""
+        bucket = TokenBucket(rate=20, burst=5, reserve=0.4)
+        for _ in range(3):
+            bucket.acquire(background=True)
+        assert bucket.available < 3  # background stops at the reserve of 2 tokens...
+        bucket.acquire()
+        bucket.acquire()  # ...which interactive callers can use at once
+        assert bucket.stats.throttled == 0
+
+        order: list[str] = []
+
+        def take(name: str, background: bool) -> None:
+            bucket.acquire(background=background)
+            order.append(name)
+
+        threads = [threading.Thread(target=take, args=("background", True))]
+        threads[0].start()
+        time.sleep(0.01)
+        threads += [threading.Thread(target=take, args=(f"interactive{i}", False)) for i in range(2)]
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert order[-1] == "background"
+
+
+class TestRateLimiter:
+    """Test read/write/auth budgets on the API."""
+
+    def test_separate_budgets_and_parent(self, memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+        """Reads and writes draw from separate buckets, and child limiters also use the parent's."""
+        shared = RateLimiter(reads=1000, writes=1000)
+        limiter = shared.child(reads=100, writes=5)
+        api = HuckleberryAPI("a@example.com", "x", "UTC", backend=memory_api._backend, rate_limiter=limiter)
+        api.id_token, api.user_uid, api.token_expires_at = "token", "offline-user", time.time() + 3600
+
+        api.get_children()
+        api.start_sleep(memory_child_uid)
+        api.cancel_sleep(memory_child_uid)
+
+        stats, shared_stats = limiter.stats(), shared.stats()
+        assert stats["read"].acquired == 3  # user document, child document, cancel_sleep's read
+        assert stats["write"].acquired == 2
+        assert shared_stats["read"].acquired == 3 and shared_stats["write"].acquired == 2
+        assert "auth" not in stats
+
+    def test_quota_error_backs_off(self) -> None:
+        """A quota error empties the bucket so the next call waits for a refill."""
+        limiter = RateLimiter(reads=20, burst_seconds=0.5)
+        with pytest.raises(_QuotaError):
+            with limiter.limit("read"):
+                raise _QuotaError("quota")
+        started = time.monotonic()
+        limiter.acquire("read")
+        assert time.monotonic() - started >= 0.03
+        assert limiter.stats()["read"].quota_errors == 1
+
+    def test_low_priority_context(self) -> None:
+        """low_priority() marks the calls in its block only."""
+        limiter = RateLimiter(reads=10, reserve=0.5)
+        with low_priority():
+            for _ in range(5):
+                limiter.acquire("read")
+        # Background calls stopped at the reserve; interactive ones use it without waiting
+        started = time.monotonic()
+        limiter.acquire("read")
+        assert time.monotonic() - started < 0.05
+
+    def test_pool_gives_sessions_child_limiters(self) -> None:
+        """Sessions added to a pool get per-account limiters under the pool's global one."""
+        shared = RateLimiter(reads=100)
+        pool = SessionPool(MemoryBackend(), rate_limiter=shared, account_rates={"reads": 10})
+        try:
+            api = pool.add("a", "a@example.com", "x", "UTC")
+            assert api._rate_limiter is not None and api._rate_limiter.parent is shared
+        finally:
+            pool.close()
@@ -0,0 +1,68 @@
+"""Compact record type tests for Huckleberry API (offline)."""
+from huckleberry_api import FeedInterval, HuckleberryAPI, SleepInterval
+from huckleberry_api.records import (
+    DiaperInterval,
+    decode_feed_timer,
+    decode_sleep_timer,
+    decode_snapshots,
+)
+
+
+class _Snapshot:
+    def __init__(self, data: dict) -> None:
+        self._data = data
+
+    def to_dict(self) -> dict:
+        return self._data
+
+
+class TestDecoders:
+    """Test decoding of snapshots and timer state."""
+
+    def test_regular_and_multi_documents(self) -> None:
+        """Batch entries are expanded and filtered to the range; regular documents are kept."""
+        snapshots = [
+            _Snapshot({"start": 100.0, "leftDuration": 60, "rightDuration": 30, "offset": -60}),
+            _Snapshot({"multi": True, "data": {
+                "a": {"start": 150.0, "leftDuration": 10, "mode": "bottle"},
+                "b": {"start": 500.0, "leftDuration": 10},
+            }}),
+            _Snapshot({}),
+        ]
+
+        records = decode_snapshots("feed", snapshots, 0, 200)
+
+        assert records == [
+            FeedInterval(100.0, 60, 30, -60),
+            FeedInterval(150.0, 10, 0, None, "bottle", True),
+        ]
+        assert decode_snapshots("feed", snapshots, expand_multi=False) == records[:1]
+
+    def test_records_are_slotted(self) -> None:
+        """Records have no per-instance dict."""
+        record = DiaperInterval(1.0, "pee")
+        assert not hasattr(record, "__dict__")
+
+    def test_timers(self) -> None:
+        """Timer state is decoded from a tracker document; missing timers give None."""
+        sleep = decode_sleep_timer({"timer": {"active": True, "timerStartTime": 1000.0, "uuid": "u"}})
+        assert sleep is not None and sleep.active and not sleep.paused and sleep.uuid == "u"
+        feed = decode_feed_timer({"timer": {"active": True, "activeSide": "left", "leftDuration": 12.0}})
+        assert feed is not None and feed.active_side == "left" and feed.left_duration_sec == 12.0
+        assert decode_sleep_timer({}) is None
+        assert decode_feed_timer(None) is None
+
+
+def test_api_interval_records(memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+    """get_interval_records returns the same entries as the dict getter."""
+    intervals = memory_api._get_firestore_client().collection("sleep").document(
+        memory_child_uid).collection("intervals")
+    intervals.document("a").set({"start": 1000.0, "duration": 600, "offset": 0})
+    intervals.document("b").set({"start": 3000.0, "duration": 300})
+    intervals.document("m").set({"multi": True, "data": {"x": {"start": 2000.0, "duration": 100}}})
+
+    records = memory_api.get_interval_records(memory_child_uid, "sleep", 0, 4000)
+    dicts = memory_api.get_sleep_intervals(memory_child_uid, 0, 4000)
+
+    assert records == [SleepInterval(1000.0, 600, 0), SleepInterval(3000.0, 300), SleepInterval(2000.0, 100)]
+    assert sorted(r.start_sec for r in records) == sorted(d["start"] for d in dicts)
@@ -0,0 +1,241 @@
+"""REST transport tests for Huckleberry API (offline, HTTP is faked at the session level)."""
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from huckleberry_api import HuckleberryAPI, RestBackend
+from huckleberry_api.const import FIRESTORE_BASE_URL
+from huckleberry_api.rest import DELETE_FIELD, RestRetry, decode_fields, encode_fields
+
+DOCUMENTS = FIRESTORE_BASE_URL.split("/v1/", 1)[1]
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int = 200, payload: Any = None) -> None:
+        self.status_code = status_code
+        self._payload = payload if payload is not None else {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            import requests
+
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+    def json(self) -> Any:
+        return self._payload
+
+
+class _FakeSession:
+    """Records requests and answers them from a queue (or a default)."""
+
+    def __init__(self, *responses: _FakeResponse) -> None:
+        self.requests: list[dict[str, Any]] = []
+        self._responses = list(responses)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> _FakeResponse:
+        self.requests.append({"method": method, "url": url, **kwargs})
+        return self._responses.pop(0) if self._responses else _FakeResponse()
+
+
+def _document(path: str, fields: dict[str, Any], update_time: str = "2025-01-01T00:00:00.123456789Z"
+              ) -> dict[str, Any]:
+    return {"name": f"{DOCUMENTS}/{path}", "fields": encode_fields(fields),
+            "createTime": update_time, "updateTime": update_time}
+
+
+class TestValueEncoding:
+    """Test Firestore REST value encoding."""
+
+    def test_round_trip(self) -> None:
+        """Nested values survive encoding and decoding."""
+        data = {
+            "timer": {"active": True, "timerStartTime": 1700000000123, "uuid": "abc"},
+            "duration": 12.5,
+            "tags": ["a", None],
+            "at": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        }
+        encoded = encode_fields(data)
+        assert encoded["timer"]["mapValue"]["fields"]["timerStartTime"] == {"integerValue": "1700000000123"}
+        assert decode_fields(encoded) == data
+
+
+class TestRestDocuments:
+    """Test document requests built by the REST client."""
+
+    def test_get_missing_document(self) -> None:
+        """A 404 becomes a snapshot that does not exist."""
+        session = _FakeSession(_FakeResponse(404))
+        doc = RestBackend(session=session).create_client("token").collection("sleep").document("c1")
+        snapshot = doc.get()
+        assert not snapshot.exists
+        assert snapshot.to_dict() is None
+        assert session.requests[0]["headers"]["Authorization"] == "Bearer token"
+        assert session.requests[0]["url"] == f"{FIRESTORE_BASE_URL}/sleep/c1"
+
+    def test_update_mask_and_delete_field(self) -> None:
+        """update() masks each path, drops deleted fields from the body and requires the document."""
+        session = _FakeSession()
+        doc = RestBackend(session=session).create_client("token").collection("feed").document("c1")
+        doc.update({"timer.active": False, "timer.leftDuration": DELETE_FIELD, "prefs.10-20": 1})
+
+        request = session.requests[0]
+        assert request["method"] == "PATCH"
+        assert request["params"] == [
+            ("updateMask.fieldPaths", "timer.active"),
+            ("updateMask.fieldPaths", "timer.leftDuration"),
+            ("updateMask.fieldPaths", "prefs.`10-20`"),
+            ("currentDocument.exists", "true"),
+        ]
+        assert decode_fields(request["json"]["fields"]) == {"timer": {"active": False}, "prefs": {"10-20": 1}}
+
+    def test_set_merge_masks_leaves(self) -> None:
+        """set(merge=True) only touches the leaf fields it names."""
+        session = _FakeSession()
+        doc = RestBackend(session=session).create_client("token").collection("sleep").document("c1")
+        doc.set({"timer": {"active": True, "paused": False}, "prefs": {}}, merge=True)
+
+        assert [value for _, value in session.requests[0]["params"]] == ["timer.active", "timer.paused", "prefs"]
+
+    def test_retries_server_errors(self) -> None:
+        """Throttled requests are retried and counted through the retry callback."""
+        session = _FakeSession(_FakeResponse(503), _FakeResponse(200, _document("sleep/c1", {"a": 1})))
+        errors: list[Exception] = []
+        doc = RestBackend(session=session).create_client("token").collection("sleep").document("c1")
+        snapshot = doc.get(retry=RestRetry(initial=0.0, on_error=errors.append))
+        assert snapshot.to_dict() == {"a": 1}
+        assert len(errors) == 1
+
+
+class TestRestOnApi:
+    """Exercise HuckleberryAPI over the REST transport."""
+
+    def test_interval_query(self) -> None:
+        """Interval getters send runQuery requests to the child's document."""
+        session = _FakeSession(
+            _FakeResponse(200, [{"document": _document("sleep/c1/intervals/a", {"start": 50, "duration": 60})},
+                                {"readTime": "2025-01-01T00:00:00Z"}]),
+            _FakeResponse(200, [{"readTime": "2025-01-01T00:00:00Z"}]),
+        )
+        api = HuckleberryAPI(email="test", password="test", timezone="UTC", backend=RestBackend(session=session))
+        api.id_token = "token"
+        api.token_expires_at = time.time() + 3600
+
+        intervals = api.get_sleep_intervals("c1", 0, 100)
+
+        assert intervals == [{"start": 50, "duration": 60, "offset": None}]
+        request = session.requests[0]
+        assert request["url"] == f"{FIRESTORE_BASE_URL}/sleep/c1:runQuery"
+        query = request["json"]["structuredQuery"]
+        assert query["from"] == [{"collectionId": "intervals"}]
+        assert [f["fieldFilter"]["op"] for f in query["where"]["compositeFilter"]["filters"]] == [
+            "GREATER_THAN_OR_EQUAL", "LESS_THAN"]
+        assert [f["fieldPath"] for f in query["select"]["fields"]] == ["start", "duration", "offset", "multi"]
+        multi_query = session.requests[1]["json"]["structuredQuery"]
+        assert [f["fieldPath"] for f in multi_query["select"]["fields"]] == ["multi", "data"]
+
+    def test_aggregation_query(self) -> None:
+        """Aggregations are sent as one runAggregationQuery request."""
+        session = _FakeSession(_FakeResponse(200, [{
+            "result": {"aggregateFields": {"count": {"integerValue": "3"}, "total": {"doubleValue": 7.5}}},
+            "readTime": "2025-01-01T00:00:00Z",
+        }]))
+        intervals = RestBackend(session=session).create_client("token").collection("sleep").document(
+            "c1").collection("intervals")
+        row = intervals.where("start", ">=", 0).count(alias="count").sum("duration", alias="total").get()[0]
+
+        assert {result.alias: result.value for result in row} == {"count": 3, "total": 7.5}
+        request = session.requests[0]
+        assert request["url"] == f"{FIRESTORE_BASE_URL}/sleep/c1:runAggregationQuery"
+        assert request["json"]["structuredAggregationQuery"]["aggregations"] == [
+            {"alias": "count", "count": {}},
+            {"alias": "total", "sum": {"field": {"fieldPath": "duration"}}},
+        ]
+
+    def test_null_filters(self) -> None:
+        """Comparisons with None are sent as unary IS_NULL / IS_NOT_NULL filters."""
+        session = _FakeSession(_FakeResponse(200, [{"readTime": "2025-01-01T00:00:00Z"}]))
+        intervals = RestBackend(session=session).create_client("token").collection("sleep").document(
+            "c1").collection("intervals")
+        list(intervals.where("duration", "!=", None).where("note", "==", None).stream())
+
+        filters = session.requests[0]["json"]["structuredQuery"]["where"]["compositeFilter"]["filters"]
+        assert filters == [
+            {"unaryFilter": {"field": {"fieldPath": "duration"}, "op": "IS_NOT_NULL"}},
+            {"unaryFilter": {"field": {"fieldPath": "note"}, "op": "IS_NULL"}},
+        ]
+
+    def test_polling_listener(self) -> None:
+        """Polled listeners deliver the initial state and changes, not unchanged polls."""
+        session = _FakeSession(
+            _FakeResponse(200, [{"found": _document("feed/c1", {"n": 1}, "2025-01-01T00:00:01Z")}]),
+            _FakeResponse(200, [{"found": _document("feed/c1", {"n": 1}, "2025-01-01T00:00:01Z")}]),
+            _FakeResponse(200, [{"found": _document("feed/c1", {"n": 2}, "2025-01-01T00:00:02Z")}]),
+        )
+        api = HuckleberryAPI(email="test", password="test", timezone="UTC",
+                             backend=RestBackend(session=session, poll_interval=0.01))
+        api.id_token = "token"
+        api.token_expires_at = time.time() + 3600
+        updates: list[Any] = []
+        api.setup_feed_listener("c1", updates.append)
+
+        deadline = time.time() + 2
+        while len(updates) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        api.stop_all_listeners()
+
+        assert updates[:2] == [{"n": 1}, {"n": 2}]
+        assert session.requests[0]["url"] == f"{FIRESTORE_BASE_URL}:batchGet"
+
+    def test_polling_query_listener(self) -> None:
+        """Polled query listeners deliver the initial results, then only the changed documents."""
+        path = "sleep/c1/intervals"
+        session = _FakeSession(
+            _FakeResponse(200, [{"document": _document(f"{path}/a", {"start": 1}, "2025-01-01T00:00:01Z")}]),
+            _FakeResponse(200, [{"document": _document(f"{path}/a", {"start": 1}, "2025-01-01T00:00:01Z")}]),
+            _FakeResponse(200, [{"document": _document(f"{path}/b", {"start": 2}, "2025-01-01T00:00:02Z")}]),
+        )
+        client = RestBackend(session=session, poll_interval=0.01).create_client("token")
+        received: list[list[tuple[str, str]]] = []
+        watch = client.collection(path).where("start", ">=", 0).on_snapshot(
+            lambda docs, changes, read_time: received.append(
+                [(change.type.name, change.document.id) for change in changes]))
+
+        deadline = time.time() + 2
+        while len(received) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        watch.unsubscribe()
+
+        assert received[:2] == [[("ADDED", "a")], [("REMOVED", "a"), ("ADDED", "b")]]
+        assert session.requests[0]["url"] == f"{FIRESTORE_BASE_URL}/sleep/c1:runQuery"
+
+    def test_shared_poller(self) -> None:
+        """With shared_poller, one poller serves all clients with one batchGet per client."""
+        session = _FakeSession()
+        backend = RestBackend(session=session, poll_interval=60, shared_poller=True)
+        first, second = backend.create_client("token-a"), backend.create_client("token-b")
+        assert first.poller is second.poller
+
+        first.document("feed/c1").on_snapshot(lambda *args: None)
+        watch = second.document("feed/c2").on_snapshot(lambda *args: None)
+        deadline = time.time() + 2
+        while len(session.requests) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        first.close()
+
+        assert sorted(request["headers"]["Authorization"] for request in session.requests[:2]) == [
+            "Bearer token-a", "Bearer token-b"]
+        assert len(second.poller._watches) == 1  # closing one client keeps the other's watches
+        watch.unsubscribe()
+
+
+def test_rest_backend_does_not_load_grpc() -> None:
+    """Using the REST backend never imports the gRPC Firestore client."""
+    code = (
+        "import sys\n"
+        "from huckleberry_api import HuckleberryAPI, RestBackend\n"
+        "HuckleberryAPI('e', 'p', 'UTC', backend=RestBackend())\n"
+        "assert not [m for m in sys.modules if m.startswith(('grpc', 'google.cloud'))], sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
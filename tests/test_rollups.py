@@ -0,0 +1,72 @@
+"""Rollup store tests for Huckleberry API (offline)."""
+from datetime import date, datetime, timezone
+
+from huckleberry_api import HuckleberryAPI, MemoryBackend, RollupStore
+
+
+def _ts(day: int, hour: int) -> float:
+    return datetime(2025, 3, day, hour, tzinfo=timezone.utc).timestamp()
+
+
+class TestRollupStore:
+    """Test incremental rollups."""
+
+    def test_day_and_week_totals(self) -> None:
+        """Entries are bucketed by local day and ISO week, deduplicated by start."""
+        store = RollupStore()
+        store.add("sleep", "c1", {"start": _ts(3, 10), "duration": 3600, "offset": 0})  # Monday
+        store.add("sleep", "c1", {"start": _ts(4, 10), "duration": 1800})
+        assert not store.add("sleep", "c1", {"start": _ts(4, 10), "duration": 1800})
+        store.add("diaper", "c1", {"start": _ts(4, 23), "mode": "poo", "offset": -120})  # 01:00 Mar 5
+
+        assert store.day("c1", "sleep", date(2025, 3, 4)).totals == {"duration": 1800}
+        assert store.week("c1", "sleep", date(2025, 3, 9)).count == 2
+        assert store.week("c1", "sleep", date(2025, 3, 9)).totals == {"duration": 5400}
+        assert store.day("c1", "diaper", date(2025, 3, 5)).totals == {"mode:poo": 1}
+        assert store.day("c1", "feed", date(2025, 3, 5)).count == 0
+
+    def test_timezone_for_entries_without_offset(self) -> None:
+        """Entries without a stored offset use the store's time zone."""
+        store = RollupStore("America/New_York")
+        store.add("feed", "c1", {"start": _ts(3, 2), "leftDuration": 60})  # 21:00 Mar 2 in New York
+        assert store.day("c1", "feed", date(2025, 3, 2)).count == 1
+
+
+class TestRollupsOnApi:
+    """Keep rollups current from API writes and listeners."""
+
+    def test_seed_then_write_paths(self, memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+        """Seeded history plus this client's writes, without extra reads."""
+        diaper_ref = memory_api._get_firestore_client().collection("diaper").document(memory_child_uid)
+        diaper_ref.set({"prefs": {}})
+        diaper_ref.collection("intervals").document("old").set({"start": _ts(1, 12), "mode": "pee", "offset": 0})
+
+        store = RollupStore()
+        store.attach(memory_api)
+        assert store.seed(memory_api, memory_child_uid, int(_ts(1, 0)), int(_ts(2, 0))) == 1
+
+        memory_api.log_diaper(memory_child_uid, "both")
+        memory_api.log_diaper(memory_child_uid, "pee")
+        today = store.day(memory_child_uid, "diaper", datetime.now(timezone.utc).date())
+        assert today.count == 2
+        assert today.totals == {"mode:both": 1, "mode:pee": 1}
+
+        store.detach(memory_api)
+        memory_api.log_diaper(memory_child_uid, "dry")
+        assert store.day(memory_child_uid, "diaper", datetime.now(timezone.utc).date()).count == 2
+
+    def test_listener_updates(self, memory_backend: MemoryBackend, memory_api: HuckleberryAPI,
+                              memory_child_uid: str) -> None:
+        """Entries completed elsewhere arrive through listeners and are deduplicated."""
+        store = RollupStore()
+        store.attach(memory_api)
+        memory_api.setup_realtime_listener(memory_child_uid, lambda data: None)
+
+        other_device = memory_backend.create_client("other").collection("sleep").document(memory_child_uid)
+        last_sleep = {"start": _ts(2, 13), "duration": 2700, "offset": 0}
+        other_device.set({"prefs": {"lastSleep": last_sleep}})
+        other_device.set({"prefs": {"lastSleep": last_sleep, "timestamp": {"seconds": 1}}})
+
+        rollup = store.day(memory_child_uid, "sleep", date(2025, 3, 2))
+        assert rollup.count == 1
+        assert rollup.totals == {"duration": 2700}
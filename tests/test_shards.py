@@ -0,0 +1,87 @@
+"""Sharded range query tests for Huckleberry API (offline, on the in-memory backend)."""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from huckleberry_api import CostMeter, HuckleberryAPI, MemoryBackend, RangeSharding
+from huckleberry_api.shards import stream_sharded
+
+DAY = 86400
+
+
+def _sharded_api(backend: MemoryBackend, sharding: RangeSharding, meter: CostMeter | None = None) -> HuckleberryAPI:
+    api = HuckleberryAPI("offline@example.com", "offline", "UTC", backend=backend, range_sharding=sharding,
+                         cost_meter=meter)
+    api.id_token, api.user_uid, api.token_expires_at = "offline-token", "offline-user", time.time() + 3600
+    return api
+
+
+class TestRangeSharding:
+    """Test splitting long ranges into concurrently streamed shards."""
+
+    def test_sharded_reads_match_single_stream(self, memory_api: HuckleberryAPI, memory_backend: MemoryBackend,
+                                               memory_child_uid: str) -> None:
+        """A long range returns the same entries in start order, one query per shard, billed to the getter."""
+        intervals = memory_backend.create_client("t").collection("feed").document(
+            memory_child_uid).collection("intervals")
+        for day in range(100):
+            intervals.document(f"f{day}").set({"mode": "breast", "start": day * DAY + 3600, "leftDuration": 5})
+        intervals.document("edge").set({"mode": "breast", "start": 30 * DAY, "leftDuration": 5})
+        intervals.document("batch").set({"multi": True, "data": {"x": {"start": 50 * DAY, "leftDuration": 60}}})
+
+        expected = memory_api.get_feed_intervals(memory_child_uid, 0, 100 * DAY)
+        meter = CostMeter()
+        api = _sharded_api(memory_backend, RangeSharding(shard_span=30 * DAY, max_workers=3), meter)
+        memory_backend.reset_stats()
+        events = api.get_feed_intervals(memory_child_uid, 0, 100 * DAY)
+
+        assert events == expected
+        assert [event["start"] for event in events[:-1]] == sorted(event["start"] for event in events[:-1])
+        assert memory_backend.stats.rpcs == 4 + 1  # four shards, then the multi-entry batches
+        assert meter.by_method()["get_feed_intervals"].reads == 102
+
+        # Short ranges run as a single query
+        memory_backend.reset_stats()
+        api.get_feed_intervals(memory_child_uid, 0, 10 * DAY)
+        assert memory_backend.stats.rpcs == 2
+
+    def test_shard_bounds_and_edge_duplicates(self) -> None:
+        """Shards are consecutive half-open ranges; a document seen by two shards is yielded once."""
+        sharding = RangeSharding(shard_span=10, max_workers=2)
+        assert sharding.shards(0, 25) == [(0, 10), (10, 20), (20, 25)]
+        assert sharding.shards(0, 10) == [(0, 10)]
+
+        def doc(path: str, start: int) -> SimpleNamespace:
+            return SimpleNamespace(reference=SimpleNamespace(path=path), start=start)
+
+        moved = doc("intervals/moved", 9)
+        shards = {0: [doc("intervals/a", 1), moved], 10: [moved, doc("intervals/b", 12)], 20: [doc("intervals/c", 21)]}
+        merged = list(stream_sharded(lambda start, end: shards[start], 0, 25, sharding))
+        assert [item.reference.path for item in merged] == ["intervals/a", "intervals/moved", "intervals/b",
+                                                            "intervals/c"]
+        with pytest.raises(ValueError):
+            RangeSharding(shard_span=0)
+
+    def test_shards_run_concurrently_up_to_max_workers(self) -> None:
+        """Shard queries overlap, but never more than max_workers at a time."""
+        sharding = RangeSharding(shard_span=10, max_workers=2)
+        # Each shard waits for a second one to be in flight; run one after the other, they would time out
+        barrier = threading.Barrier(2, timeout=5)
+        lock = threading.Lock()
+        in_flight = [0, 0]  # current, highest
+
+        def query(start: float, end: float) -> list[SimpleNamespace]:
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            barrier.wait()
+            with lock:
+                in_flight[0] -= 1
+            return [SimpleNamespace(reference=SimpleNamespace(path=f"intervals/{start}"))]
+
+        merged = list(stream_sharded(query, 0, 40, sharding))
+        assert [doc.reference.path for doc in merged] == ["intervals/0", "intervals/10", "intervals/20",
+                                                          "intervals/30"]
+        assert in_flight[1] == 2
@@ -0,0 +1,69 @@
+"""Request coalescing tests for Huckleberry API (offline, on the in-memory backend)."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from huckleberry_api import HuckleberryAPI, MemoryBackend
+from huckleberry_api.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test coalescing of identical concurrent calls."""
+
+    def test_concurrent_identical_reads_share_one_execution(self, memory_api: HuckleberryAPI,
+                                                            memory_backend: MemoryBackend,
+                                                            memory_child_uid: str) -> None:
+        """Identical calendar reads in flight together run their queries once; other ranges run apart."""
+        memory_backend.latency = 0.05
+        memory_backend.reset_stats()
+        memory_api.get_calendar_events(memory_child_uid, 0, 1000)
+        single = memory_backend.reset_stats().rpcs
+
+        barrier = threading.Barrier(4)
+
+        def read(end: int) -> dict:
+            barrier.wait()
+            return memory_api.get_calendar_events(memory_child_uid, 0, end)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(read, [1000, 1000, 1000, 2000]))
+
+        assert memory_backend.stats.rpcs == 2 * single
+        assert results[0] == results[1] == results[2]
+        assert results[0] is not results[1]  # every caller gets its own copy
+        assert memory_api._inflight is not None and memory_api._inflight.stats.shared == 2
+
+        # Nothing in flight any more: the next identical call reads again
+        memory_api.get_calendar_events(memory_child_uid, 0, 1000)
+        assert memory_backend.stats.rpcs == 3 * single
+
+    def test_error_is_shared(self) -> None:
+        """Callers waiting for a failing call receive its exception."""
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def fail() -> None:
+            started.set()
+            release.wait(5)
+            raise ValueError("boom")
+
+        errors: list[BaseException] = []
+
+        def wait_for_leader() -> None:
+            started.wait(5)
+            timer = threading.Timer(0.05, release.set)
+            timer.start()
+            try:
+                flight.do("key", lambda: None)
+            except ValueError as err:
+                errors.append(err)
+
+        follower = threading.Thread(target=wait_for_leader)
+        follower.start()
+        with pytest.raises(ValueError):
+            flight.do("key", fail)
+        follower.join(5)
+
+        assert len(errors) == 1 and flight.stats.shared == 1
+        assert flight.in_flight == 0
@@ -0,0 +1,76 @@
+"""Per-day summary tests for Huckleberry API (offline)."""
+from datetime import date, datetime, timezone
+
+import pytest
+
+from huckleberry_api import HuckleberryAPI
+
+np = pytest.importorskip("numpy")
+
+from huckleberry_api.summary import summarize_days  # noqa: E402
+
+
+def _ts(day: int, hour: int, minute: int = 0) -> float:
+    return datetime(2025, 3, day, hour, minute, tzinfo=timezone.utc).timestamp()
+
+
+class TestSummarizeDays:
+    """Test local-day bucketing."""
+
+    def test_sleep_split_at_midnight_and_cutoffs(self) -> None:
+        """A night sleep crossing midnight is split per day; naps count as day sleep."""
+        events = {
+            "sleep": [
+                {"start": _ts(1, 13), "duration": 3600},  # nap
+                {"start": _ts(1, 20), "duration": 11 * 3600},  # 20:00 -> 07:00
+            ],
+        }
+        summary = summarize_days(events, night_start_min=19 * 60, morning_cutoff_min=7 * 60)
+
+        assert summary.day.tolist() == [date(2025, 3, 1), date(2025, 3, 2)]
+        assert summary.sleep_s.tolist() == [5 * 3600, 7 * 3600]
+        assert summary.night_sleep_s.tolist() == [4 * 3600, 7 * 3600]
+        assert summary.day_sleep_s.tolist() == [3600, 0]
+        assert summary.naps.tolist() == [1, 0]
+
+    def test_offsets_move_events_to_local_days(self) -> None:
+        """Stored offsets (minutes, negative east of UTC) decide the local day."""
+        events = {
+            "feed": [
+                {"start": _ts(1, 23), "leftDuration": 300, "rightDuration": 200, "offset": -120},  # 01:00 Mar 2
+                {"start": _ts(1, 10), "leftDuration": 100, "rightDuration": 0, "offset": None},
+            ],
+            "diaper": [
+                {"start": _ts(3, 1), "mode": "poo", "offset": 180},  # 22:00 Mar 2
+                {"start": _ts(3, 12), "mode": "both"},
+            ],
+        }
+        summary = summarize_days(events)
+
+        assert summary.feeds.tolist() == [1, 1, 0]
+        assert summary.feed_left_s.tolist() == [100, 300, 0]
+        row = summary.row(date(2025, 3, 2))
+        assert row is not None
+        assert row["diapers_poo"] == 1
+        assert summary.row(date(2025, 3, 3))["diapers_both"] == 1
+        assert summary.row(date(2025, 4, 1)) is None
+
+    def test_empty(self) -> None:
+        """No events gives an empty table."""
+        summary = summarize_days({})
+        assert len(summary) == 0
+        assert summary.to_records() == []
+
+
+def test_api_daily_summary(memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+    """get_daily_summary uses the child's cutoffs and the stored history."""
+    intervals = memory_api._get_firestore_client().collection("sleep").document(
+        memory_child_uid).collection("intervals")
+    intervals.document("a").set({"start": _ts(1, 18), "duration": 2 * 3600, "offset": 0})
+
+    records = memory_api.get_daily_summary(memory_child_uid, int(_ts(1, 0)), int(_ts(2, 0))).to_records()
+
+    assert len(records) == 1
+    assert records[0]["day"] == date(2025, 3, 1)
+    assert records[0]["night_sleep_s"] == 3600  # seeded child's night starts at 19:00
+    assert records[0]["naps"] == 1
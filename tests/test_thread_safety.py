@@ -0,0 +1,127 @@
+"""Thread-safety tests for Huckleberry API (offline, on the in-memory backend)."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+
+from huckleberry_api import HuckleberryAPI, MemoryBackend, SessionLimits
+from huckleberry_api.memory import MemoryDocumentReference
+
+
+class _TokenResponse:
+    """Stand-in for the token endpoint's response."""
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict[str, Any]:
+        return {"id_token": "refreshed-token", "refresh_token": "refreshed", "expires_in": "3600"}
+
+
+def _session(backend: MemoryBackend, **kwargs: Any) -> HuckleberryAPI:
+    api = HuckleberryAPI("offline@example.com", "offline", "UTC", backend=backend, **kwargs)
+    api.id_token, api.user_uid, api.token_expires_at = "offline-token", "offline-user", time.time() + 3600
+    api.refresh_token = "offline-refresh"
+    return api
+
+
+class TestTokenRefresh:
+    """Test single-flight token refresh."""
+
+    def test_expiring_token_refreshed_once(self, memory_api: HuckleberryAPI, memory_backend: MemoryBackend,
+                                           memory_child_uid: str) -> None:
+        """Threads meeting an expiring token while a refresh is running wait for it instead of refreshing."""
+        threads = 8
+        api = _session(memory_backend, coalesce_reads=False)  # every thread checks the token itself
+        api.token_expires_at = time.time() + 60  # inside the 5-minute refresh margin
+        started, release = threading.Event(), threading.Event()
+        refreshes: list[str] = []
+        checked: set[int] = set()
+        token_valid = api._token_valid
+
+        def post_auth(*args: Any) -> _TokenResponse:
+            refreshes.append(threading.current_thread().name)
+            started.set()
+            release.wait(5)
+            return _TokenResponse()
+
+        def counting_token_valid() -> bool:
+            checked.add(threading.get_ident())
+            return token_valid()
+
+        api._post_auth = post_auth  # type: ignore[method-assign]
+        api._token_valid = counting_token_valid  # type: ignore[method-assign]
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            futures = [pool.submit(api.get_growth_data, memory_child_uid) for _ in range(threads)]
+            # Release the refresh only once every thread has found the token expiring
+            assert started.wait(5)
+            deadline = time.monotonic() + 5
+            while len(checked) < threads and time.monotonic() < deadline:
+                time.sleep(0.001)
+            release.set()
+            for future in futures:
+                future.result(5)
+
+        assert len(checked) == threads
+        assert len(refreshes) == 1
+        assert api.id_token == "refreshed-token"
+
+
+class TestListenerRefresh:
+    """Test listeners recreated by a token refresh."""
+
+    def test_listener_stopped_during_refresh_stays_stopped(self, memory_api: HuckleberryAPI,
+                                                           memory_backend: MemoryBackend,
+                                                           memory_child_uid: str) -> None:
+        """A listener stopped while a refresh recreates listeners is not brought back."""
+        limits = SessionLimits(max_listeners=None)
+        api = _session(memory_backend, limits=limits)
+        api._post_auth = lambda *args: _TokenResponse()  # type: ignore[method-assign]
+        updates: list[str] = []
+        api.setup_realtime_listener(memory_child_uid, lambda data: updates.append("sleep"))
+        api.setup_feed_listener(memory_child_uid, lambda data: updates.append("feed"))
+        setup_listener = api._setup_listener
+
+        def stop_feed_first(collection_name: str, *args: Any, **kwargs: Any) -> None:
+            if collection_name == "sleep":  # recreated first; the caller stops feed meanwhile
+                api._stop_listener(f"feed_{memory_child_uid}")
+            setup_listener(collection_name, *args, **kwargs)
+
+        api._setup_listener = stop_feed_first  # type: ignore[method-assign]
+        api.refresh_auth_token()
+
+        assert set(api._listeners) == set(api._listener_callbacks) == {f"sleep_{memory_child_uid}"}
+        assert limits.active_listeners == 1
+        updates.clear()
+        memory_backend.create_client("t").collection("feed").document(memory_child_uid).set({"prefs": {}})
+        assert updates == []
+        api.stop_all_listeners()
+
+
+class TestListenerState:
+    """Test the last delivered state of listeners."""
+
+    def test_snapshot_after_stop_leaves_no_state(self, memory_api: HuckleberryAPI, memory_backend: MemoryBackend,
+                                                 memory_child_uid: str, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A snapshot delivered while its listener is being stopped is dropped instead of re-creating state."""
+        api = _session(memory_backend)
+        snapshot_callbacks: list[Any] = []
+        on_snapshot = MemoryDocumentReference.on_snapshot
+
+        def capture(reference: MemoryDocumentReference, callback: Any) -> Any:
+            snapshot_callbacks.append(callback)
+            return on_snapshot(reference, callback)
+
+        monkeypatch.setattr(MemoryDocumentReference, "on_snapshot", capture)
+        sleep = memory_backend.create_client("t").collection("sleep").document(memory_child_uid)
+        sleep.set({"prefs": {}})
+        updates: list[Any] = []
+        api.setup_realtime_listener(memory_child_uid, updates.append)
+        api._stop_listener(f"sleep_{memory_child_uid}")
+
+        sleep.set({"prefs": {"changed": True}})
+        snapshot_callbacks[0]([sleep.get()], [], None)  # raced the stop on the watch thread
+        assert updates == [{"prefs": {}}]
+        assert api._listener_state == {}
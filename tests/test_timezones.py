@@ -0,0 +1,79 @@
+"""Time zone offset helper tests for Huckleberry API (offline)."""
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from huckleberry_api import HuckleberryAPI
+from huckleberry_api import timezones
+from huckleberry_api.timezones import next_transition, offset_minutes, transition_table
+
+LONDON = ZoneInfo("Europe/London")
+
+
+def _ts(year: int, month: int, day: int, hour: int = 0) -> float:
+    return datetime(year, month, day, hour, tzinfo=timezone.utc).timestamp()
+
+
+class TestOffsets:
+    """Test transition search and the offset cache."""
+
+    def test_next_transition(self) -> None:
+        """Transitions are found to the second."""
+        assert next_transition(LONDON, _ts(2025, 1, 1)) == _ts(2025, 3, 30, 1)
+        assert next_transition("UTC", _ts(2025, 1, 1)) is None
+
+    def test_transition_table(self) -> None:
+        """The table lists the offsets in force over the range."""
+        instants, offsets = transition_table(LONDON, _ts(2025, 1, 1), _ts(2026, 1, 1))
+        assert instants == [_ts(2025, 1, 1), _ts(2025, 3, 30, 1), _ts(2025, 10, 26, 1)]
+        assert offsets == [0, 3600, 0]
+
+    def test_transition_table_cached(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Transitions are searched once per zone and year; later tables reuse them."""
+        monkeypatch.setattr(timezones, "_year_cache", {})
+        instants, offsets = transition_table(LONDON, _ts(2024, 6, 1), _ts(2025, 3, 30, 1))
+        assert instants == [_ts(2024, 6, 1), _ts(2024, 10, 27, 1), _ts(2025, 3, 30, 1)]
+        assert offsets == [3600, 0, 3600]
+
+        def no_scan(*args: object, **kwargs: object) -> None:
+            raise AssertionError("transition searched again")
+
+        monkeypatch.setattr(timezones, "next_transition", no_scan)
+        instants, offsets = transition_table(LONDON, _ts(2025, 1, 1), _ts(2025, 12, 31))
+        assert instants == [_ts(2025, 1, 1), _ts(2025, 3, 30, 1), _ts(2025, 10, 26, 1)]
+        assert offsets == [0, 3600, 0]
+
+    def test_offsets_cached_per_year(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Offsets come from transitions cached per year; timestamps alternating between years scan nothing again."""
+        monkeypatch.setattr(timezones, "_year_cache", {})
+        assert offset_minutes(LONDON, _ts(2025, 3, 1)) == 0
+        assert offset_minutes(LONDON, _ts(2024, 7, 1)) == -60
+        assert set(timezones._year_cache) == {(LONDON, 2025), (LONDON, 2024)}
+
+        def no_scan(*args: object, **kwargs: object) -> None:
+            raise AssertionError("transition searched again")
+
+        monkeypatch.setattr(timezones, "next_transition", no_scan)
+        assert offset_minutes(LONDON, _ts(2025, 3, 30, 0)) == 0
+        assert offset_minutes(LONDON, _ts(2025, 3, 30, 1)) == -60  # from the transition on
+        assert offset_minutes(LONDON, _ts(2024, 12, 31)) == 0
+        assert offset_minutes(LONDON, _ts(2025, 10, 26, 1)) == 0
+
+    def test_api_uses_cached_offset(self) -> None:
+        """The API reports the current offset in stored-field minutes."""
+        api = HuckleberryAPI(email="test", password="test", timezone="Asia/Kolkata")
+        assert api._get_timezone_offset_minutes() == -330
+
+
+class TestBulkConversion:
+    """Test vectorized conversion to local time."""
+
+    def test_stored_offsets_and_transitions(self) -> None:
+        """Stored offsets win; missing ones come from the zone's transition table."""
+        pytest.importorskip("numpy")
+        starts = [_ts(2025, 3, 29, 23), _ts(2025, 6, 30, 23), _ts(2025, 6, 30, 23)]
+        local = timezones.to_local(starts, LONDON, [None, None, 0])
+
+        assert local.offset.tolist() == [0, -60, 0]
+        assert [str(day) for day in local.dates()] == ["2025-03-29", "2025-07-01", "2025-06-30"]
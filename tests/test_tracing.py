@@ -0,0 +1,112 @@
+"""Tracing hook tests for Huckleberry API (offline)."""
+from typing import Any
+
+import pytest
+import requests
+
+from huckleberry_api import HuckleberryAPI, MemoryBackend, RecordingTracer
+from huckleberry_api.tracing import hash_child_uid
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict[str, Any]:
+        return self._payload
+
+
+class TestRecordingTracer:
+    """Test the in-process tracer."""
+
+    def test_nested_spans(self) -> None:
+        """Spans started inside another span record it as parent."""
+        tracer = RecordingTracer()
+        with tracer.start_as_current_span("outer", attributes={"a": 1}):
+            with tracer.start_as_current_span("inner") as inner:
+                inner.set_attribute("b", 2)
+
+        outer_span = tracer.find("outer")[0]
+        inner_span = tracer.find("inner")[0]
+        assert inner_span.parent_id == outer_span.span_id
+        assert outer_span.parent_id is None
+        assert tracer.children(outer_span) == [inner_span]
+        assert inner_span.attributes == {"b": 2}
+        assert outer_span.duration >= inner_span.duration
+
+    def test_exception_marks_span(self) -> None:
+        """Exceptions are recorded and re-raised."""
+        tracer = RecordingTracer()
+        with pytest.raises(ValueError):
+            with tracer.start_as_current_span("failing"):
+                raise ValueError("boom")
+
+        span = tracer.find("failing")[0]
+        assert span.status == "ERROR"
+        assert isinstance(span.exception, ValueError)
+
+
+class TestApiTracing:
+    """Test spans produced by HuckleberryAPI."""
+
+    def test_auth_call_span(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """authenticate() produces an API span with an HTTP child span."""
+        payload = {"idToken": "token", "refreshToken": "refresh", "localId": "user", "expiresIn": "3600"}
+        monkeypatch.setattr(requests, "post", lambda *args, **kwargs: _FakeResponse(payload))
+
+        tracer = RecordingTracer()
+        api = HuckleberryAPI(email="test", password="test", timezone="UTC", tracer=tracer)
+        api.authenticate()
+
+        method_span = tracer.find("huckleberry.authenticate")[0]
+        http_span = tracer.find("auth.sign_in")[0]
+        assert http_span.parent_id == method_span.span_id
+        assert http_span.attributes["http.response.status_code"] == 200
+
+    def test_firestore_rpc_spans(self, memory_backend: MemoryBackend) -> None:
+        """Each Firestore RPC becomes a child span with collection and child hash attributes."""
+        intervals = memory_backend.create_client("t").collection("sleep").document("child-1").collection("intervals")
+        intervals.document("a").set({"start": 10, "duration": 5})
+        intervals.document("b").set({"start": 20, "duration": 5})
+
+        tracer = RecordingTracer()
+        api = HuckleberryAPI(email="test", password="test", timezone="UTC", tracer=tracer, backend=memory_backend)
+        api.id_token = "token"
+        api.token_expires_at = 2 ** 40
+
+        api.get_sleep_intervals("child-1", 0, 100)
+
+        method_span = tracer.find("huckleberry.get_sleep_intervals")[0]
+        streams = tracer.find("firestore.stream")
+        assert len(streams) == 2
+        assert all(span.parent_id == method_span.span_id for span in streams)
+        assert streams[0].attributes["huckleberry.collection"] == "sleep"
+        assert streams[0].attributes["huckleberry.subcollection"] == "intervals"
+        assert streams[0].attributes["huckleberry.child_uid_hash"] == hash_child_uid("child-1")
+        assert streams[0].attributes["huckleberry.document_count"] == 2
+        assert streams[0].attributes["huckleberry.retry_count"] == 0
+        assert method_span.attributes["huckleberry.child_uid_hash"] == hash_child_uid("child-1")
+
+    def test_write_path_spans(self, memory_backend: MemoryBackend) -> None:
+        """A timer operation produces one get and one write span under the method span."""
+        tracer = RecordingTracer()
+        api = HuckleberryAPI(email="test", password="test", timezone="UTC", tracer=tracer, backend=memory_backend)
+        api.id_token = "token"
+        api.token_expires_at = 2 ** 40
+
+        api.start_feeding("child-1")
+        api.complete_feeding("child-1")
+
+        method_span = tracer.find("huckleberry.complete_feeding")[0]
+        names = sorted(span.name for span in tracer.children(method_span))
+        assert names == ["firestore.get", "firestore.set", "firestore.update"]
+
+    def test_no_tracer_is_passthrough(self) -> None:
+        """Without a tracer, no spans or wrappers are involved."""
+        api = HuckleberryAPI(email="test", password="test", timezone="UTC")
+        assert api._tracer is None
@@ -0,0 +1,74 @@
+"""Async watch stream tests for Huckleberry API (offline)."""
+import asyncio
+import threading
+
+import pytest
+
+from huckleberry_api import DocumentDelta, HuckleberryAPI
+
+
+def _tracker(api: HuckleberryAPI, collection: str, child_uid: str):
+    return api._get_firestore_client().collection(collection).document(child_uid)
+
+
+@pytest.mark.asyncio
+async def test_merged_stream(memory_api: HuckleberryAPI) -> None:
+    """Trackers of several children arrive in one stream, in order."""
+    for child_uid in ("a", "b"):
+        for collection in ("sleep", "feed"):
+            _tracker(memory_api, collection, child_uid).set({"prefs": {}})
+    loop = asyncio.get_running_loop()
+
+    async with memory_api.watch(["a", "b"], ["sleep", "feed"]) as updates:
+        initial = [await updates.next() for _ in range(4)]
+        await loop.run_in_executor(None, lambda: _tracker(memory_api, "feed", "b").update({"prefs.n": 1}))
+        await loop.run_in_executor(None, lambda: _tracker(memory_api, "sleep", "a").update({"prefs.n": 2}))
+        changed = [await updates.next(), await updates.next()]
+
+    assert sorted((u.collection, u.child_uid) for u in initial) == [
+        ("feed", "a"), ("feed", "b"), ("sleep", "a"), ("sleep", "b")]
+    assert [(u.collection, u.child_uid, u.data["prefs"]) for u in changed] == [
+        ("feed", "b", {"n": 1}), ("sleep", "a", {"n": 2})]
+    assert memory_api._listeners == {}
+
+
+@pytest.mark.asyncio
+async def test_cancellation_unsubscribes(memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+    """Cancelling the consuming task removes the stream's listeners."""
+    _tracker(memory_api, "sleep", memory_child_uid).set({"prefs": {}})
+    received: list[object] = []
+    stream = memory_api.watch(memory_child_uid, deltas=True)
+
+    async def consume() -> None:
+        async for update in stream:
+            received.append(update.data)
+
+    task = asyncio.create_task(consume())
+    while not received:
+        await asyncio.sleep(0.01)
+    assert len(memory_api._listeners) == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert memory_api._listeners == {}
+    assert isinstance(received[0], DocumentDelta) and received[0].initial
+
+
+@pytest.mark.asyncio
+async def test_backpressure(memory_api: HuckleberryAPI, memory_child_uid: str) -> None:
+    """A full stream makes the delivering thread wait for the consumer."""
+    ref = _tracker(memory_api, "diaper", memory_child_uid)
+    ref.set({"prefs": {"n": 0}})
+
+    async with memory_api.watch(memory_child_uid, "diaper", max_pending=1) as updates:
+        writer = threading.Thread(target=lambda: [ref.update({"prefs.n": n}) for n in range(1, 4)])
+        writer.start()  # the initial snapshot fills the stream, so the writer waits
+        await asyncio.sleep(0.1)
+        assert writer.is_alive() and updates.pending == 1
+
+        values = [(await updates.next()).data["prefs"]["n"] for _ in range(4)]
+        await asyncio.get_running_loop().run_in_executor(None, writer.join)
+
+    assert values == [0, 1, 2, 3]
+    assert updates.dropped == 0